@@ -0,0 +1,73 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from error_handling import responses  # noqa: E402
+from utils.serialization import dumps_bytes  # noqa: E402
+
+
+def list_payload(count: int) -> list[dict]:
+    return [
+        {
+            "name": f"feature-{i}",
+            "description": f"Rollout flag for checkout experiment {i}",
+            "created_at": "2026-01-01T00:00:00+00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def audit_payload(count: int) -> list[dict]:
+    return [
+        {
+            "feature": "checkout",
+            "action": "UPDATE_ENV",
+            "environment": "prod",
+            "actor": f"admin{i % 5}@example.com",
+            "old_value": {"enabled": False, "rollout_end_at": None},
+            "new_value": {"enabled": True, "rollout_end_at": None},
+            "timestamp": f"2026-01-01T00:{i % 60:02d}:00+00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def bench(label: str, raw: bytes, encoding: str, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        compressed = responses.compress_body(raw, encoding)
+    elapsed = (time.perf_counter() - start) / iterations
+
+    saved = 1 - len(compressed) / len(raw)
+    print(
+        f"{label:<10} {encoding:<5} raw={len(raw):<8} "
+        f"compressed={len(compressed):<8} saved={saved:6.1%} "
+        f"cpu={elapsed * 1000:.3f}ms"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="CPU cost versus bytes saved for response compression."
+    )
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    encodings = ["gzip"] + (["br"] if responses.brotli is not None else [])
+
+    for count in args.items:
+        for label, payload in (
+            ("list", list_payload(count)),
+            ("audit", audit_payload(count)),
+        ):
+            raw = dumps_bytes(payload)
+            for encoding in encodings:
+                bench(f"{label}[{count}]", raw, encoding, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer  # noqa: E402
+
+from infra.local.dynamodb import InMemoryDynamoDB  # noqa: E402
+from repository.feature_repository import FeatureRepository  # noqa: E402
+
+ENVIRONMENTS = ["dev", "qa", "staging", "prod"]
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def seed(table, audit_rows: int):
+    repo = FeatureRepository(table)
+    repo.create_feature(
+        "checkout",
+        "Checkout redesign rollout",
+        {env: env != "prod" for env in ENVIRONMENTS},
+    )
+
+    for i in range(audit_rows):
+        env = ENVIRONMENTS[i % len(ENVIRONMENTS)]
+        snapshot = {
+            "environment": env,
+            "enabled": i % 2 == 0,
+            "rollout_end_at": "2026-06-01T00:00:00+00:00" if i % 3 else None,
+            "updated_at": f"2026-01-01T00:00:{i % 60:02d}+00:00",
+        }
+        table.put_item(Item={
+            "PK": "FEATURE#checkout",
+            "SK": f"AUDIT#2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}.{i:06d}+00:00",
+            "action": "UPDATE_ENV",
+            "actor": f"admin{i % 5}@example.com",
+            "old_value": {**snapshot, "enabled": not snapshot["enabled"]},
+            "new_value": snapshot,
+            "created_at": "2026-01-01T00:00:00+00:00",
+        })
+
+
+def wire_payload(items: list[dict]) -> bytes:
+    return json.dumps({
+        "Items": [
+            {name: _serializer.serialize(value) for name, value in item.items()}
+            for item in items
+        ]
+    }).encode("utf-8")
+
+
+def deserialize(payload: bytes) -> list[dict]:
+    return [
+        {name: _deserializer.deserialize(value) for name, value in item.items()}
+        for item in json.loads(payload)["Items"]
+    ]
+
+
+def bench(label: str, read, iterations: int):
+    items = read()
+    payload = wire_payload(items)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        deserialize(payload)
+    elapsed = (time.perf_counter() - start) / iterations
+
+    print(
+        f"{label:<10} items={len(items):<6} bytes={len(payload):<9} "
+        f"deserialize={elapsed * 1000:.3f}ms"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bytes read and deserialization time for a feature read, "
+        "with and without sort-key bounds and projections."
+    )
+    parser.add_argument("--audit-rows", type=int, nargs="+", default=[0, 100, 1000, 5000])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    for audit_rows in args.audit_rows:
+        table = InMemoryDynamoDB().Table("FeatureFlagsBenchmark")
+        seed(table, audit_rows)
+        repo = FeatureRepository(table)
+
+        print(f"audit_rows={audit_rows}")
+        bench(
+            "full",
+            lambda: table.query(
+                KeyConditionExpression="PK = :pk",
+                ExpressionAttributeValues={":pk": "FEATURE#checkout"},
+            )["Items"],
+            args.iterations,
+        )
+        bench("bounded", lambda: repo.get_feature_items("checkout"), args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+os.environ["INFRA_BACKEND"] = "memory"
+os.environ.setdefault("DDB_TABLE_NAME", "FeatureFlagsBenchmark")
+os.environ.setdefault("AUDIT_QUEUE_URL", "memory://audit-queue")
+os.environ.setdefault("IMPRESSIONS_QUEUE_URL", "memory://impressions-queue")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+from handlers.evaluate.main import evaluate_feature_handler  # noqa: E402
+from handlers.features.audit.consumer.main import handler as audit_consumer  # noqa: E402
+from handlers.features.bulk_update_envs.main import bulk_update_envs_handler  # noqa: E402
+from handlers.features.create_feature.main import create_feature_handler  # noqa: E402
+from handlers.features.get_feature.main import get_feature_handler  # noqa: E402
+from handlers.features.list_features.main import list_features_handler  # noqa: E402
+from handlers.features.update_feature_env.main import update_feature_env_handler  # noqa: E402
+from infra.sqs.audit_queue import QUEUE_URL  # noqa: E402
+from infra.sqs.client import get_sqs_client  # noqa: E402
+from utils.utils import generate_jwt  # noqa: E402
+
+ENVIRONMENTS = ["dev", "staging", "prod"]
+BULK_CHANGES = 40
+
+
+def auth_headers(role: str) -> dict:
+    token = generate_jwt({
+        "email": f"{role.lower()}@example.com",
+        "role": role,
+        "exp": datetime.now(timezone.utc) + timedelta(hours=1),
+    })
+    return {"Authorization": f"Bearer {token}"}
+
+
+def check(response: dict, label: str) -> dict:
+    if response["statusCode"] >= 400:
+        raise RuntimeError(f"{label} failed: {response['body']}")
+    return response
+
+
+def seed(features: int, admin: dict):
+    for i in range(features):
+        check(
+            create_feature_handler(
+                {
+                    "headers": admin,
+                    "body": json.dumps({
+                        "name": f"feature-{i}",
+                        "description": f"Benchmark feature {i}",
+                        "environments": {env: i % 2 == 0 for env in ENVIRONMENTS},
+                    }),
+                },
+                None,
+            ),
+            "seed",
+        )
+
+
+def measure(label: str, call, iterations: int) -> dict:
+    latencies = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for i in range(iterations):
+            began = time.perf_counter()
+            call(i)
+            latencies.append(time.perf_counter() - began)
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "handler": label,
+        "ops_per_sec": iterations / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1000,
+    }
+
+
+def run(features: int, iterations: int) -> list[dict]:
+    admin = auth_headers("ADMIN")
+    client = auth_headers("CLIENT")
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed(features, admin)
+
+    sqs = get_sqs_client()
+    while sqs.drain_event(QUEUE_URL):
+        pass
+
+    def evaluate(i):
+        check(
+            evaluate_feature_handler(
+                {
+                    "headers": client,
+                    "body": json.dumps({
+                        "feature": f"feature-{i % features}",
+                        "environment": ENVIRONMENTS[i % len(ENVIRONMENTS)],
+                    }),
+                },
+                None,
+            ),
+            "evaluate",
+        )
+
+    def list_features(i):
+        check(list_features_handler({"headers": admin}, None), "list_features")
+
+    def get_feature(i):
+        check(
+            get_feature_handler(
+                {"headers": admin, "pathParameters": {"flag": f"feature-{i % features}"}},
+                None,
+            ),
+            "get_feature",
+        )
+
+    def update_env(i):
+        check(
+            update_feature_env_handler(
+                {
+                    "headers": admin,
+                    "pathParameters": {
+                        "flag": f"feature-{i % features}",
+                        "env": ENVIRONMENTS[i % len(ENVIRONMENTS)],
+                    },
+                    "body": json.dumps({"enabled": i % 2 == 0}),
+                },
+                None,
+            ),
+            "update_env",
+        )
+
+    bulk_size = min(BULK_CHANGES, features * len(ENVIRONMENTS))
+
+    def bulk_update(i):
+        check(
+            bulk_update_envs_handler(
+                {
+                    "headers": admin,
+                    "body": json.dumps({
+                        "changes": [
+                            {
+                                "feature": f"feature-{(i + n) % features}",
+                                "environment": ENVIRONMENTS[n // features % len(ENVIRONMENTS)],
+                                "enabled": i % 2 == 0,
+                            }
+                            for n in range(bulk_size)
+                        ]
+                    }),
+                },
+                None,
+            ),
+            "bulk_update",
+        )
+
+    results = [
+        measure("evaluate", evaluate, iterations),
+        measure("list_features", list_features, max(iterations // 10, 1)),
+        measure("get_feature", get_feature, iterations),
+        measure("update_env", update_env, iterations),
+        measure(f"bulk_update[{bulk_size}]", bulk_update, max(iterations // bulk_size, 1)),
+    ]
+
+    batches = []
+    while True:
+        event = sqs.drain_event(QUEUE_URL, batch_size=10)
+        if event is None:
+            break
+        batches.append(event)
+    if batches:
+        results.append(
+            measure(
+                "audit_consumer[10]",
+                lambda i: audit_consumer(batches[i], None),
+                len(batches),
+            )
+        )
+
+    return results
+
+
+def compare(results: list[dict], baseline_path: str, max_regression: float) -> list[str]:
+    baseline = {
+        row["handler"]: row
+        for row in json.loads(Path(baseline_path).read_text())["results"]
+    }
+    regressions = []
+    for row in results:
+        previous = baseline.get(row["handler"])
+        if previous is None:
+            continue
+        drop = 1 - row["ops_per_sec"] / previous["ops_per_sec"]
+        if drop > max_regression:
+            regressions.append(
+                f"{row['handler']}: {previous['ops_per_sec']:.0f} -> "
+                f"{row['ops_per_sec']:.0f} ops/s ({drop:.1%} slower)"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="End-to-end handler benchmark against the in-memory DynamoDB/SQS stand-in."
+    )
+    parser.add_argument("--features", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Fail if ops/sec regresses against this JSON file")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run(args.features, args.iterations)
+
+    print(f"features={args.features} iterations={args.iterations}")
+    for row in results:
+        print(
+            f"{row['handler']:<20} ops/s={row['ops_per_sec']:<10.0f} "
+            f"p50={row['p50_ms']:.3f}ms p99={row['p99_ms']:.3f}ms"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"results": results}, indent=2))
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import os
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+import bcrypt  # noqa: E402
+
+from dto.auth_dto import SignuprequestDTO  # noqa: E402
+from error_handling.exceptions import ConflictException  # noqa: E402
+from infra.local.dynamodb import InMemoryDynamoDB  # noqa: E402
+from repository.user_repository import UserRepository  # noqa: E402
+from services.auth_service import AuthService  # noqa: E402
+from utils.lru_set import LRUSet  # noqa: E402
+
+
+class ReadBeforeWriteAuthService(AuthService):
+    def signup(self, signup_request):
+        if self.repo.get_user_by_email(signup_request.email.lower()):
+            raise ConflictException("User already exists")
+        return super().signup(signup_request)
+
+
+class CountingTable:
+    def __init__(self, table):
+        self._table = table
+        self.reads = 0
+        self.writes = 0
+
+    def get_item(self, **kwargs):
+        self.reads += 1
+        return self._table.get_item(**kwargs)
+
+    def put_item(self, **kwargs):
+        self.writes += 1
+        return self._table.put_item(**kwargs)
+
+
+def requests(count: int, duplicate_ratio: float) -> list[SignuprequestDTO]:
+    unique = max(int(count * (1 - duplicate_ratio)), 1)
+    return [
+        SignuprequestDTO(
+            username=f"user{i % unique}",
+            email=f"user{i % unique}@example.com",
+            password="Benchmark123!",
+        )
+        for i in range(count)
+    ]
+
+
+def bench(label: str, make_service, signups: list[SignuprequestDTO]):
+    table = CountingTable(InMemoryDynamoDB().Table("UsersBenchmark"))
+    service = make_service(UserRepository(table))
+
+    conflicts = 0
+    start = time.perf_counter()
+    for request in signups:
+        try:
+            service.signup(request)
+        except ConflictException:
+            conflicts += 1
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{label:<20} signups/s={len(signups) / elapsed:<8.1f} "
+        f"conflicts={conflicts:<5} reads={table.reads:<5} writes={table.writes}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Signup throughput with and without the read-before-write and duplicate cache."
+    )
+    parser.add_argument("--signups", type=int, default=200)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.5)
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    args = parser.parse_args(argv)
+
+    bcrypt.gensalt = partial(bcrypt.gensalt, rounds=args.bcrypt_rounds)
+    signups = requests(args.signups, args.duplicate_ratio)
+
+    print(
+        f"signups={args.signups} duplicate_ratio={args.duplicate_ratio} "
+        f"bcrypt_rounds={args.bcrypt_rounds}"
+    )
+    bench("read_before_write", ReadBeforeWriteAuthService, signups)
+    bench("conditional_put", AuthService, signups)
+    bench(
+        "conditional_cached",
+        lambda repo: AuthService(repo, known_emails=LRUSet(10_000)),
+        signups,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from repository.coalescing_feature_repository import CoalescingFeatureRepository  # noqa: E402
+from repository.feature_repository import FeatureRepository  # noqa: E402
+from utils.metrics import MetricsRegistry  # noqa: E402
+from utils.single_flight import SingleFlight  # noqa: E402
+
+
+class SlowTable:
+    name = "FeatureTable"
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    def query(self, **kwargs):
+        with self._lock:
+            self.queries += 1
+        time.sleep(self.latency)
+        return {"Items": [{"PK": "FEATURE#popular", "SK": "META"}]}
+
+
+def run_round(repo, threads: int) -> list[float]:
+    barrier = threading.Barrier(threads)
+    latencies = [0.0] * threads
+
+    def worker(i):
+        barrier.wait()
+        start = time.perf_counter()
+        repo.get_feature_items("popular")
+        latencies[i] = time.perf_counter() - start
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return latencies
+
+
+def bench(label, make_repo, threads, rounds, latency):
+    table = SlowTable(latency)
+    repo = make_repo(table)
+    latencies = []
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        latencies.extend(run_round(repo, threads))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{label:<12} backend_queries={table.queries:<6} "
+        f"calls={len(latencies):<6} wall={elapsed:.3f}s "
+        f"p50={statistics.median(latencies) * 1000:.2f}ms p99={p99 * 1000:.2f}ms"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Thundering-herd benchmark for coalesced feature reads."
+    )
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    args = parser.parse_args(argv)
+    latency = args.latency_ms / 1000
+
+    print(f"threads={args.threads} rounds={args.rounds} backend_latency={args.latency_ms}ms")
+    bench("direct", FeatureRepository, args.threads, args.rounds, latency)
+    bench(
+        "coalesced",
+        lambda table: CoalescingFeatureRepository(
+            table, SingleFlight(metrics=MetricsRegistry())
+        ),
+        args.threads,
+        args.rounds,
+        latency,
+    )
+
+
+if __name__ == "__main__":
+    main()
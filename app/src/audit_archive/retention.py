@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta, timezone
+
+from infra.config import get_env
+
+AUDIT_RETENTION_DAYS = int(get_env("AUDIT_RETENTION_DAYS", "90"))
+AUDIT_ARCHIVE_AFTER_DAYS = int(get_env("AUDIT_ARCHIVE_AFTER_DAYS", "30"))
+TTL_ATTRIBUTE = "expires_at"
+
+
+def parse_timestamp(timestamp: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def expires_at(timestamp: str, retention_days: int = AUDIT_RETENTION_DAYS) -> int | None:
+    if retention_days <= 0:
+        return None
+
+    created = parse_timestamp(timestamp)
+    if created is None:
+        return None
+    return int((created + timedelta(days=retention_days)).timestamp())
+
+
+def archive_cutoff(
+    now: datetime,
+    archive_after_days: int = AUDIT_ARCHIVE_AFTER_DAYS,
+    retention_days: int = AUDIT_RETENTION_DAYS,
+) -> datetime:
+    if retention_days > 0 and archive_after_days >= retention_days:
+        raise ValueError(
+            "AUDIT_ARCHIVE_AFTER_DAYS must be lower than AUDIT_RETENTION_DAYS, "
+            "otherwise rows expire before they are archived"
+        )
+    return now - timedelta(days=archive_after_days)
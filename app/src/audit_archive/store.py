@@ -0,0 +1,92 @@
+import gzip
+import os
+from datetime import datetime
+
+from snapshot.storage import write_atomic
+from utils.serialization import dumps, loads
+
+FILE_NAME = "audit.ndjson.gz"
+
+
+def to_record(item: dict) -> dict:
+    return {
+        "feature": item.get("feature") or item["PK"].replace("FEATURE#", "", 1),
+        "action": item["action"],
+        "actor": item["actor"],
+        "old": item.get("old_value"),
+        "new": item.get("new_value"),
+        "timestamp": item["created_at"],
+    }
+
+
+def record_key(record: dict) -> tuple:
+    return (record["feature"], record["timestamp"], record["action"])
+
+
+def partition_path(root: str, feature: str, month: str) -> str:
+    return os.path.join(root, f"feature={feature}", f"month={month}", FILE_NAME)
+
+
+def read_partition(path: str) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+
+    with gzip.open(path, "rb") as archive:
+        return [loads(line) for line in archive if line.strip()]
+
+
+def write_partition(path: str, records: list[dict]):
+    records = sorted(records, key=lambda record: record["timestamp"])
+    payload = b"".join(
+        dumps(record).encode("utf-8") + b"\n" for record in records
+    )
+    write_atomic(path, gzip.compress(payload, mtime=0))
+
+
+def archive_records(root: str, records: list[dict]) -> int:
+    partitions = {}
+    for record in records:
+        month = record["timestamp"][:7]
+        partitions.setdefault((record["feature"], month), []).append(record)
+
+    written = 0
+    for (feature, month), new_records in partitions.items():
+        path = partition_path(root, feature, month)
+        merged = {record_key(record): record for record in read_partition(path)}
+        before = len(merged)
+        merged.update((record_key(record), record) for record in new_records)
+
+        if len(merged) != before:
+            write_partition(path, list(merged.values()))
+            written += len(merged) - before
+
+    return written
+
+
+def _months(since: datetime | None, until: datetime | None, available: list[str]) -> list[str]:
+    low = since.strftime("%Y-%m") if since else None
+    high = until.strftime("%Y-%m") if until else None
+    return [
+        month
+        for month in available
+        if (low is None or month >= low) and (high is None or month <= high)
+    ]
+
+
+def iter_archived(
+    root: str,
+    feature: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+):
+    feature_dir = os.path.join(root, f"feature={feature}")
+    if not os.path.isdir(feature_dir):
+        return
+
+    available = sorted(
+        entry.split("=", 1)[1]
+        for entry in os.listdir(feature_dir)
+        if entry.startswith("month=")
+    )
+    for month in _months(since, until, available):
+        yield from read_partition(partition_path(root, feature, month))
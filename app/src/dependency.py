@@ -1,26 +1,129 @@
+import os
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from infra.config import get_env
 from infra.dynamodb import table
 from repository.user_repository import UserRepository
-from repository.feature_repository import FeatureRepository
+from repository.coalescing_feature_repository import CoalescingFeatureRepository
+from repository.sdk_key_repository import SDKKeyRepository
+from repository.usage_repository import UsageRepository
 from services.auth_service import AuthService
 from services.feature_service import FeatureService
+from services.sdk_key_service import SDKKeyService
+from services.usage_service import UsageService
 from utils.utils import verify_jwt
-from error_handling.exceptions import UnauthorizedException, AppException
+from error_handling.exceptions import (
+    UnauthorizedException,
+    AppException,
+    NotFoundException,
+    ServiceUnavailableException,
+)
+from enums.enums import Role
 from models.user_model import UserModel
+from snapshot.bootstrap import load_bootstrap
+from snapshot.mmap_reader import MmapSnapshotReader
+from snapshot.model import Snapshot
+from utils.circuit_breaker import CircuitBreaker
+from utils.http_headers import get_header
+from utils.lru_set import LRUSet
+from utils.single_flight import SingleFlight
+from utils.swr_cache import StaleWhileRevalidateCache
+from utils.tracing import span, traced
+
+
+FLAG_SNAPSHOT_PATH = get_env("FLAG_SNAPSHOT_PATH", "")
+FLAG_BOOTSTRAP_PATH = get_env(
+    "FLAG_BOOTSTRAP_PATH",
+    os.path.join(os.path.dirname(__file__), "bootstrap", "flags.snapshot.bin"),
+)
+FLAG_BOOTSTRAP_MAX_AGE_SECONDS = int(get_env("FLAG_BOOTSTRAP_MAX_AGE_SECONDS", "0"))
+FLAG_SNAPSHOT_MAX_AGE_SECONDS = float(get_env("FLAG_SNAPSHOT_MAX_AGE_SECONDS", "60"))
+FLAG_CACHE_TTL_SECONDS = float(get_env("FLAG_CACHE_TTL_SECONDS", "5"))
+FLAG_CACHE_MAX_STALE_SECONDS = float(get_env("FLAG_CACHE_MAX_STALE_SECONDS", "300"))
+FLAG_BREAKER_FAILURE_THRESHOLD = int(get_env("FLAG_BREAKER_FAILURE_THRESHOLD", "5"))
+FLAG_BREAKER_RESET_SECONDS = float(get_env("FLAG_BREAKER_RESET_SECONDS", "30"))
+SDK_KEY_CACHE_TTL_SECONDS = float(get_env("SDK_KEY_CACHE_TTL_SECONDS", "10"))
+SIGNUP_KNOWN_EMAILS_MAX = int(get_env("SIGNUP_KNOWN_EMAILS_MAX", "10000"))
+COMPLETED_ROLLOUTS_MAX = 10000
+
+_snapshot_reader = None
+_last_known_good = load_bootstrap(FLAG_BOOTSTRAP_PATH) or Snapshot(
+    version=0,
+    generated_at=0,
+)
+_flag_cache = StaleWhileRevalidateCache(
+    "flag_cache",
+    ttl=FLAG_CACHE_TTL_SECONDS,
+    max_stale=FLAG_CACHE_MAX_STALE_SECONDS,
+    evict_on=(NotFoundException,),
+)
+_flag_store_breaker = CircuitBreaker(
+    "flag_store",
+    failure_threshold=FLAG_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=FLAG_BREAKER_RESET_SECONDS,
+    failure_exceptions=(ClientError, BotoCoreError),
+)
+_feature_reads = SingleFlight("feature_reads")
+_known_emails = LRUSet(SIGNUP_KNOWN_EMAILS_MAX)
+_completed_rollouts = LRUSet(COMPLETED_ROLLOUTS_MAX)
+_sdk_key_cache = StaleWhileRevalidateCache(
+    "sdk_key_cache",
+    ttl=SDK_KEY_CACHE_TTL_SECONDS,
+    # Never serve a key past its TTL: a revoked key must stop working
+    # within SDK_KEY_CACHE_TTL_SECONDS.
+    max_stale=0,
+    evict_on=(UnauthorizedException,),
+)
 
 
 def get_auth_service() -> AuthService:
-    repo = UserRepository(table)
-    return AuthService(repo)
+    repo = traced(UserRepository(table), "repository")
+    return traced(AuthService(repo, known_emails=_known_emails), "service")
+
+
+def get_snapshot_reader() -> MmapSnapshotReader | None:
+    global _snapshot_reader
+    if FLAG_SNAPSHOT_PATH and _snapshot_reader is None:
+        _snapshot_reader = MmapSnapshotReader(
+            FLAG_SNAPSHOT_PATH, max_age=FLAG_SNAPSHOT_MAX_AGE_SECONDS
+        )
+    return _snapshot_reader
 
 
 def get_feature_service() -> FeatureService:
-    repo = FeatureRepository(table)
-    return FeatureService(repo)
+    repo = traced(CoalescingFeatureRepository(table, _feature_reads), "repository")
+    service = FeatureService(
+        repo,
+        snapshot_reader=get_snapshot_reader(),
+        last_known_good=_last_known_good,
+        last_known_good_max_age=FLAG_BOOTSTRAP_MAX_AGE_SECONDS * 1000,
+        flag_cache=_flag_cache,
+        circuit_breaker=_flag_store_breaker,
+        completed_rollouts=_completed_rollouts,
+    )
+    return traced(service, "service")
 
 
+def get_sdk_key_service() -> SDKKeyService:
+    pepper = get_env("SDK_KEY_PEPPER", "")
+    if not pepper:
+        raise ServiceUnavailableException("SDK keys are not configured")
+
+    return SDKKeyService(SDKKeyRepository(table), pepper, cache=_sdk_key_cache)
+
+
+def get_usage_service() -> UsageService:
+    return UsageService(UsageRepository(table))
 
 
 def get_current_user(event):
+    sdk_key = get_header(event, "X-SDK-Key")
+    if sdk_key:
+        service = get_sdk_key_service()
+        with span("auth"):
+            return service.authenticate(sdk_key)
+
     headers = event.get("headers") or {}
     auth_header = headers.get("Authorization") or headers.get("authorization")
 
@@ -31,7 +134,8 @@ def get_current_user(event):
         raise AppException("Invalid Authorization header format", 401)
 
     token = auth_header.replace("Bearer ", "").strip()
-    payload = verify_jwt(token)
+    with span("auth"):
+        payload = verify_jwt(token)
     return payload
 
 
@@ -39,3 +143,10 @@ def get_current_user(event):
 def require_admin(user: dict):
     if user["role"] != "ADMIN":
         raise UnauthorizedException("Admin access required")
+
+
+def require_environment(user: dict, environment: str):
+    if user.get("role") == Role.SDK.value and user["environment"] != environment:
+        raise UnauthorizedException(
+            f"SDK key is not valid for environment '{environment}'"
+        )
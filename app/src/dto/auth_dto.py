@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field, field_validator, EmailStr
+from enums.enums import Environment
 from utils.password_validator import validate_password
 
 
@@ -17,4 +18,7 @@ class LoginRequestDTO(BaseModel):
     email: EmailStr
     password: str
 
-   
\ No newline at end of file
+
+class CreateSDKKeyDTO(BaseModel):
+    environment: Environment
+    name: str = Field(min_length=1, max_length=100)
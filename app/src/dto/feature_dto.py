@@ -1,6 +1,25 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Optional
 from enums.enums import Environment
+from utils.serialization import dumps
+
+MAX_VARIANTS = 20
+MAX_VARIANT_WEIGHT = 10_000
+MAX_VARIANT_PAYLOAD_BYTES = 4096
+MAX_PREREQUISITES = 10
+
+
+class VariantDTO(BaseModel):
+    name: str = Field(min_length=1, max_length=64)
+    weight: int = Field(ge=0, le=MAX_VARIANT_WEIGHT)
+    payload: Any = None
+
+    @field_validator("payload")
+    @classmethod
+    def validate_payload(cls, payload: Any) -> Any:
+        if len(dumps(payload).encode("utf-8")) > MAX_VARIANT_PAYLOAD_BYTES:
+            raise ValueError(f"Variant payload must be at most {MAX_VARIANT_PAYLOAD_BYTES} bytes")
+        return payload
 
 
 class CreateFeatureDTO(BaseModel):
@@ -11,13 +30,46 @@ class CreateFeatureDTO(BaseModel):
 class UpdateFeatureEnvDTO(BaseModel):
     enabled: bool
     rollout_end_at: Optional[str] = None
+    variants: Optional[list[VariantDTO]] = Field(default=None, min_length=1, max_length=MAX_VARIANTS)
+    prerequisites: Optional[list[str]] = Field(default=None, max_length=MAX_PREREQUISITES)
+
+    @field_validator("variants")
+    @classmethod
+    def validate_variants(cls, variants: list[VariantDTO] | None) -> list[VariantDTO] | None:
+        if variants is None:
+            return None
+
+        names = [variant.name for variant in variants]
+        if len(set(names)) != len(names):
+            raise ValueError("Variant names must be unique")
+        if sum(variant.weight for variant in variants) <= 0:
+            raise ValueError("At least one variant needs a positive weight")
+        return variants
+
+    @field_validator("prerequisites")
+    @classmethod
+    def validate_prerequisites(cls, prerequisites: list[str] | None) -> list[str] | None:
+        if prerequisites is None:
+            return None
+
+        prerequisites = [name.lower() for name in prerequisites]
+        if len(set(prerequisites)) != len(prerequisites):
+            raise ValueError("Prerequisites must be unique")
+        return prerequisites
 
 class EvaluateDTO(BaseModel):
     feature: str
     environment: Environment
     context: dict | None = None
 
-class FeatureListItemDTO(BaseModel):
-    name: str
-    description: Optional[str]
-    created_at: Optional[str] = None
\ No newline at end of file
+class BulkEnvChangeDTO(UpdateFeatureEnvDTO):
+    feature: str
+    environment: Environment
+
+    @field_validator("environment", mode="before")
+    @classmethod
+    def normalize_environment(cls, environment: Any) -> Any:
+        return environment.lower() if isinstance(environment, str) else environment
+
+class BulkUpdateEnvDTO(BaseModel):
+    changes: list[BulkEnvChangeDTO] = Field(min_length=1, max_length=200)
@@ -3,6 +3,7 @@ from enum import Enum
 class Role(str,Enum):
     ADMIN= "ADMIN"
     CLIENT= "CLIENT"
+    SDK= "SDK"
 
 
 class Environment(str, Enum):
@@ -35,3 +35,8 @@ class EnvironmentNotFoundException(NotFoundException):
         super().__init__(
             f"Environment '{environment}' not configured for feature '{feature_name}'"
         )
+
+
+class ServiceUnavailableException(AppException):
+    def __init__(self, message: str = "Service temporarily unavailable"):
+        super().__init__(message, 503)
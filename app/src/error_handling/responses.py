@@ -1,21 +1,127 @@
-import json
+import base64
+import gzip
+
+from infra.config import get_env
+from utils.serialization import dumps
+from utils.tracing import span
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSION_MIN_BYTES = int(get_env("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
 
 def success_response(data,status_code=200):
+    with span("serialize"):
+        body = dumps(data)
     return {
         "statusCode": status_code,
         "headers": {    
             "Content-Type": "application/json"
         },
-        "body": json.dumps(data),
+        "body": body,
+        "isBase64Encoded": False
+    }
+
+def raw_json_response(body: str, status_code=200):
+    return {
+        "statusCode": status_code,
+        "headers": {
+            "Content-Type": "application/json"
+        },
+        "body": body,
         "isBase64Encoded": False
     }
 
 def error_response(message, status_code):
+    with span("serialize"):
+        body = dumps({"error": message})
     return {
         "statusCode": status_code,
         "headers": {
             "Content-Type": "application/json"
         },
-        "body": json.dumps({"error": message}),
+        "body": body,
         "isBase64Encoded": False
     }
+
+
+def _parse_accept_encoding(header: str) -> dict[str, float]:
+    accepted = {}
+
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+
+    return accepted
+
+
+def select_encoding(accept_encoding: str | None) -> str | None:
+    if not accept_encoding:
+        return None
+
+    accepted = _parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
+
+
+def compress_body(raw: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(raw, quality=BROTLI_QUALITY)
+    return gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_response(
+    response: dict,
+    accept_encoding: str | None,
+    min_bytes: int = COMPRESSION_MIN_BYTES,
+) -> dict:
+    body = response.get("body")
+    if response.get("isBase64Encoded") or not isinstance(body, str):
+        return response
+
+    raw = body.encode("utf-8")
+    if len(raw) < min_bytes:
+        return response
+
+    encoding = select_encoding(accept_encoding)
+    if encoding is None:
+        return response
+
+    compressed = compress_body(raw, encoding)
+    if len(compressed) >= len(raw):
+        return response
+
+    return {
+        **response,
+        "headers": {
+            **(response.get("headers") or {}),
+            "Content-Encoding": encoding,
+            "Vary": "Accept-Encoding",
+        },
+        "body": base64.b64encode(compressed).decode("ascii"),
+        "isBase64Encoded": True,
+    }
@@ -0,0 +1,8 @@
+from error_handling.responses import success_response
+from utils.handler_decorator import error_handler
+from utils.jwt_keys import get_keyring
+
+
+@error_handler
+def handler(event, context):
+    return success_response(get_keyring().public_jwks())
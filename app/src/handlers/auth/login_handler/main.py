@@ -1,17 +1,15 @@
-import json
-
 from dependency import get_auth_service
 from utils.password_validator import validate_password
 from error_handling.responses import success_response, error_response
 from error_handling.exceptions import AppException
 from dto.auth_dto import LoginRequestDTO
 from utils.handler_decorator import error_handler
+from utils.request_parser import parse_body
 
 
 @error_handler
 def handler(event,context): 
-    body = json.loads(event["body"])
-    login_request = LoginRequestDTO(**body)
+    login_request = parse_body(event, LoginRequestDTO)
     auth_service = get_auth_service()
     token = auth_service.login(login_request)
     return success_response(token, 200)
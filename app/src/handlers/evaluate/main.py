@@ -1,19 +1,40 @@
-import json
-
-from dependency import get_current_user, get_feature_service
+from dependency import get_current_user, get_feature_service, require_environment
 from dto.feature_dto import EvaluateDTO
-from error_handling.responses import success_response
+from error_handling.responses import raw_json_response, success_response
 from utils.handler_decorator import error_handler
+from utils.request_parser import parse_body
+from utils.metrics import emit_metrics
+from utils.impressions import flush_impressions, record_impression
+from utils.variants import evaluation_body, user_key
 
 
 @error_handler
 def evaluate_feature_handler(event, context):
-    get_current_user(event)
+    user = get_current_user(event)
 
-    body = json.loads(event.get("body"))
-    dto = EvaluateDTO(**body)
+    dto = parse_body(event, EvaluateDTO)
+    require_environment(user, dto.environment.value)
 
     service = get_feature_service()
-    enabled = service.evaluate(dto)
+    try:
+        enabled, variant = service.evaluate_variant(dto)
+    finally:
+        emit_metrics("evaluate")
+
+    if variant is not None:
+        variant_name = variant.name
+    else:
+        variant_name = "on" if enabled else "off"
+
+    record_impression(
+        dto.feature.lower(),
+        dto.environment.value,
+        variant_name,
+        user.get("email") or user.get("sdk_key_id"),
+        user_key(dto.context),
+    )
+    flush_impressions()
 
-    return success_response({"enabled": enabled}, 200)
+    if variant is None:
+        return success_response({"enabled": enabled}, 200)
+    return raw_json_response(evaluation_body(variant), 200)
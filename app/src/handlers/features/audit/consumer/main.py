@@ -1,18 +1,24 @@
-import json
 import logging
 
 from infra.dynamodb import table
+from repository.feature_repository import FeatureRepository
+from utils.serialization import loads
 
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+_recorded_months = set()
+
 def handler(event, context):
     logger.info("AuditConsumer Lambda invoked")
     logger.info(f"Records received: {len(event['Records'])}")
 
+    repo = FeatureRepository(table)
+    months = set()
+
     for record in event["Records"]:
-        message = json.loads(record["body"])
+        message = loads(record["body"])
 
         logger.info(
             f"Processing audit message | "
@@ -20,14 +26,8 @@ def handler(event, context):
             f"action={message['action']}"
         )
 
-        table.put_item(
-            Item={
-                "PK": f"FEATURE#{message['feature'].lower()}",
-                "SK": f"AUDIT#{message['timestamp']}",
-                "action": message["action"],
-                "actor": message["actor"],
-                "old_value": message.get("old"),
-                "new_value": message.get("new"),
-                "created_at": message["timestamp"],
-            }
-        )
+        months.add(repo.put_audit(message))
+
+    for feature_name, month in months - _recorded_months:
+        repo.put_audit_month(feature_name, month)
+        _recorded_months.add((feature_name, month))
@@ -0,0 +1,18 @@
+from dependency import get_current_user, require_admin, get_feature_service
+from dto.feature_dto import BulkUpdateEnvDTO
+from error_handling.responses import success_response
+from utils.handler_decorator import error_handler
+from utils.request_parser import parse_body
+
+
+@error_handler
+def bulk_update_envs_handler(event, context):
+    user = get_current_user(event)
+    require_admin(user)
+
+    request = parse_body(event, BulkUpdateEnvDTO)
+
+    service = get_feature_service()
+    result = service.bulk_update_envs(request, actor="ADMIN")
+
+    return success_response(result, 207 if result.get("failed") else 200)
@@ -1,9 +1,8 @@
-import json
-
 from dependency import get_current_user, require_admin, get_feature_service
 from dto.feature_dto import CreateFeatureDTO
 from error_handling.responses import success_response
 from utils.handler_decorator import error_handler
+from utils.request_parser import parse_body
 
 
 @error_handler
@@ -11,8 +10,7 @@ def create_feature_handler(event, context):
     user = get_current_user(event)
     require_admin(user)
 
-    body = json.loads(event.get("body"))
-    dto = CreateFeatureDTO(**body)
+    dto = parse_body(event, CreateFeatureDTO)
 
     service = get_feature_service()
     service.create_feature(dto, actor="ADMIN")
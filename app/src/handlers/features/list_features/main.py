@@ -14,4 +14,4 @@ def list_features_handler(event, context):
     service = get_feature_service()
     features = service.list_features()
 
-    return success_response([f.model_dump() for f in features])
+    return success_response(features)
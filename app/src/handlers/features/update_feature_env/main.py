@@ -1,8 +1,8 @@
-import json
 from dependency import get_current_user, require_admin, get_feature_service
 from dto.feature_dto import UpdateFeatureEnvDTO
 from error_handling.responses import success_response
 from utils.handler_decorator import error_handler
+from utils.request_parser import parse_body
 
 
 @error_handler
@@ -14,8 +14,7 @@ def update_feature_env_handler(event, context):
     flag = path["flag"]
     env = path["env"]
 
-    body = json.loads(event.get("body"))
-    request = UpdateFeatureEnvDTO(**body)
+    request = parse_body(event, UpdateFeatureEnvDTO)
 
     service = get_feature_service()
     service.update_env(flag, env, request, actor="ADMIN")
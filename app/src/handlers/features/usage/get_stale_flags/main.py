@@ -0,0 +1,14 @@
+from dependency import get_current_user, require_admin, get_usage_service
+from error_handling.responses import success_response
+from utils.handler_decorator import error_handler
+
+
+@error_handler
+def get_stale_flags_handler(event, context):
+    user = get_current_user(event)
+    require_admin(user)
+
+    service = get_usage_service()
+    report = service.get_stale_flag_report()
+
+    return success_response(data=report, status_code=200)
@@ -0,0 +1,25 @@
+from dependency import get_current_user, require_admin, get_usage_service
+from error_handling.exceptions import ValidationException
+from error_handling.responses import success_response
+from utils.handler_decorator import error_handler
+
+DEFAULT_DAYS = 7
+
+
+@error_handler
+def get_feature_unique_users_handler(event, context):
+    user = get_current_user(event)
+    require_admin(user)
+
+    flag = event["pathParameters"]["flag"]
+    params = event.get("queryStringParameters") or {}
+
+    try:
+        days = int(params.get("days", DEFAULT_DAYS))
+    except ValueError:
+        raise ValidationException("days must be an integer")
+
+    service = get_usage_service()
+    usage = service.get_unique_users(flag, days, params.get("environment"))
+
+    return success_response(data=usage, status_code=200)
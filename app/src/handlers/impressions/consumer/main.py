@@ -0,0 +1,60 @@
+import base64
+import logging
+from collections import defaultdict
+
+from infra.dynamodb import table
+from repository.usage_repository import UsageRepository
+from utils.hyperloglog import HyperLogLog
+from utils.serialization import loads
+
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def handler(event, context):
+    logger.info(f"ImpressionsConsumer Lambda invoked | records={len(event['Records'])}")
+
+    repo = UsageRepository(table)
+    failures = []
+
+    # Records are applied one by one and only failed ones are returned, so SQS
+    # redelivers just those instead of re-adding counts for the whole batch.
+    for record in event["Records"]:
+        try:
+            _process(repo, loads(record["body"]))
+        except Exception as e:
+            logger.error(
+                f"Failed to roll up impressions | message_id={record['messageId']} | error={e}"
+            )
+            failures.append({"itemIdentifier": record["messageId"]})
+
+    return {"batchItemFailures": failures}
+
+
+def _process(repo: UsageRepository, message: dict):
+    daily = defaultdict(lambda: defaultdict(int))
+    sketches = defaultdict(dict)
+    samples = message.get("samples", [])
+
+    for feature, environment, variant, minute, count in message.get("counts", []):
+        daily[(feature, environment, minute[:10])][variant] += count
+
+    for feature, environment, variant, day, encoded in message.get("sketches", []):
+        sketch = HyperLogLog.from_bytes(base64.b64decode(encoded))
+        variants = sketches[(feature, environment, day)]
+        if variant in variants:
+            variants[variant].merge(sketch)
+        else:
+            variants[variant] = sketch
+
+    # Sketch merges are idempotent, so they go first; counts are the only
+    # writes a redelivery can double.
+    for (feature, environment, day), variant_sketches in sketches.items():
+        repo.merge_sketches(feature, environment, day, variant_sketches)
+    repo.put_samples(samples)
+    for (feature, environment, day), variant_counts in daily.items():
+        repo.add_counts(feature, environment, day, variant_counts)
+
+    logger.info(
+        f"Usage rolled up | items={len(daily)} | sketches={len(sketches)} | samples={len(samples)}"
+    )
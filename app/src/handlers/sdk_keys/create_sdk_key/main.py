@@ -0,0 +1,18 @@
+from dependency import get_current_user, require_admin, get_sdk_key_service
+from dto.auth_dto import CreateSDKKeyDTO
+from error_handling.responses import success_response
+from utils.handler_decorator import error_handler
+from utils.request_parser import parse_body
+
+
+@error_handler
+def create_sdk_key_handler(event, context):
+    user = get_current_user(event)
+    require_admin(user)
+
+    dto = parse_body(event, CreateSDKKeyDTO)
+
+    service = get_sdk_key_service()
+    key = service.create_key(dto, actor=user.get("email", "ADMIN"))
+
+    return success_response(key, 201)
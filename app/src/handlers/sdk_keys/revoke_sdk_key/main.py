@@ -0,0 +1,16 @@
+from dependency import get_current_user, require_admin, get_sdk_key_service
+from error_handling.responses import success_response
+from utils.handler_decorator import error_handler
+
+
+@error_handler
+def revoke_sdk_key_handler(event, context):
+    user = get_current_user(event)
+    require_admin(user)
+
+    key_id = event["pathParameters"]["key_id"]
+
+    service = get_sdk_key_service()
+    result = service.revoke_key(key_id)
+
+    return success_response(result, 200)
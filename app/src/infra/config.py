@@ -1,5 +1,9 @@
 import os
 import json
+import logging
+import threading
+import time
+
 import boto3
 
 try:
@@ -10,23 +14,103 @@ except Exception:
     pass
 
 
-_cached_secrets = None
+logger = logging.getLogger()
+
+SECRET_TTL_SECONDS = float(os.getenv("SECRET_TTL_SECONDS", "300"))
+SECRET_FAILURE_TTL_SECONDS = float(os.getenv("SECRET_FAILURE_TTL_SECONDS", "30"))
+
+_secrets_client = None
+_secret_cache = None
+
+
+def _get_secrets_client():
+    global _secrets_client
+    if _secrets_client is None:
+        _secrets_client = boto3.client("secretsmanager")
+    return _secrets_client
+
+
+def _fetch_secret(secret_id: str) -> dict:
+    response = _get_secrets_client().get_secret_value(SecretId=secret_id)
+    return json.loads(response.get("SecretString") or "{}")
+
+
+class SecretCache:
+    def __init__(
+        self,
+        fetch,
+        ttl_seconds: float,
+        clock=time.monotonic,
+        failure_ttl_seconds: float = SECRET_FAILURE_TTL_SECONDS,
+    ):
+        self._fetch = fetch
+        self.ttl_seconds = ttl_seconds
+        self.failure_ttl_seconds = failure_ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._values = None
+        self._loaded_at = 0.0
+        self._refreshing = False
+
+    def get(self) -> dict:
+        if self._values is None:
+            with self._lock:
+                if self._values is None:
+                    self._load_first()
+            return self._values
+
+        if self.ttl_seconds > 0 and self._clock() - self._loaded_at >= self.ttl_seconds:
+            self._refresh_in_background()
+        return self._values
+
+    def _load_first(self):
+        try:
+            self._values = self._fetch()
+            self._loaded_at = self._clock()
+        except Exception:
+            # Cache the miss too, otherwise every lookup during an outage
+            # would call Secrets Manager again.
+            logger.exception("Secret fetch failed, retrying in the background later")
+            self._values = {}
+            self._loaded_at = self._clock() - max(
+                self.ttl_seconds - self.failure_ttl_seconds, 0
+            )
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        threading.Thread(target=self.refresh, daemon=True).start()
+
+    def refresh(self):
+        try:
+            values = self._fetch()
+        except Exception:
+            logger.exception("Secret refresh failed, keeping cached values")
+            values = None
+
+        with self._lock:
+            if values is not None:
+                self._values = values
+            self._loaded_at = self._clock()
+            self._refreshing = False
 
-def _load_secrets():
-    global _cached_secrets
 
-    if _cached_secrets:
-        return _cached_secrets
+def _load_secrets() -> dict:
+    global _secret_cache
 
-    secret_arn = os.getenv("JWT_SECRET_ARN")
-    if not secret_arn:
-        return {}
+    if _secret_cache is None:
+        secret_arn = os.getenv("JWT_SECRET_ARN")
+        if secret_arn:
+            fetch = lambda: _fetch_secret(secret_arn)  # noqa: E731
+        else:
+            fetch = dict
+        _secret_cache = SecretCache(fetch, SECRET_TTL_SECONDS)
 
-    client = boto3.client("secretsmanager")
-    response = client.get_secret_value(SecretId=secret_arn)
-    _cached_secrets = json.loads(response["SecretString"])
+    return _secret_cache.get()
 
-    return _cached_secrets
 
 def get_env(key: str, default=None):
     value = os.getenv(key)
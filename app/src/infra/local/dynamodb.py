@@ -0,0 +1,473 @@
+import copy
+import math
+import threading
+import zlib
+from decimal import Decimal
+from types import SimpleNamespace
+
+from botocore.exceptions import ClientError
+
+from infra.local.expressions import Condition, ExpressionError, Projection, Update
+
+
+def _client_error(code: str, message: str, operation: str, **extra) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": code, "Message": message}, **extra},
+        operation,
+    )
+
+
+def _validation_error(message: str, operation: str) -> ClientError:
+    return _client_error("ValidationException", message, operation)
+
+
+def _size(value) -> int:
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, (int, float, Decimal)):
+        return len(str(value)) // 2 + 1
+    if isinstance(value, dict):
+        return 3 + sum(_size(name) + _size(item) for name, item in value.items())
+    return 3 + sum(_size(item) + 1 for item in value)
+
+
+def _read_units(size: int, consistent: bool = False) -> float:
+    units = max(math.ceil(size / 4096), 1)
+    return float(units) if consistent else units / 2
+
+
+def _write_units(size: int) -> float:
+    return float(max(math.ceil(size / 1024), 1))
+
+
+class InMemoryTable:
+    def __init__(
+        self,
+        name: str,
+        client: "InMemoryDynamoDBClient",
+        hash_key: str = "PK",
+        range_key: str | None = "SK",
+        page_size: int | None = None,
+    ):
+        self.name = name
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.page_size = page_size
+        self.meta = SimpleNamespace(client=client)
+
+        self._items = {}
+        self._partitions = {}
+        self._lock = client._lock
+
+    def _store(self, key: tuple, item: dict):
+        self._items[key] = item
+        self._partitions.setdefault(key[0], set()).add(key)
+
+    def _discard(self, key: tuple):
+        item = self._items.pop(key, None)
+        partition = self._partitions.get(key[0])
+        if partition is not None:
+            partition.discard(key)
+            if not partition:
+                del self._partitions[key[0]]
+        return item
+
+    def _key(self, key: dict, operation: str) -> tuple:
+        try:
+            if self.range_key is None:
+                return (key[self.hash_key],)
+            return (key[self.hash_key], key[self.range_key])
+        except KeyError:
+            raise _validation_error(
+                "The provided key element does not match the schema", operation
+            )
+
+    def _key_of(self, item: dict) -> dict:
+        key = {self.hash_key: item[self.hash_key]}
+        if self.range_key is not None:
+            key[self.range_key] = item[self.range_key]
+        return key
+
+    @staticmethod
+    def _condition(kwargs: dict, name: str = "ConditionExpression"):
+        expression = kwargs.get(name)
+        if not expression:
+            return None
+        return Condition(
+            expression,
+            kwargs.get("ExpressionAttributeNames"),
+            kwargs.get("ExpressionAttributeValues"),
+        )
+
+    @staticmethod
+    def _project(item: dict, kwargs: dict) -> dict:
+        expression = kwargs.get("ProjectionExpression")
+        if not expression:
+            return copy.deepcopy(item)
+        projection = Projection(expression, kwargs.get("ExpressionAttributeNames"))
+        return copy.deepcopy(projection.apply(item))
+
+    def _check(self, key: tuple, kwargs: dict, operation: str):
+        condition = self._condition(kwargs)
+        if condition is not None and not condition.evaluate(self._items.get(key)):
+            raise _client_error(
+                "ConditionalCheckFailedException",
+                "The conditional request failed",
+                operation,
+            )
+
+    def _with_capacity(self, response: dict, units: float, kwargs: dict) -> dict:
+        if kwargs.get("ReturnConsumedCapacity") in ("TOTAL", "INDEXES"):
+            response["ConsumedCapacity"] = {
+                "TableName": self.name,
+                "CapacityUnits": units,
+            }
+        return response
+
+    def get_item(self, Key: dict, **kwargs):
+        with self._lock:
+            item = self._items.get(self._key(Key, "GetItem"))
+            units = _read_units(_size(item or {}), kwargs.get("ConsistentRead", False))
+            if item is None:
+                return self._with_capacity({}, units, kwargs)
+            return self._with_capacity(
+                {"Item": self._project(item, kwargs)}, units, kwargs
+            )
+
+    def put_item(self, Item: dict, **kwargs):
+        with self._lock:
+            response = self._put(Item, kwargs, "PutItem")
+            return self._with_capacity(response, _write_units(_size(Item)), kwargs)
+
+    def _put(self, item: dict, kwargs: dict, operation: str):
+        key = self._key(item, operation)
+        self._check(key, kwargs, operation)
+        old = self._items.get(key)
+        self._store(key, copy.deepcopy(item))
+        if kwargs.get("ReturnValues") == "ALL_OLD" and old is not None:
+            return {"Attributes": copy.deepcopy(old)}
+        return {}
+
+    def update_item(self, Key: dict, **kwargs):
+        with self._lock:
+            response = self._update(Key, kwargs, "UpdateItem")
+            item = self._items[self._key(Key, "UpdateItem")]
+            return self._with_capacity(response, _write_units(_size(item)), kwargs)
+
+    def _update(self, key_attrs: dict, kwargs: dict, operation: str):
+        key = self._key(key_attrs, operation)
+        self._check(key, kwargs, operation)
+
+        old = self._items.get(key)
+        item = copy.deepcopy(old) if old is not None else copy.deepcopy(key_attrs)
+
+        expression = kwargs.get("UpdateExpression")
+        updated = set()
+        if expression:
+            try:
+                updated = Update(
+                    expression,
+                    kwargs.get("ExpressionAttributeNames"),
+                    kwargs.get("ExpressionAttributeValues"),
+                ).apply(item)
+            except ExpressionError as e:
+                raise _validation_error(str(e), operation)
+
+        self._store(key, item)
+
+        return_values = kwargs.get("ReturnValues", "NONE")
+        if return_values == "ALL_NEW":
+            return {"Attributes": copy.deepcopy(item)}
+        if return_values == "UPDATED_NEW":
+            return {
+                "Attributes": {
+                    name: copy.deepcopy(item[name]) for name in updated if name in item
+                }
+            }
+        if return_values == "ALL_OLD" and old is not None:
+            return {"Attributes": copy.deepcopy(old)}
+        return {}
+
+    def delete_item(self, Key: dict, **kwargs):
+        with self._lock:
+            item = self._items.get(self._key(Key, "DeleteItem"))
+            response = self._delete(Key, kwargs, "DeleteItem")
+            return self._with_capacity(response, _write_units(_size(item or {})), kwargs)
+
+    def _delete(self, key_attrs: dict, kwargs: dict, operation: str):
+        key = self._key(key_attrs, operation)
+        self._check(key, kwargs, operation)
+        old = self._discard(key)
+        if kwargs.get("ReturnValues") == "ALL_OLD" and old is not None:
+            return {"Attributes": old}
+        return {}
+
+    def _page(self, keys: list, kwargs: dict, operation: str) -> dict:
+        start = kwargs.get("ExclusiveStartKey")
+        if start is not None:
+            start_key = self._key(start, operation)
+            if kwargs.get("ScanIndexForward", True):
+                keys = [key for key in keys if key > start_key]
+            else:
+                keys = [key for key in keys if key < start_key]
+
+        limits = [
+            limit for limit in (kwargs.get("Limit"), self.page_size) if limit
+        ]
+        limit = min(limits) if limits else None
+        page = keys if limit is None else keys[:limit]
+
+        condition = self._condition(kwargs, "FilterExpression")
+        items = [
+            self._project(self._items[key], kwargs)
+            for key in page
+            if condition is None or condition.evaluate(self._items[key])
+        ]
+
+        response = {"Items": items, "Count": len(items), "ScannedCount": len(page)}
+        self._with_capacity(
+            response,
+            _read_units(
+                sum(_size(self._items[key]) for key in page),
+                kwargs.get("ConsistentRead", False),
+            ),
+            kwargs,
+        )
+        if kwargs.get("Select") == "COUNT":
+            del response["Items"]
+        if limit is not None and len(keys) > limit:
+            response["LastEvaluatedKey"] = self._key_of(self._items[page[-1]])
+        return response
+
+    def query(self, KeyConditionExpression: str, **kwargs):
+        if kwargs.get("IndexName"):
+            raise _validation_error("Secondary indexes are not supported", "Query")
+
+        with self._lock:
+            condition = Condition(
+                KeyConditionExpression,
+                kwargs.get("ExpressionAttributeNames"),
+                kwargs.get("ExpressionAttributeValues"),
+            )
+            partition = condition.equality_value(self.hash_key)
+
+            keys = sorted(
+                key
+                for key in self._partitions.get(partition, ())
+                if condition.evaluate(self._items[key])
+            )
+            if not kwargs.get("ScanIndexForward", True):
+                keys.reverse()
+
+            return self._page(keys, kwargs, "Query")
+
+    def scan(self, **kwargs):
+        with self._lock:
+            keys = sorted(self._items)
+
+            total_segments = kwargs.get("TotalSegments")
+            if total_segments:
+                segment = kwargs.get("Segment", 0)
+                keys = [
+                    key for key in keys if zlib.crc32(str(key[0]).encode()) % total_segments == segment
+                ]
+
+            return self._page(keys, kwargs, "Scan")
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        return _BatchWriter(self)
+
+    def items(self) -> list[dict]:
+        with self._lock:
+            return [copy.deepcopy(self._items[key]) for key in sorted(self._items)]
+
+
+class _BatchWriter:
+    def __init__(self, table: InMemoryTable):
+        self.table = table
+        self._requests = []
+
+    def put_item(self, Item: dict):
+        self._requests.append(("put", Item))
+
+    def delete_item(self, Key: dict):
+        self._requests.append(("delete", Key))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def flush(self):
+        with self.table._lock:
+            for action, payload in self._requests:
+                if action == "put":
+                    self.table._put(payload, {}, "BatchWriteItem")
+                else:
+                    self.table._delete(payload, {}, "BatchWriteItem")
+        self._requests = []
+
+
+class InMemoryDynamoDBClient:
+    MAX_TRANSACT_ITEMS = 100
+    MAX_BATCH_GET_KEYS = 100
+    MAX_BATCH_WRITE_ITEMS = 25
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._tables = {}
+
+    def _table(self, name: str, operation: str) -> InMemoryTable:
+        table = self._tables.get(name)
+        if table is None:
+            raise _client_error(
+                "ResourceNotFoundException",
+                f"Requested resource not found: Table: {name}",
+                operation,
+            )
+        return table
+
+    @staticmethod
+    def _with_capacity(response: dict, units: dict, kwargs: dict) -> dict:
+        if kwargs.get("ReturnConsumedCapacity") in ("TOTAL", "INDEXES"):
+            response["ConsumedCapacity"] = [
+                {"TableName": name, "CapacityUnits": total}
+                for name, total in units.items()
+            ]
+        return response
+
+    def transact_write_items(self, TransactItems: list, **kwargs):
+        operation = "TransactWriteItems"
+        if len(TransactItems) > self.MAX_TRANSACT_ITEMS:
+            raise _validation_error(
+                f"Member must have length less than or equal to {self.MAX_TRANSACT_ITEMS}",
+                operation,
+            )
+
+        with self._lock:
+            reasons = []
+            seen = set()
+            for entry in TransactItems:
+                (action, request), = entry.items()
+                table = self._table(request["TableName"], operation)
+                key_attrs = request.get("Key") or request.get("Item")
+                key = (table.name, table._key(key_attrs, operation))
+                if key in seen:
+                    raise _validation_error(
+                        "Transaction request cannot include multiple operations on one item",
+                        operation,
+                    )
+                seen.add(key)
+
+                condition = table._condition(request)
+                if condition is None or condition.evaluate(table._items.get(key[1])):
+                    reasons.append({"Code": "None"})
+                else:
+                    reasons.append({
+                        "Code": "ConditionalCheckFailed",
+                        "Message": "The conditional request failed",
+                    })
+
+            if any(reason["Code"] != "None" for reason in reasons):
+                raise _client_error(
+                    "TransactionCanceledException",
+                    "Transaction cancelled",
+                    operation,
+                    CancellationReasons=reasons,
+                )
+
+            units = {}
+            for entry in TransactItems:
+                (action, request), = entry.items()
+                table = self._table(request["TableName"], operation)
+                key = table._key(request.get("Key") or request.get("Item"), operation)
+                size = _size(table._items.get(key) or {})
+                unconditional = {
+                    name: value
+                    for name, value in request.items()
+                    if name != "ConditionExpression"
+                }
+                if action == "Put":
+                    table._put(request["Item"], unconditional, operation)
+                elif action == "Update":
+                    table._update(request["Key"], unconditional, operation)
+                elif action == "Delete":
+                    table._delete(request["Key"], unconditional, operation)
+
+                if action in ("Put", "Update"):
+                    size = _size(table._items[key])
+                if action != "ConditionCheck":
+                    units[table.name] = units.get(table.name, 0) + 2 * _write_units(size)
+
+        return self._with_capacity({}, units, kwargs)
+
+    def batch_get_item(self, RequestItems: dict, **kwargs):
+        operation = "BatchGetItem"
+        total = sum(len(request["Keys"]) for request in RequestItems.values())
+        if total > self.MAX_BATCH_GET_KEYS:
+            raise _validation_error(
+                f"Too many items requested for the {operation} call", operation
+            )
+
+        responses = {}
+        units = {}
+        with self._lock:
+            for name, request in RequestItems.items():
+                table = self._table(name, operation)
+                found = responses.setdefault(name, [])
+                for key_attrs in request["Keys"]:
+                    item = table._items.get(table._key(key_attrs, operation))
+                    units[name] = units.get(name, 0) + _read_units(
+                        _size(item or {}), request.get("ConsistentRead", False)
+                    )
+                    if item is not None:
+                        found.append(table._project(item, request))
+
+        return self._with_capacity(
+            {"Responses": responses, "UnprocessedKeys": {}}, units, kwargs
+        )
+
+    def batch_write_item(self, RequestItems: dict, **kwargs):
+        operation = "BatchWriteItem"
+        total = sum(len(requests) for requests in RequestItems.values())
+        if total > self.MAX_BATCH_WRITE_ITEMS:
+            raise _validation_error(
+                f"Too many items requested for the {operation} call", operation
+            )
+
+        units = {}
+        with self._lock:
+            for name, requests in RequestItems.items():
+                table = self._table(name, operation)
+                for request in requests:
+                    if "PutRequest" in request:
+                        item = request["PutRequest"]["Item"]
+                        table._put(item, {}, operation)
+                    else:
+                        item = table._delete(
+                            request["DeleteRequest"]["Key"],
+                            {"ReturnValues": "ALL_OLD"},
+                            operation,
+                        ).get("Attributes", {})
+                    units[name] = units.get(name, 0) + _write_units(_size(item))
+
+        return self._with_capacity({"UnprocessedItems": {}}, units, kwargs)
+
+
+class InMemoryDynamoDB:
+    def __init__(self):
+        self.meta = SimpleNamespace(client=InMemoryDynamoDBClient())
+
+    def Table(self, name: str, **kwargs) -> InMemoryTable:
+        client = self.meta.client
+        with client._lock:
+            table = client._tables.get(name)
+            if table is None:
+                table = InMemoryTable(name, client, **kwargs)
+                client._tables[name] = table
+            return table
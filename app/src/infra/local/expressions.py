@@ -0,0 +1,497 @@
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+_TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<op><>|<=|>=|=|<|>|\(|\)|,|\+|-|\.|\[|\])"
+    r"|(?P<name>#[A-Za-z0-9_]+)"
+    r"|(?P<value>:[A-Za-z0-9_]+)"
+    r"|(?P<number>\d+)"
+    r"|(?P<ident>[A-Za-z_][A-Za-z0-9_]*)"
+    r")"
+)
+
+_KEYWORDS = {"AND", "OR", "NOT", "BETWEEN", "IN", "SET", "REMOVE", "ADD", "DELETE"}
+_MISSING = object()
+
+
+def _tokenize(expression: str) -> list[tuple[str, str]]:
+    tokens = []
+    position = 0
+    expression = expression.strip()
+
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match or match.end() == position:
+            raise ExpressionError(f"Invalid expression near: {expression[position:]!r}")
+        position = match.end()
+
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "ident" and text.upper() in _KEYWORDS:
+            tokens.append(("keyword", text.upper()))
+        else:
+            tokens.append((kind, text))
+
+    return tokens
+
+
+@dataclass(frozen=True)
+class Path:
+    parts: tuple
+
+    def get(self, item: dict):
+        current = item
+        for part in self.parts:
+            if isinstance(part, int):
+                if not isinstance(current, list) or part >= len(current):
+                    return _MISSING
+                current = current[part]
+            else:
+                if not isinstance(current, dict) or part not in current:
+                    return _MISSING
+                current = current[part]
+        return current
+
+    def set(self, item: dict, value):
+        current = item
+        for part in self.parts[:-1]:
+            current = current[part]
+        last = self.parts[-1]
+        if isinstance(last, int) and last >= len(current):
+            current.append(value)
+        else:
+            current[last] = value
+
+    def remove(self, item: dict):
+        current = item
+        for part in self.parts[:-1]:
+            current = current.get(part) if isinstance(current, dict) else None
+            if current is None:
+                return
+        last = self.parts[-1]
+        if isinstance(current, dict):
+            current.pop(last, None)
+        elif isinstance(current, list) and last < len(current):
+            del current[last]
+
+    @property
+    def top(self) -> str:
+        return self.parts[0]
+
+
+@dataclass(frozen=True)
+class Value:
+    value: object
+
+    def get(self, item: dict):
+        return self.value
+
+
+class _Parser:
+    def __init__(self, expression: str, names: dict | None, values: dict | None):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.names = names or {}
+        self.values = values or {}
+
+    def peek(self, offset: int = 0):
+        index = self.position + offset
+        if index < len(self.tokens):
+            return self.tokens[index]
+        return (None, None)
+
+    def next(self):
+        token = self.peek()
+        if token[0] is None:
+            raise ExpressionError("Unexpected end of expression")
+        self.position += 1
+        return token
+
+    def expect(self, text: str):
+        kind, value = self.next()
+        if value != text:
+            raise ExpressionError(f"Expected {text!r}, got {value!r}")
+
+    def accept(self, text: str) -> bool:
+        if self.peek()[1] == text:
+            self.position += 1
+            return True
+        return False
+
+    def done(self) -> bool:
+        return self.position >= len(self.tokens)
+
+    def path(self) -> Path:
+        parts = [self._name()]
+        while True:
+            if self.accept("."):
+                parts.append(self._name())
+            elif self.accept("["):
+                kind, number = self.next()
+                if kind != "number":
+                    raise ExpressionError("List index must be a number")
+                parts.append(int(number))
+                self.expect("]")
+            else:
+                return Path(tuple(parts))
+
+    def _name(self) -> str:
+        kind, text = self.next()
+        if kind == "name":
+            if text not in self.names:
+                raise ExpressionError(f"Undefined attribute name: {text}")
+            return self.names[text]
+        if kind == "ident":
+            return text
+        raise ExpressionError(f"Expected attribute name, got {text!r}")
+
+    def operand(self):
+        kind, text = self.peek()
+        if kind == "value":
+            self.next()
+            if text not in self.values:
+                raise ExpressionError(f"Undefined attribute value: {text}")
+            return Value(self.values[text])
+        if kind == "ident" and text == "size" and self.peek(1)[1] == "(":
+            self.next()
+            self.expect("(")
+            path = self.path()
+            self.expect(")")
+            return _Size(path)
+        return self.path()
+
+    def condition(self):
+        left = self._and()
+        while self.accept("OR"):
+            left = _Or(left, self._and())
+        return left
+
+    def _and(self):
+        left = self._not()
+        while self.accept("AND"):
+            left = _And(left, self._not())
+        return left
+
+    def _not(self):
+        if self.accept("NOT"):
+            return _Not(self._not())
+        return self._primary()
+
+    def _primary(self):
+        if self.accept("("):
+            node = self.condition()
+            self.expect(")")
+            return node
+
+        kind, text = self.peek()
+        if kind == "ident" and text in _FUNCTIONS and self.peek(1)[1] == "(":
+            self.next()
+            self.expect("(")
+            args = [self.operand()]
+            while self.accept(","):
+                args.append(self.operand())
+            self.expect(")")
+            return _Function(text, tuple(args))
+
+        left = self.operand()
+        kind, text = self.next()
+
+        if text == "BETWEEN":
+            low = self.operand()
+            self.expect("AND")
+            return _Between(left, low, self.operand())
+
+        if text == "IN":
+            self.expect("(")
+            options = [self.operand()]
+            while self.accept(","):
+                options.append(self.operand())
+            self.expect(")")
+            return _In(left, tuple(options))
+
+        if text in _COMPARATORS:
+            return _Compare(text, left, self.operand())
+
+        raise ExpressionError(f"Unexpected token {text!r}")
+
+
+@dataclass(frozen=True)
+class _Size:
+    path: Path
+
+    def get(self, item: dict):
+        value = self.path.get(item)
+        if value is _MISSING:
+            return _MISSING
+        if isinstance(value, str):
+            return len(value.encode("utf-8"))
+        return len(value)
+
+
+def _comparable(left, right) -> bool:
+    if left is _MISSING or right is _MISSING:
+        return False
+    numbers = (int, float, Decimal)
+    if isinstance(left, bool) or isinstance(right, bool):
+        return type(left) is type(right)
+    if isinstance(left, numbers) and isinstance(right, numbers):
+        return True
+    return type(left) is type(right)
+
+
+_COMPARATORS = {
+    "=": lambda a, b: a == b,
+    "<>": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+@dataclass(frozen=True)
+class _Compare:
+    op: str
+    left: object
+    right: object
+
+    def evaluate(self, item: dict) -> bool:
+        left = self.left.get(item)
+        right = self.right.get(item)
+        if not _comparable(left, right):
+            return self.op == "<>" and left is not _MISSING
+        return _COMPARATORS[self.op](left, right)
+
+
+@dataclass(frozen=True)
+class _Between:
+    operand: object
+    low: object
+    high: object
+
+    def evaluate(self, item: dict) -> bool:
+        value = self.operand.get(item)
+        low = self.low.get(item)
+        high = self.high.get(item)
+        if not (_comparable(value, low) and _comparable(value, high)):
+            return False
+        return low <= value <= high
+
+
+@dataclass(frozen=True)
+class _In:
+    operand: object
+    options: tuple
+
+    def evaluate(self, item: dict) -> bool:
+        value = self.operand.get(item)
+        return any(
+            _comparable(value, option.get(item)) and value == option.get(item)
+            for option in self.options
+        )
+
+
+def _begins_with(value, prefix) -> bool:
+    if isinstance(value, str) and isinstance(prefix, str):
+        return value.startswith(prefix)
+    if isinstance(value, bytes) and isinstance(prefix, bytes):
+        return value.startswith(prefix)
+    return False
+
+
+def _contains(value, operand) -> bool:
+    if value is _MISSING or operand is _MISSING:
+        return False
+    if isinstance(value, str):
+        return isinstance(operand, str) and operand in value
+    if isinstance(value, (list, set, frozenset)):
+        return operand in value
+    return False
+
+
+_FUNCTIONS = {
+    "attribute_exists": lambda value: value is not _MISSING,
+    "attribute_not_exists": lambda value: value is _MISSING,
+    "begins_with": _begins_with,
+    "contains": _contains,
+}
+
+
+@dataclass(frozen=True)
+class _Function:
+    name: str
+    args: tuple
+
+    def evaluate(self, item: dict) -> bool:
+        return _FUNCTIONS[self.name](*(arg.get(item) for arg in self.args))
+
+
+@dataclass(frozen=True)
+class _And:
+    left: object
+    right: object
+
+    def evaluate(self, item: dict) -> bool:
+        return self.left.evaluate(item) and self.right.evaluate(item)
+
+
+@dataclass(frozen=True)
+class _Or:
+    left: object
+    right: object
+
+    def evaluate(self, item: dict) -> bool:
+        return self.left.evaluate(item) or self.right.evaluate(item)
+
+
+@dataclass(frozen=True)
+class _Not:
+    node: object
+
+    def evaluate(self, item: dict) -> bool:
+        return not self.node.evaluate(item)
+
+
+class Condition:
+    def __init__(self, expression: str, names=None, values=None):
+        parser = _Parser(expression, names, values)
+        self.root = parser.condition()
+        if not parser.done():
+            raise ExpressionError(f"Unexpected token {parser.peek()[1]!r}")
+
+    def evaluate(self, item: dict | None) -> bool:
+        return self.root.evaluate(item or {})
+
+    def equality_value(self, attribute: str):
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, _And):
+                stack.extend((node.left, node.right))
+            elif (
+                isinstance(node, _Compare)
+                and node.op == "="
+                and isinstance(node.left, Path)
+                and node.left.parts == (attribute,)
+                and isinstance(node.right, Value)
+            ):
+                return node.right.value
+        raise ExpressionError(f"Key condition must test {attribute} for equality")
+
+
+def _add(left, right):
+    if isinstance(left, (set, frozenset)):
+        return set(left) | set(right)
+    return left + right
+
+
+class Update:
+    def __init__(self, expression: str, names=None, values=None):
+        parser = _Parser(expression, names, values)
+        self.actions = []
+
+        while not parser.done():
+            kind, clause = parser.next()
+            if clause not in ("SET", "REMOVE", "ADD", "DELETE"):
+                raise ExpressionError(f"Unknown update clause: {clause!r}")
+            while True:
+                self.actions.append(self._action(parser, clause))
+                if not parser.accept(","):
+                    break
+
+    def _action(self, parser: _Parser, clause: str):
+        path = parser.path()
+        if clause == "REMOVE":
+            return clause, path, None
+        if clause in ("ADD", "DELETE"):
+            return clause, path, parser.operand()
+
+        parser.expect("=")
+        value = self._set_value(parser)
+        if parser.accept("+"):
+            value = ("+", value, self._set_value(parser))
+        elif parser.accept("-"):
+            value = ("-", value, self._set_value(parser))
+        return clause, path, value
+
+    def _set_value(self, parser: _Parser):
+        kind, text = parser.peek()
+        if kind == "ident" and text in ("if_not_exists", "list_append"):
+            parser.next()
+            parser.expect("(")
+            first = parser.operand()
+            parser.expect(",")
+            second = parser.operand()
+            parser.expect(")")
+            return (text, first, second)
+        return parser.operand()
+
+    def _resolve(self, value, item: dict):
+        if not isinstance(value, tuple):
+            resolved = value.get(item)
+            if resolved is _MISSING:
+                raise ExpressionError("Update expression references a missing attribute")
+            return resolved
+
+        op, first, second = value
+        if op == "if_not_exists":
+            existing = first.get(item)
+            return self._resolve(second, item) if existing is _MISSING else existing
+        if op == "list_append":
+            return list(self._resolve(first, item)) + list(self._resolve(second, item))
+        if op == "+":
+            return self._resolve(first, item) + self._resolve(second, item)
+        return self._resolve(first, item) - self._resolve(second, item)
+
+    def apply(self, item: dict) -> set[str]:
+        snapshot = dict(item)
+        updated = set()
+
+        for clause, path, value in self.actions:
+            updated.add(path.top)
+            if clause == "SET":
+                path.set(item, self._resolve(value, snapshot))
+            elif clause == "REMOVE":
+                path.remove(item)
+            elif clause == "ADD":
+                existing = path.get(item)
+                operand = value.get(snapshot)
+                path.set(item, operand if existing is _MISSING else _add(existing, operand))
+            else:
+                existing = path.get(item)
+                if existing is not _MISSING:
+                    path.set(item, set(existing) - set(value.get(snapshot)))
+
+        return updated
+
+
+class Projection:
+    def __init__(self, expression: str, names=None):
+        parser = _Parser(expression, names, None)
+        self.paths = [parser.path()]
+        while parser.accept(","):
+            self.paths.append(parser.path())
+        if not parser.done():
+            raise ExpressionError(f"Unexpected token {parser.peek()[1]!r}")
+
+    def apply(self, item: dict) -> dict:
+        projected = {}
+        for path in self.paths:
+            value = path.get(item)
+            if value is _MISSING:
+                continue
+            target = projected
+            for part, next_part in zip(path.parts, path.parts[1:]):
+                target = target.setdefault(part, [] if isinstance(next_part, int) else {})
+            if isinstance(target, list):
+                target.append(value)
+            else:
+                target[path.parts[-1]] = value
+        return projected
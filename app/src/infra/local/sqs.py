@@ -0,0 +1,101 @@
+import hashlib
+import threading
+import uuid
+from collections import deque
+
+from botocore.exceptions import ClientError
+
+
+class InMemorySQSClient:
+    MAX_BATCH_ENTRIES = 10
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues = {}
+        self._in_flight = {}
+
+    def _queue(self, queue_url: str) -> deque:
+        return self._queues.setdefault(queue_url, deque())
+
+    @staticmethod
+    def _message(body: str) -> dict:
+        return {
+            "MessageId": str(uuid.uuid4()),
+            "MD5OfMessageBody": hashlib.md5(body.encode("utf-8")).hexdigest(),
+            "Body": body,
+        }
+
+    def send_message(self, QueueUrl: str, MessageBody: str, **kwargs):
+        message = self._message(MessageBody)
+        with self._lock:
+            self._queue(QueueUrl).append(message)
+        return {
+            "MessageId": message["MessageId"],
+            "MD5OfMessageBody": message["MD5OfMessageBody"],
+        }
+
+    def send_message_batch(self, QueueUrl: str, Entries: list, **kwargs):
+        if len(Entries) > self.MAX_BATCH_ENTRIES:
+            raise ClientError(
+                {
+                    "Error": {
+                        "Code": "AWS.SimpleQueueService.TooManyEntriesInBatchRequest",
+                        "Message": "Maximum number of entries per request are 10",
+                    }
+                },
+                "SendMessageBatch",
+            )
+
+        successful = []
+        with self._lock:
+            queue = self._queue(QueueUrl)
+            for entry in Entries:
+                message = self._message(entry["MessageBody"])
+                queue.append(message)
+                successful.append({
+                    "Id": entry["Id"],
+                    "MessageId": message["MessageId"],
+                    "MD5OfMessageBody": message["MD5OfMessageBody"],
+                })
+
+        return {"Successful": successful, "Failed": []}
+
+    def receive_message(self, QueueUrl: str, MaxNumberOfMessages: int = 1, **kwargs):
+        messages = []
+        with self._lock:
+            queue = self._queue(QueueUrl)
+            while queue and len(messages) < MaxNumberOfMessages:
+                message = dict(queue.popleft(), ReceiptHandle=str(uuid.uuid4()))
+                self._in_flight[message["ReceiptHandle"]] = (QueueUrl, message)
+                messages.append(message)
+
+        if not messages:
+            return {}
+        return {"Messages": messages}
+
+    def delete_message(self, QueueUrl: str, ReceiptHandle: str, **kwargs):
+        with self._lock:
+            self._in_flight.pop(ReceiptHandle, None)
+        return {}
+
+    def drain_event(self, queue_url: str, batch_size: int = 10) -> dict | None:
+        with self._lock:
+            queue = self._queue(queue_url)
+            records = []
+            while queue and len(records) < batch_size:
+                message = queue.popleft()
+                records.append({
+                    "messageId": message["MessageId"],
+                    "md5OfBody": message["MD5OfMessageBody"],
+                    "body": message["Body"],
+                    "eventSource": "aws:sqs",
+                    "eventSourceARN": queue_url,
+                })
+
+        if not records:
+            return None
+        return {"Records": records}
+
+    def depth(self, queue_url: str) -> int:
+        with self._lock:
+            return len(self._queue(queue_url))
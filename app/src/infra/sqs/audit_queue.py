@@ -16,3 +16,13 @@ def send_message(message_body: str):
         QueueUrl=QUEUE_URL,
         MessageBody=message_body,
     )
+
+
+def send_message_batch(message_bodies: list[str]):
+    return _sqs.send_message_batch(
+        QueueUrl=QUEUE_URL,
+        Entries=[
+            {"Id": str(index), "MessageBody": body}
+            for index, body in enumerate(message_bodies)
+        ],
+    )
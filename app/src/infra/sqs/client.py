@@ -8,8 +8,13 @@ _sqs_client = None
 def get_sqs_client():
     global _sqs_client
     if _sqs_client is None:
-        _sqs_client = boto3.client(
-            "sqs",
-            region_name=get_env("AWS_REGION", "ap-south-1"),
-        )
+        if get_env("INFRA_BACKEND", "aws") == "memory":
+            from infra.local.sqs import InMemorySQSClient
+
+            _sqs_client = InMemorySQSClient()
+        else:
+            _sqs_client = boto3.client(
+                "sqs",
+                region_name=get_env("AWS_REGION", "ap-south-1"),
+            )
     return _sqs_client
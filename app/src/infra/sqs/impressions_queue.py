@@ -0,0 +1,15 @@
+from infra.config import get_env
+
+from infra.sqs.client import get_sqs_client
+
+QUEUE_URL = get_env("IMPRESSIONS_QUEUE_URL", "")
+
+
+def send_message_batch(message_bodies: list[str]):
+    return get_sqs_client().send_message_batch(
+        QueueUrl=QUEUE_URL,
+        Entries=[
+            {"Id": str(index), "MessageBody": body}
+            for index, body in enumerate(message_bodies)
+        ],
+    )
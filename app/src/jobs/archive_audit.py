@@ -0,0 +1,43 @@
+import argparse
+import logging
+from datetime import datetime, timezone
+
+from audit_archive.retention import archive_cutoff
+from audit_archive.store import archive_records, to_record
+from repository.feature_repository import FeatureRepository
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def archive_audit(
+    repo: FeatureRepository,
+    root: str,
+    now: datetime | None = None,
+) -> int:
+    cutoff = archive_cutoff(now or datetime.now(timezone.utc))
+
+    records = [to_record(item) for item in repo.scan_audit_items(cutoff.isoformat())]
+    written = archive_records(root, records)
+
+    logger.info(
+        f"Audit archive updated | root={root} | cutoff={cutoff.isoformat()} | "
+        f"scanned={len(records)} | written={written}"
+    )
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Archive audit rows older than AUDIT_ARCHIVE_AFTER_DAYS to gzipped NDJSON."
+    )
+    parser.add_argument("--archive-dir", required=True)
+    args = parser.parse_args(argv)
+
+    from infra.dynamodb import table
+
+    archive_audit(FeatureRepository(table), args.archive_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import logging
+
+from error_handling.exceptions import EnvironmentNotFoundException
+from repository.feature_repository import FeatureRepository
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def backfill(repo: FeatureRepository) -> int:
+    count = 0
+
+    for item in repo.scan_flag_states():
+        sk = item["SK"]
+        if not sk.startswith("ENV#"):
+            continue
+
+        try:
+            written = repo.put_effective_state(
+                item["PK"].replace("FEATURE#", ""),
+                sk.replace("ENV#", ""),
+                item["enabled"],
+                item.get("rollout_end_at"),
+                item.get("variants"),
+                item.get("prerequisites"),
+            )
+        except EnvironmentNotFoundException:
+            continue
+        count += int(written)
+
+    logger.info(f"Effective state backfilled | items={count}")
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Materialize STATE# items for every existing ENV# item."
+    )
+    parser.parse_args(argv)
+
+    from infra.dynamodb import table
+
+    backfill(FeatureRepository(table))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import heapq
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from audit_archive.retention import parse_timestamp
+from enums.actions import AuditAction
+from infra.config import get_env
+from repository.feature_repository import FeatureRepository
+from repository.usage_repository import UsageRepository
+from utils.serialization import dumps
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+STALE_FLAG_AFTER_DAYS = int(get_env("STALE_FLAG_AFTER_DAYS", "30"))
+STALE_FLAG_REPORT_MAX_ENTRIES = int(get_env("STALE_FLAG_REPORT_MAX_ENTRIES", "500"))
+CHANGE_ACTIONS = (AuditAction.UPDATE_ENV.value, AuditAction.AUTO_ROLLOUT.value)
+
+
+@dataclass
+class FlagActivity:
+    exists: bool = False
+    created_at: str | None = None
+    environments: dict[str, bool] = field(default_factory=dict)
+    last_changed_at: str | None = None
+    last_evaluated_on: str | None = None
+
+
+def _later(current: str | None, candidate: str) -> str:
+    return candidate if current is None or candidate > current else current
+
+
+def collect(items, now: datetime) -> dict[str, FlagActivity]:
+    activity = {}
+
+    for item in items:
+        pk, sk = item["PK"], item["SK"]
+        kind, _, rest = pk.partition("#")
+
+        if kind == "FEATURE":
+            flag = activity.setdefault(rest, FlagActivity())
+            if sk == "META":
+                flag.exists = True
+                flag.created_at = item.get("created_at")
+            elif sk.startswith("ENV#"):
+                rollout_end = parse_timestamp(item.get("rollout_end_at"))
+                flag.environments[sk[len("ENV#"):]] = bool(item.get("enabled")) or (
+                    rollout_end is not None and rollout_end <= now
+                )
+            elif sk.startswith("AUDIT#"):
+                _record_change(flag, sk)
+
+        elif kind == "AUDIT" and sk.startswith("AUDIT#"):
+            feature_name = rest.rsplit("#", 1)[0]
+            _record_change(activity.setdefault(feature_name, FlagActivity()), sk)
+
+        elif kind == "USAGE" and sk.startswith("DAY#"):
+            flag = activity.setdefault(rest, FlagActivity())
+            flag.last_evaluated_on = _later(flag.last_evaluated_on, sk.split("#")[1])
+
+    return activity
+
+
+def _record_change(flag: FlagActivity, sk: str):
+    timestamp, _, action = sk[len("AUDIT#"):].rpartition("#")
+    if action in CHANGE_ACTIONS:
+        flag.last_changed_at = _later(flag.last_changed_at, timestamp)
+
+
+def _days_since(timestamp: str | None, now: datetime) -> int | None:
+    parsed = parse_timestamp(timestamp)
+    if parsed is None:
+        return None
+    return max((now - parsed).days, 0)
+
+
+def classify(
+    feature_name: str,
+    flag: FlagActivity,
+    now: datetime,
+    stale_after_days: int = STALE_FLAG_AFTER_DAYS,
+) -> dict | None:
+    if not flag.exists or not flag.environments:
+        return None
+
+    days_since_change = _days_since(flag.last_changed_at or flag.created_at, now)
+    days_since_evaluation = _days_since(flag.last_evaluated_on, now)
+    if days_since_change is None:
+        return None
+
+    reasons = []
+    states = set(flag.environments.values())
+    if days_since_change >= stale_after_days:
+        if states == {True}:
+            reasons.append("fully_rolled_out")
+        elif states == {False}:
+            reasons.append("fully_off")
+
+    # Impressions still buffered in a reclaimed container are lost, so a flag
+    # without any usage rows is reported as unknown, not as never evaluated.
+    idle = days_since_evaluation or 0
+    if days_since_evaluation is not None and idle >= stale_after_days:
+        reasons.append("not_evaluated")
+
+    if not reasons:
+        return None
+
+    return {
+        "feature": feature_name,
+        "reasons": reasons,
+        "environments": flag.environments,
+        "last_changed_at": flag.last_changed_at,
+        "last_evaluated_on": flag.last_evaluated_on,
+        "days_since_change": days_since_change,
+        "days_since_evaluation": days_since_evaluation,
+        "usage": "unknown" if days_since_evaluation is None else "recorded",
+        "score": days_since_change + idle,
+    }
+
+
+def detect_stale_flags(
+    feature_repo: FeatureRepository,
+    now: datetime | None = None,
+    stale_after_days: int = STALE_FLAG_AFTER_DAYS,
+    max_entries: int = STALE_FLAG_REPORT_MAX_ENTRIES,
+) -> dict:
+    now = now or datetime.now(timezone.utc)
+    activity = collect(feature_repo.scan_flag_activity(), now)
+
+    candidates = (
+        classify(feature_name, flag, now, stale_after_days)
+        for feature_name, flag in activity.items()
+    )
+    candidates = [entry for entry in candidates if entry is not None]
+    entries = heapq.nlargest(
+        max_entries, candidates, key=lambda entry: (entry["score"], entry["feature"])
+    )
+
+    return {
+        "generated_at": now.isoformat(),
+        "stale_after_days": stale_after_days,
+        "flags_scanned": sum(1 for flag in activity.values() if flag.exists),
+        "candidates": len(candidates),
+        "entries": entries,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rank flags that are fully rolled out, untouched or no longer evaluated."
+    )
+    parser.add_argument("--stale-after-days", type=int, default=STALE_FLAG_AFTER_DAYS)
+    parser.add_argument("--output", help="Also write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    from infra.dynamodb import table
+
+    report = detect_stale_flags(
+        FeatureRepository(table), stale_after_days=args.stale_after_days
+    )
+    UsageRepository(table).put_report(UsageRepository.STALE_FLAGS_REPORT, report)
+    if args.output:
+        Path(args.output).write_text(dumps(report))
+
+    logger.info(
+        f"Stale flag report written | scanned={report['flags_scanned']} | "
+        f"candidates={report['candidates']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import logging
+from datetime import datetime, timezone
+
+from audit_archive.retention import archive_cutoff
+from audit_archive.store import archive_records, to_record
+from repository.feature_repository import FeatureRepository
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+MIGRATION_BATCH_SIZE = 500
+
+
+def _migrate_batch(
+    repo: FeatureRepository,
+    root: str,
+    cutoff: str,
+    items: list[dict],
+    months: set,
+) -> int:
+    # Moved rows get expires_at from their original timestamp, so anything
+    # old enough to be archived is archived before TTL can see it.
+    archived = archive_records(
+        root, [to_record(item) for item in items if item["created_at"] < cutoff]
+    )
+
+    for item in items:
+        month = (item["PK"].replace("FEATURE#", "", 1), item["created_at"][:7])
+        if month not in months:
+            repo.put_audit_month(*month)
+            months.add(month)
+
+        repo.move_legacy_audit(item)
+
+    return archived
+
+
+def migrate(repo: FeatureRepository, root: str, now: datetime | None = None) -> int:
+    cutoff = archive_cutoff(now or datetime.now(timezone.utc)).isoformat()
+    count = 0
+    archived = 0
+    months = set()
+    batch = []
+
+    for item in repo.scan_legacy_audit_items():
+        batch.append(item)
+        if len(batch) >= MIGRATION_BATCH_SIZE:
+            archived += _migrate_batch(repo, root, cutoff, batch, months)
+            count += len(batch)
+            batch = []
+
+    if batch:
+        archived += _migrate_batch(repo, root, cutoff, batch, months)
+        count += len(batch)
+
+    logger.info(
+        f"Audit rows migrated | items={count} | partitions={len(months)} | "
+        f"archived={archived}"
+    )
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=(
+            "Move AUDIT# rows out of FEATURE# partitions into monthly AUDIT# "
+            "partitions, archiving rows older than AUDIT_ARCHIVE_AFTER_DAYS first."
+        )
+    )
+    parser.add_argument("--archive-dir", required=True)
+    args = parser.parse_args(argv)
+
+    from infra.dynamodb import table
+
+    migrate(FeatureRepository(table), args.archive_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import sys
+from datetime import datetime
+
+from audit_archive.retention import parse_timestamp
+from audit_archive.store import iter_archived, record_key, to_record
+from repository.feature_repository import FeatureRepository
+from utils.serialization import dumps
+
+
+def query_audit(
+    repo: FeatureRepository,
+    root: str,
+    feature: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> list[dict]:
+    feature = feature.lower()
+
+    records = {}
+    for record in iter_archived(root, feature, since, until):
+        records[record_key(record)] = record
+    for item in repo.get_audit_logs(feature):
+        record = to_record(item)
+        records[record_key(record)] = record
+
+    results = []
+    for record in records.values():
+        created = parse_timestamp(record["timestamp"])
+        if since is not None and (created is None or created < since):
+            continue
+        if until is not None and (created is None or created > until):
+            continue
+        results.append(record)
+
+    return sorted(results, key=lambda record: record["timestamp"])
+
+
+def _timestamp_arg(value: str) -> datetime:
+    parsed = parse_timestamp(value)
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"Invalid ISO-8601 timestamp: {value}")
+    return parsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Print a feature's audit history across the table and the archive."
+    )
+    parser.add_argument("feature")
+    parser.add_argument("--archive-dir", required=True)
+    parser.add_argument("--since", type=_timestamp_arg)
+    parser.add_argument("--until", type=_timestamp_arg)
+    args = parser.parse_args(argv)
+
+    from infra.dynamodb import table
+
+    for record in query_audit(
+        FeatureRepository(table),
+        args.archive_dir,
+        args.feature,
+        args.since,
+        args.until,
+    ):
+        sys.stdout.write(dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
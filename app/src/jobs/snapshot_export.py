@@ -0,0 +1,49 @@
+import argparse
+import logging
+import os
+
+from repository.feature_repository import FeatureRepository
+from snapshot import binary_format, json_format
+from snapshot.model import Snapshot, build_snapshot
+from snapshot.storage import write_atomic
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+JSON_FILE_NAME = "flags.snapshot.json"
+BINARY_FILE_NAME = "flags.snapshot.bin"
+
+
+def export_snapshot(repo: FeatureRepository, output_dir: str) -> Snapshot:
+    snapshot = build_snapshot(repo.scan_flag_states())
+
+    write_atomic(
+        os.path.join(output_dir, BINARY_FILE_NAME),
+        binary_format.encode(snapshot),
+    )
+    write_atomic(
+        os.path.join(output_dir, JSON_FILE_NAME),
+        json_format.encode(snapshot),
+    )
+
+    logger.info(
+        f"Flag snapshot exported | dir={output_dir} | "
+        f"version={snapshot.version} | features={len(snapshot.features)}"
+    )
+    return snapshot
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Export a versioned, checksummed snapshot of all flags."
+    )
+    parser.add_argument("--output-dir", required=True)
+    args = parser.parse_args(argv)
+
+    from infra.dynamodb import table
+
+    export_snapshot(FeatureRepository(table), args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
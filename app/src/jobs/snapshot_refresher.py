@@ -0,0 +1,68 @@
+import argparse
+import logging
+import threading
+
+from repository.feature_repository import FeatureRepository
+from snapshot.binary_format import encode
+from snapshot.model import Snapshot, build_snapshot
+from snapshot.storage import write_atomic
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def refresh_once(
+    repo: FeatureRepository,
+    path: str,
+    previous: Snapshot | None = None,
+) -> Snapshot:
+    snapshot = build_snapshot(repo.scan_flag_states())
+
+    if previous is not None and previous.flags == snapshot.flags:
+        return previous
+
+    write_atomic(path, encode(snapshot))
+    logger.info(
+        f"Flag snapshot written | path={path} | version={snapshot.version} | "
+        f"features={len(snapshot.features)}"
+    )
+    return snapshot
+
+
+def run(
+    repo: FeatureRepository,
+    path: str,
+    interval: float,
+    stop_event: threading.Event | None = None,
+):
+    stop_event = stop_event or threading.Event()
+    previous = None
+
+    while not stop_event.is_set():
+        try:
+            previous = refresh_once(repo, path, previous)
+        except Exception as e:
+            logger.exception("Flag snapshot refresh failed", exc_info=e)
+        stop_event.wait(interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Keep a shared, mmap-able flag snapshot file up to date."
+    )
+    parser.add_argument("--path", required=True)
+    parser.add_argument("--interval", type=float, default=5.0)
+    parser.add_argument("--once", action="store_true")
+    args = parser.parse_args(argv)
+
+    from infra.dynamodb import table
+
+    repo = FeatureRepository(table)
+    if args.once:
+        refresh_once(repo, args.path)
+    else:
+        run(repo, args.path, args.interval)
+
+
+if __name__ == "__main__":
+    main()
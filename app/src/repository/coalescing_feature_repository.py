@@ -0,0 +1,48 @@
+from repository.feature_repository import FeatureRepository
+from utils.single_flight import SingleFlight
+
+
+class CoalescingFeatureRepository(FeatureRepository):
+    def __init__(self, table, flight: SingleFlight):
+        super().__init__(table)
+        self.flight = flight
+
+    def get_feature_items(self, feature_name: str):
+        return self.flight.do(
+            ("get_feature_items", feature_name.lower()),
+            super().get_feature_items,
+            feature_name,
+        )
+
+    def feature_exists(self, feature_name: str):
+        return self.flight.do(
+            ("feature_exists", feature_name.lower()),
+            super().feature_exists,
+            feature_name,
+        )
+
+    def get_env(self, feature_name: str, env: str):
+        return self.flight.do(
+            ("get_env", feature_name.lower(), env.lower()),
+            super().get_env,
+            feature_name,
+            env,
+        )
+
+    def get_effective_state(self, feature_name: str, env: str):
+        return self.flight.do(
+            ("get_effective_state", feature_name.lower(), env.lower()),
+            super().get_effective_state,
+            feature_name,
+            env,
+        )
+
+    def get_audit_logs(self, feature_name: str):
+        return self.flight.do(
+            ("get_audit_logs", feature_name.lower()),
+            super().get_audit_logs,
+            feature_name,
+        )
+
+    def list_features(self):
+        return self.flight.do(("list_features",), super().list_features)
@@ -1,16 +1,71 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from botocore.exceptions import ClientError
 from datetime import datetime, timezone
 
+from audit_archive.retention import TTL_ATTRIBUTE, expires_at
 from error_handling.exceptions import (
     ConflictException,
     EnvironmentNotFoundException,
+    ServiceUnavailableException,
 )
+from snapshot.model import to_epoch_ms
+from utils.dynamodb_capacity import dynamodb_call, paginate
 
 
 class FeatureRepository:
+    BATCH_GET_MAX_KEYS = 100
+    BATCH_GET_MAX_ATTEMPTS = 5
+    BATCH_BACKOFF_SECONDS = 0.05
+    ENV_CHANGES_PER_TRANSACTION = 50
+    BATCH_WRITE_MAX_ITEMS = 25
+    BATCH_WRITE_MAX_ATTEMPTS = 5
+    DELETE_WORKERS = 4
+    CONFIG_SK_START = "ENV#"
+    META_SK = "META"
+    FEATURE_PROJECTION = (
+        "PK, SK, description, enabled, rollout_end_at, variants, prerequisites, updated_at"
+    )
+    ENV_PROJECTION = "environment, enabled, rollout_end_at, variants, prerequisites, updated_at"
+    BATCH_ENV_PROJECTION = f"PK, SK, {ENV_PROJECTION}"
+    META_PROJECTION = "PK, SK, description"
+    LIST_PROJECTION = "PK, description, created_at"
+    AUDIT_PK_PREFIX = "AUDIT#"
+    AUDIT_MONTH_SK_PREFIX = "MONTH#"
+
     def __init__(self, table):
         self.table = table
 
+    @staticmethod
+    def _state_item(
+        feature_name: str,
+        env: str,
+        enabled: bool,
+        rollout_end_at: str | None,
+        variants: list[dict] | None = None,
+        prerequisites: list[str] | None = None,
+    ) -> dict:
+        item = {
+            "PK": f"FEATURE#{feature_name}",
+            "SK": f"STATE#{env}",
+            "enabled": enabled,
+            "enable_at": None if enabled else to_epoch_ms(rollout_end_at),
+        }
+        if variants:
+            item["variants"] = variants
+        if prerequisites:
+            item["prerequisites"] = prerequisites
+        return item
+
+    @staticmethod
+    def _is_condition_failure(e: ClientError) -> bool:
+        reasons = e.response.get("CancellationReasons") or []
+        return any(
+            reason.get("Code") == "ConditionalCheckFailed" for reason in reasons
+        )
+
     def create_feature(
         self,
         feature_name: str,
@@ -51,117 +106,543 @@ class FeatureRepository:
                     "ConditionExpression": "attribute_not_exists(SK)",
                 }
             })
+            transact_items.append({
+                "Put": {
+                    "TableName": self.table.name,
+                    "Item": self._state_item(
+                        feature_name, env.lower(), enabled, None
+                    ),
+                }
+            })
 
         try:
-            self.table.meta.client.transact_write_items(
-                TransactItems=transact_items
+            dynamodb_call(
+                "TransactWriteItems",
+                self.table.meta.client.transact_write_items,
+                TransactItems=transact_items,
             )
         except ClientError as e:
             if e.response["Error"]["Code"] == "TransactionCanceledException":
                 raise ConflictException("Feature already exists")
             raise
 
+    def _env_write_items(
+        self,
+        feature_name: str,
+        env: str,
+        enabled: bool,
+        rollout_end_at: str | None,
+        variants: list[dict] | None,
+        prerequisites: list[str] | None,
+        updated_at: str,
+    ) -> list[dict]:
+        values = {
+            ":enabled": enabled,
+            ":rollout": rollout_end_at,
+            ":updated": updated_at,
+        }
+        set_clause = "SET enabled = :enabled, rollout_end_at = :rollout, updated_at = :updated"
+        removed = []
+        for name, value in (("variants", variants), ("prerequisites", prerequisites)):
+            if value:
+                values[f":{name}"] = value
+                set_clause += f", {name} = :{name}"
+            else:
+                removed.append(name)
+
+        return [
+            {
+                "Update": {
+                    "TableName": self.table.name,
+                    "Key": {
+                        "PK": f"FEATURE#{feature_name}",
+                        "SK": f"ENV#{env}",
+                    },
+                    "UpdateExpression": (
+                        set_clause + (" REMOVE " + ", ".join(removed) if removed else "")
+                    ),
+                    "ConditionExpression": "attribute_exists(PK) AND attribute_exists(SK)",
+                    "ExpressionAttributeValues": values,
+                }
+            },
+            {
+                "Put": {
+                    "TableName": self.table.name,
+                    "Item": self._state_item(
+                        feature_name, env, enabled, rollout_end_at, variants, prerequisites
+                    ),
+                }
+            },
+        ]
+
     def put_env(
         self,
         feature_name: str,
         env: str,
         enabled: bool,
         rollout_end_at: str | None,
+        variants: list[dict] | None = None,
+        prerequisites: list[str] | None = None,
+    ):
+        self.put_envs([
+            (feature_name, env, enabled, rollout_end_at, variants, prerequisites)
+        ])
+
+    def put_envs(
+        self,
+        changes: list[tuple[str, str, bool, str | None, list[dict] | None, list[str] | None]],
     ):
+        if len(changes) > self.ENV_CHANGES_PER_TRANSACTION:
+            raise ValueError(
+                f"At most {self.ENV_CHANGES_PER_TRANSACTION} environment "
+                f"changes fit in one transaction"
+            )
+
+        now = datetime.now(timezone.utc).isoformat()
+        changes = [
+            (feature_name.lower(), env.lower(), *values)
+            for feature_name, env, *values in changes
+        ]
+
+        transact_items = []
+        for change in changes:
+            transact_items.extend(self._env_write_items(*change, now))
+
+        try:
+            dynamodb_call(
+                "TransactWriteItems",
+                self.table.meta.client.transact_write_items,
+                TransactItems=transact_items,
+            )
+        except ClientError as e:
+            reasons = e.response.get("CancellationReasons") or []
+            for index, reason in enumerate(reasons):
+                if reason.get("Code") == "ConditionalCheckFailed":
+                    feature_name, env = changes[index // 2][:2]
+                    raise EnvironmentNotFoundException(feature_name, env)
+            raise
+
+    def complete_rollout(self, feature_name: str, env: str, env_item: dict) -> bool:
         feature_name = feature_name.lower()
         env = env.lower()
+        transact_items = self._env_write_items(
+            feature_name,
+            env,
+            True,
+            None,
+            env_item.get("variants"),
+            env_item.get("prerequisites"),
+            datetime.now(timezone.utc).isoformat(),
+        )
+        update = transact_items[0]["Update"]
+        update["ConditionExpression"] = "enabled = :disabled AND rollout_end_at = :expected"
+        update["ExpressionAttributeValues"].update({
+            ":disabled": False,
+            ":expected": env_item.get("rollout_end_at"),
+        })
 
         try:
-            self.table.update_item(
-                Key={
-                    "PK": f"FEATURE#{feature_name}",
-                    "SK": f"ENV#{env}",
-                },
-                UpdateExpression="""
-                    SET enabled = :enabled,
-                        rollout_end_at = :rollout,
-                        updated_at = :updated
-                """,
-                ConditionExpression="attribute_exists(PK) AND attribute_exists(SK)",
-                ExpressionAttributeValues={
-                    ":enabled": enabled,
-                    ":rollout": rollout_end_at,
-                    ":updated": datetime.now(timezone.utc).isoformat(),
-                },
+            dynamodb_call(
+                "TransactWriteItems",
+                self.table.meta.client.transact_write_items,
+                TransactItems=transact_items,
             )
         except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                raise EnvironmentNotFoundException(feature_name, env)
+            if self._is_condition_failure(e):
+                return False
             raise
+        return True
+
+    def batch_get_envs(self, keys: list[tuple[str, str]]) -> dict:
+        found = {}
+        unique_keys = list(dict.fromkeys(
+            (feature_name.lower(), env.lower()) for feature_name, env in keys
+        ))
+
+        for start in range(0, len(unique_keys), self.BATCH_GET_MAX_KEYS):
+            request = {
+                self.table.name: {
+                    "Keys": [
+                        {"PK": f"FEATURE#{feature_name}", "SK": f"ENV#{env}"}
+                        for feature_name, env in unique_keys[start:start + self.BATCH_GET_MAX_KEYS]
+                    ],
+                    "ProjectionExpression": self.BATCH_ENV_PROJECTION,
+                }
+            }
+
+            for attempt in range(self.BATCH_GET_MAX_ATTEMPTS):
+                response = dynamodb_call(
+                    "BatchGetItem",
+                    self.table.meta.client.batch_get_item,
+                    RequestItems=request,
+                )
+                for item in response.get("Responses", {}).get(self.table.name, []):
+                    feature_name = item["PK"].replace("FEATURE#", "", 1)
+                    found[(feature_name, item["SK"].replace("ENV#", "", 1))] = item
+
+                request = response.get("UnprocessedKeys") or {}
+                if not request:
+                    break
+                time.sleep(self.BATCH_BACKOFF_SECONDS * 2 ** attempt)
+            else:
+                raise ServiceUnavailableException(
+                    "Could not read all environments, try again"
+                )
+
+        return found
 
     def get_env(self, feature_name: str, env: str):
-        response = self.table.get_item(
+        response = dynamodb_call(
+            "GetItem",
+            self.table.get_item,
             Key={
                 "PK": f"FEATURE#{feature_name.lower()}",
                 "SK": f"ENV#{env.lower()}",
-            }
+            },
+            ProjectionExpression=self.ENV_PROJECTION,
         )
         return response.get("Item")
 
+    def feature_exists(self, feature_name: str) -> bool:
+        response = dynamodb_call(
+            "GetItem",
+            self.table.get_item,
+            Key={
+                "PK": f"FEATURE#{feature_name.lower()}",
+                "SK": self.META_SK,
+            },
+            ProjectionExpression="PK",
+        )
+        return "Item" in response
+
     def delete_env(self, feature_name: str, env: str):
+        pk = f"FEATURE#{feature_name.lower()}"
+
         try:
-            self.table.delete_item(
-                Key={
-                    "PK": f"FEATURE#{feature_name.lower()}",
-                    "SK": f"ENV#{env.lower()}",
-                },
-                ConditionExpression="attribute_exists(PK) AND attribute_exists(SK)",
+            dynamodb_call(
+                "TransactWriteItems",
+                self.table.meta.client.transact_write_items,
+                TransactItems=[
+                    {
+                        "Delete": {
+                            "TableName": self.table.name,
+                            "Key": {"PK": pk, "SK": f"ENV#{env.lower()}"},
+                            "ConditionExpression": "attribute_exists(PK) AND attribute_exists(SK)",
+                        }
+                    },
+                    {
+                        "Delete": {
+                            "TableName": self.table.name,
+                            "Key": {"PK": pk, "SK": f"STATE#{env.lower()}"},
+                        }
+                    },
+                ]
             )
         except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            if self._is_condition_failure(e):
                 raise EnvironmentNotFoundException(feature_name, env)
             raise
 
+    def get_effective_state(self, feature_name: str, env: str):
+        response = dynamodb_call(
+            "GetItem",
+            self.table.get_item,
+            Key={
+                "PK": f"FEATURE#{feature_name.lower()}",
+                "SK": f"STATE#{env.lower()}",
+            },
+            ProjectionExpression="enabled, enable_at, variants, prerequisites",
+        )
+        return response.get("Item")
+
+    def put_effective_state(
+        self,
+        feature_name: str,
+        env: str,
+        enabled: bool,
+        rollout_end_at: str | None,
+        variants: list[dict] | None = None,
+        prerequisites: list[str] | None = None,
+    ) -> bool:
+        # Only fills in a missing STATE# row, and only while ENV# still
+        # exists: the ENV#+STATE# transaction is the only writer allowed to
+        # replace one, and a concurrent delete_env must not leave an orphan.
+        feature_name = feature_name.lower()
+        env = env.lower()
+
+        try:
+            dynamodb_call(
+                "TransactWriteItems",
+                self.table.meta.client.transact_write_items,
+                TransactItems=[
+                    {
+                        "ConditionCheck": {
+                            "TableName": self.table.name,
+                            "Key": {"PK": f"FEATURE#{feature_name}", "SK": f"ENV#{env}"},
+                            "ConditionExpression": "attribute_exists(SK)",
+                        }
+                    },
+                    {
+                        "Put": {
+                            "TableName": self.table.name,
+                            "Item": self._state_item(
+                                feature_name,
+                                env,
+                                enabled,
+                                rollout_end_at,
+                                variants,
+                                prerequisites,
+                            ),
+                            "ConditionExpression": "attribute_not_exists(SK)",
+                        }
+                    },
+                ],
+            )
+        except ClientError as e:
+            reasons = e.response.get("CancellationReasons") or []
+            codes = [reason.get("Code") for reason in reasons]
+            if codes[:1] == ["ConditionalCheckFailed"]:
+                raise EnvironmentNotFoundException(feature_name, env)
+            if codes[1:2] == ["ConditionalCheckFailed"]:
+                return False
+            raise
+        return True
+
+    def _query_config_items(self, feature_name: str, **kwargs):
+        query_kwargs = {
+            "KeyConditionExpression": "PK = :pk AND SK >= :config",
+            "ExpressionAttributeValues": {
+                ":pk": f"FEATURE#{feature_name.lower()}",
+                ":config": self.CONFIG_SK_START,
+            },
+            **kwargs,
+        }
+
+        yield from paginate("Query", self.table.query, **query_kwargs)
+
+    def _batch_delete(self, keys: list[dict]):
+        request = {
+            self.table.name: [{"DeleteRequest": {"Key": key}} for key in keys]
+        }
+
+        for attempt in range(self.BATCH_WRITE_MAX_ATTEMPTS):
+            response = dynamodb_call(
+                "BatchWriteItem",
+                self.table.meta.client.batch_write_item,
+                RequestItems=request,
+            )
+            request = response.get("UnprocessedItems") or {}
+            if not request:
+                return
+            time.sleep(self.BATCH_BACKOFF_SECONDS * 2 ** attempt)
+
+        raise ServiceUnavailableException(
+            "Feature deletion did not complete, retry the request"
+        )
+
     def delete_feature(self, feature_name: str):
         pk = f"FEATURE#{feature_name.lower()}"
 
-        response = self.table.query(
-            KeyConditionExpression="PK = :pk",
-            ExpressionAttributeValues={":pk": pk},
-        )
+        keys = [
+            {"PK": item["PK"], "SK": item["SK"]}
+            for item in self._query_config_items(
+                feature_name, ProjectionExpression="PK, SK"
+            )
+            if item["SK"] != self.META_SK
+        ]
+        chunks = [
+            keys[start:start + self.BATCH_WRITE_MAX_ITEMS]
+            for start in range(0, len(keys), self.BATCH_WRITE_MAX_ITEMS)
+        ]
 
-        items = response.get("Items", [])
+        if chunks:
+            with ThreadPoolExecutor(
+                max_workers=min(self.DELETE_WORKERS, len(chunks))
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run, self._batch_delete, chunk
+                    )
+                    for chunk in chunks
+                ]
+                for future in futures:
+                    future.result()
 
-        with self.table.batch_writer() as batch:
-            for item in items:
-                if item["SK"].startswith("AUDIT#"):
-                    continue
-                batch.delete_item(
-                    Key={
-                        "PK": item["PK"],
-                        "SK": item["SK"],
-                    }
-                )
+        dynamodb_call(
+            "DeleteItem",
+            self.table.delete_item,
+            Key={"PK": pk, "SK": self.META_SK},
+        )
 
     def get_feature_items(self, feature_name: str):
-        response = self.table.query(
-            KeyConditionExpression="PK = :pk",
-            ExpressionAttributeValues={
-                ":pk": f"FEATURE#{feature_name.lower()}",
+        pk = f"FEATURE#{feature_name.lower()}"
+        meta = dynamodb_call(
+            "GetItem",
+            self.table.get_item,
+            Key={"PK": pk, "SK": self.META_SK},
+            ProjectionExpression=self.META_PROJECTION,
+        ).get("Item")
+
+        query_kwargs = {
+            "KeyConditionExpression": "PK = :pk AND begins_with(SK, :env)",
+            "ExpressionAttributeValues": {
+                ":pk": pk,
+                ":env": self.CONFIG_SK_START,
+            },
+            "ProjectionExpression": self.FEATURE_PROJECTION,
+        }
+        items = list(paginate("Query", self.table.query, **query_kwargs))
+
+        if meta:
+            items.append(meta)
+        return items
+
+    @classmethod
+    def audit_partition_key(cls, feature_name: str, month: str | None = None) -> str:
+        pk = f"{cls.AUDIT_PK_PREFIX}{feature_name.lower()}"
+        return f"{pk}#{month}" if month else pk
+
+    @classmethod
+    def audit_item(cls, message: dict) -> dict:
+        feature_name = message["feature"].lower()
+        timestamp = message["timestamp"]
+
+        item = {
+            "PK": cls.audit_partition_key(feature_name, timestamp[:7]),
+            "SK": f"AUDIT#{timestamp}#{message['action']}",
+            "feature": feature_name,
+            "action": message["action"],
+            "actor": message["actor"],
+            "old_value": message.get("old"),
+            "new_value": message.get("new"),
+            "created_at": timestamp,
+        }
+
+        ttl = expires_at(timestamp)
+        if ttl is not None:
+            item[TTL_ATTRIBUTE] = ttl
+        return item
+
+    def put_audit(self, message: dict) -> tuple[str, str]:
+        item = self.audit_item(message)
+        dynamodb_call("PutItem", self.table.put_item, Item=item)
+        return item["feature"], item["created_at"][:7]
+
+    def put_audit_month(self, feature_name: str, month: str):
+        dynamodb_call(
+            "PutItem",
+            self.table.put_item,
+            Item={
+                "PK": self.audit_partition_key(feature_name),
+                "SK": f"{self.AUDIT_MONTH_SK_PREFIX}{month}",
             },
         )
-        return response.get("Items", [])
+
+    def _query_partition(self, pk: str, **kwargs):
+        query_kwargs = {
+            "KeyConditionExpression": "PK = :pk",
+            "ExpressionAttributeValues": {":pk": pk},
+            **kwargs,
+        }
+
+        yield from paginate("Query", self.table.query, **query_kwargs)
+
+    def get_audit_months(self, feature_name: str) -> list[str]:
+        return [
+            item["SK"].replace(self.AUDIT_MONTH_SK_PREFIX, "", 1)
+            for item in self._query_partition(
+                self.audit_partition_key(feature_name), ProjectionExpression="SK"
+            )
+        ]
 
     def get_audit_logs(self, feature_name: str):
-        response = self.table.query(
-            KeyConditionExpression="PK = :pk AND begins_with(SK, :audit)",
-            ExpressionAttributeValues={
-                ":pk": f"FEATURE#{feature_name.lower()}",
+        items = []
+        for month in self.get_audit_months(feature_name):
+            items.extend(
+                self._query_partition(self.audit_partition_key(feature_name, month))
+            )
+        return items
+
+    def scan_legacy_audit_items(self):
+        scan_kwargs = {
+            "FilterExpression": "begins_with(PK, :feature) AND begins_with(SK, :audit)",
+            "ExpressionAttributeValues": {
+                ":feature": "FEATURE#",
                 ":audit": "AUDIT#",
             },
+        }
+
+        yield from paginate("Scan", self.table.scan, **scan_kwargs)
+
+    def move_legacy_audit(self, legacy_item: dict) -> tuple[str, str]:
+        item = self.audit_item({
+            "feature": legacy_item["PK"].replace("FEATURE#", "", 1),
+            "action": legacy_item["action"],
+            "actor": legacy_item["actor"],
+            "old": legacy_item.get("old_value"),
+            "new": legacy_item.get("new_value"),
+            "timestamp": legacy_item["created_at"],
+        })
+
+        dynamodb_call(
+            "TransactWriteItems",
+            self.table.meta.client.transact_write_items,
+            TransactItems=[
+                {"Put": {"TableName": self.table.name, "Item": item}},
+                {
+                    "Delete": {
+                        "TableName": self.table.name,
+                        "Key": {"PK": legacy_item["PK"], "SK": legacy_item["SK"]},
+                    }
+                },
+            ],
         )
-        return response.get("Items", [])
+        return item["feature"], item["created_at"][:7]
+
     def list_features(self):
-        response = self.table.scan(
-            FilterExpression="SK = :meta",
-            ExpressionAttributeValues={
-                ":meta": "META"
-            }
-        )
-        return response.get("Items", [])
-    
+        scan_kwargs = {
+            "FilterExpression": "SK = :meta",
+            "ProjectionExpression": self.LIST_PROJECTION,
+            "ExpressionAttributeValues": {":meta": self.META_SK},
+        }
+        return list(paginate("Scan", self.table.scan, **scan_kwargs))
+
+    def scan_audit_items(self, before: str):
+        scan_kwargs = {
+            "FilterExpression": "begins_with(SK, :audit) AND SK < :before",
+            "ExpressionAttributeValues": {
+                ":audit": "AUDIT#",
+                ":before": f"AUDIT#{before}",
+            },
+        }
+
+        yield from paginate("Scan", self.table.scan, **scan_kwargs)
+
+    def scan_flag_activity(self):
+        scan_kwargs = {
+            "FilterExpression": (
+                "SK = :meta OR begins_with(SK, :env) "
+                "OR begins_with(SK, :audit) OR begins_with(SK, :day)"
+            ),
+            "ProjectionExpression": "PK, SK, enabled, rollout_end_at, created_at",
+            "ExpressionAttributeValues": {
+                ":meta": "META",
+                ":env": "ENV#",
+                ":audit": "AUDIT#",
+                ":day": "DAY#",
+            },
+        }
+
+        yield from paginate("Scan", self.table.scan, **scan_kwargs)
+
+    def scan_flag_states(self):
+        scan_kwargs = {
+            "FilterExpression": "SK = :meta OR begins_with(SK, :env)",
+            "ProjectionExpression": "PK, SK, enabled, rollout_end_at, variants, prerequisites",
+            "ExpressionAttributeValues": {
+                ":meta": "META",
+                ":env": "ENV#",
+            },
+        }
+
+        yield from paginate("Scan", self.table.scan, **scan_kwargs)
@@ -0,0 +1,67 @@
+from botocore.exceptions import ClientError
+
+from error_handling.exceptions import ConflictException, NotFoundException
+from utils.dynamodb_capacity import dynamodb_call
+
+
+class SDKKeyRepository:
+    KEY_PROJECTION = "environment, secret_hash, key_version"
+
+    def __init__(self, table):
+        self.table = table
+
+    def create_key(
+        self,
+        key_id: str,
+        environment: str,
+        name: str,
+        secret_hash: str,
+        created_by: str,
+        created_at: str,
+    ):
+        try:
+            dynamodb_call(
+                "PutItem",
+                self.table.put_item,
+                Item={
+                    "PK": f"SDKKEY#{key_id}",
+                    "SK": "META",
+                    "environment": environment,
+                    "name": name,
+                    "secret_hash": secret_hash,
+                    "key_version": 1,
+                    "created_by": created_by,
+                    "created_at": created_at,
+                },
+                ConditionExpression="attribute_not_exists(PK)",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise ConflictException("SDK key already exists")
+            raise
+
+    def get_key(self, key_id: str) -> dict | None:
+        response = dynamodb_call(
+            "GetItem",
+            self.table.get_item,
+            Key={"PK": f"SDKKEY#{key_id}", "SK": "META"},
+            ProjectionExpression=self.KEY_PROJECTION,
+        )
+        return response.get("Item")
+
+    def bump_version(self, key_id: str) -> int:
+        try:
+            response = dynamodb_call(
+                "UpdateItem",
+                self.table.update_item,
+                Key={"PK": f"SDKKEY#{key_id}", "SK": "META"},
+                UpdateExpression="ADD key_version :one",
+                ConditionExpression="attribute_exists(PK)",
+                ExpressionAttributeValues={":one": 1},
+                ReturnValues="UPDATED_NEW",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise NotFoundException(f"SDK key '{key_id}' not found")
+            raise
+        return int(response["Attributes"]["key_version"])
@@ -0,0 +1,166 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from botocore.exceptions import ClientError
+
+from audit_archive.retention import TTL_ATTRIBUTE
+from utils.dynamodb_capacity import dynamodb_call, paginate
+from utils.hyperloglog import HyperLogLog
+
+
+class UsageRepository:
+    SAMPLE_RETENTION_DAYS = 7
+    SKETCH_PREFIX = "users_"
+    SKETCH_MERGE_ATTEMPTS = 5
+    STALE_FLAGS_REPORT = "stale-flags"
+
+    def __init__(self, table):
+        self.table = table
+
+    def add_counts(
+        self,
+        feature_name: str,
+        environment: str,
+        day: str,
+        variant_counts: dict[str, int],
+    ):
+        names = {"#environment": "environment"}
+        values = {
+            ":environment": environment,
+            ":total": sum(variant_counts.values()),
+        }
+        additions = ["evaluations :total"]
+
+        for index, (variant, count) in enumerate(sorted(variant_counts.items())):
+            names[f"#v{index}"] = f"variant_{variant}"
+            values[f":v{index}"] = count
+            additions.append(f"#v{index} :v{index}")
+
+        dynamodb_call(
+            "UpdateItem",
+            self.table.update_item,
+            Key={
+                "PK": f"USAGE#{feature_name.lower()}",
+                "SK": f"DAY#{day}#ENV#{environment}",
+            },
+            UpdateExpression=(
+                "SET #environment = :environment ADD " + ", ".join(additions)
+            ),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
+
+    def put_samples(self, samples: list[dict]):
+        if not samples:
+            return
+
+        expires_at = int(
+            (datetime.now(timezone.utc) + timedelta(days=self.SAMPLE_RETENTION_DAYS)).timestamp()
+        )
+        with self.table.batch_writer() as batch:
+            for sample in samples:
+                batch.put_item(Item={
+                    "PK": f"USAGE#{sample['feature'].lower()}",
+                    "SK": f"SAMPLE#{sample['timestamp']}#{uuid.uuid4().hex[:8]}",
+                    **sample,
+                    TTL_ATTRIBUTE: expires_at,
+                })
+
+    def merge_sketches(
+        self,
+        feature_name: str,
+        environment: str,
+        day: str,
+        variant_sketches: dict[str, HyperLogLog],
+    ):
+        key = {
+            "PK": f"USAGE#{feature_name.lower()}",
+            "SK": f"USERS#{day}#ENV#{environment}",
+        }
+
+        for _ in range(self.SKETCH_MERGE_ATTEMPTS):
+            current = dynamodb_call("GetItem", self.table.get_item, Key=key).get("Item") or {}
+            version = int(current.get("sketch_version", 0))
+
+            names = {"#environment": "environment"}
+            values = {
+                ":environment": environment,
+                ":version": version,
+                ":next": version + 1,
+            }
+            assignments = ["#environment = :environment", "sketch_version = :next"]
+
+            for index, (variant, sketch) in enumerate(sorted(variant_sketches.items())):
+                attribute = f"{self.SKETCH_PREFIX}{variant}"
+                merged = HyperLogLog(sketch.precision, sketch.registers)
+                if attribute in current:
+                    merged.merge(HyperLogLog.from_bytes(current[attribute]))
+
+                names[f"#s{index}"] = attribute
+                values[f":s{index}"] = merged.to_bytes()
+                assignments.append(f"#s{index} = :s{index}")
+
+            try:
+                dynamodb_call(
+                    "UpdateItem",
+                    self.table.update_item,
+                    Key=key,
+                    UpdateExpression="SET " + ", ".join(assignments),
+                    ConditionExpression=(
+                        "attribute_not_exists(sketch_version) OR sketch_version = :version"
+                    ),
+                    ExpressionAttributeNames=names,
+                    ExpressionAttributeValues=values,
+                )
+                return
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+
+        raise RuntimeError(f"Sketch merge kept conflicting for {key['PK']} {key['SK']}")
+
+    def get_unique_user_sketches(
+        self, feature_name: str, since_day: str
+    ) -> list[tuple[str, str, dict[str, HyperLogLog]]]:
+        items = self._query_range(feature_name, "USERS", since_day)
+
+        return [
+            (
+                item["SK"].split("#")[1],
+                item["environment"],
+                {
+                    name[len(self.SKETCH_PREFIX):]: HyperLogLog.from_bytes(value)
+                    for name, value in item.items()
+                    if name.startswith(self.SKETCH_PREFIX)
+                },
+            )
+            for item in items
+        ]
+
+    def put_report(self, name: str, report: dict):
+        dynamodb_call(
+            "PutItem",
+            self.table.put_item,
+            Item={"PK": f"REPORT#{name}", "SK": "LATEST", "report": report},
+        )
+
+    def get_report(self, name: str) -> dict | None:
+        response = dynamodb_call(
+            "GetItem",
+            self.table.get_item,
+            Key={"PK": f"REPORT#{name}", "SK": "LATEST"},
+        )
+        item = response.get("Item")
+        return item["report"] if item else None
+
+    def _query_range(self, feature_name: str, prefix: str, since_day: str) -> list[dict]:
+        query_kwargs = {
+            "KeyConditionExpression": "PK = :pk AND SK BETWEEN :since AND :until",
+            "ExpressionAttributeValues": {
+                ":pk": f"USAGE#{feature_name.lower()}",
+                ":since": f"{prefix}#{since_day}",
+                ":until": f"{prefix}#~",
+            },
+        }
+
+        return list(paginate("Query", self.table.query, **query_kwargs))
@@ -3,6 +3,7 @@ from botocore.exceptions import ClientError
 from models.user_model import UserModel
 from enums.enums import Role
 from error_handling.exceptions import ConflictException
+from utils.dynamodb_capacity import dynamodb_call
 
 
 class UserRepository:
@@ -11,7 +12,9 @@ class UserRepository:
 
     def create_user(self, user: UserModel):
         try:
-            self.table.put_item(
+            dynamodb_call(
+                "PutItem",
+                self.table.put_item,
                 Item={
                     "PK": f"USER#{user.email.lower()}",
                     "SK": "PROFILE",
@@ -31,7 +34,9 @@ class UserRepository:
     def get_user_by_email(self, email: str) -> UserModel | None:
         email = email.lower()
 
-        response = self.table.get_item(
+        response = dynamodb_call(
+            "GetItem",
+            self.table.get_item,
             Key={
                 "PK": f"USER#{email}",
                 "SK": "PROFILE",
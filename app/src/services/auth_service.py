@@ -6,16 +6,18 @@ from utils.utils import hash_password, verify_password, generate_jwt
 from enums.enums import Role
 from error_handling.exceptions import ConflictException, UnauthorizedException
 from models.user_model import UserModel
+from utils.lru_set import LRUSet
 
 
 class AuthService:
-    def __init__(self, repo: UserRepository):
+    def __init__(self, repo: UserRepository, known_emails: LRUSet | None = None):
         self.repo = repo
+        self.known_emails = known_emails
 
     def signup(self, signup_request: SignuprequestDTO):
         email = signup_request.email.lower()
 
-        if self.repo.get_user_by_email(email):
+        if self.known_emails is not None and email in self.known_emails:
             raise ConflictException("User already exists")
 
         user = UserModel(
@@ -26,10 +28,19 @@ class AuthService:
             created_at=datetime.now(timezone.utc).isoformat(),
         )
 
-        self.repo.create_user(user)
+        try:
+            self.repo.create_user(user)
+        except ConflictException:
+            self._remember_email(email)
+            raise
 
+        self._remember_email(email)
         return {"message": "User created successfully"}
 
+    def _remember_email(self, email: str):
+        if self.known_emails is not None:
+            self.known_emails.add(email)
+
     def login(self, login_request: LoginRequestDTO):
         user = self.repo.get_user_by_email(
             login_request.email.lower()
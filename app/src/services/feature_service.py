@@ -1,25 +1,63 @@
-from datetime import datetime, timezone
+import logging
+from functools import partial
+
+from botocore.exceptions import BotoCoreError, ClientError
 
 from repository.feature_repository import FeatureRepository
+from snapshot.mmap_reader import MmapSnapshotReader
+from snapshot.model import (
+    FlagState,
+    Snapshot,
+    Variant,
+    flag_state_from_item,
+    now_ms,
+    to_epoch_ms,
+    variants_from_item,
+)
+from snapshot.prerequisites import find_cycle, prerequisite_chains, resolve
 from enums.actions import AuditAction
-from utils.audit import publish_audit
+from utils.audit import build_audit, publish_audit, publish_audits
+from utils.circuit_breaker import CircuitBreaker
+from utils.lru_set import LRUSet
+from utils.metrics import metrics
+from utils.swr_cache import StaleWhileRevalidateCache
 from utils.utils import map_env_for_audit, map_feature_items, map_audit_items
+from utils.variants import assign_variant, to_variant_items, user_key
 from dto.feature_dto import (
+    BulkUpdateEnvDTO,
     CreateFeatureDTO,
     UpdateFeatureEnvDTO,
     EvaluateDTO,
-    FeatureListItemDTO
 )
 from error_handling.exceptions import(
     EnvironmentNotFoundException,
     FeatureNotFoundException ,
-    FeatureAlreadyExistsException
+    FeatureAlreadyExistsException,
+    ServiceUnavailableException,
+    ValidationException,
 )
 
+logger = logging.getLogger()
+
 
 class FeatureService:
-    def __init__(self, repo: FeatureRepository):
+    def __init__(
+        self,
+        repo: FeatureRepository,
+        snapshot_reader: MmapSnapshotReader | None = None,
+        last_known_good: Snapshot | None = None,
+        last_known_good_max_age: int = 0,
+        flag_cache: StaleWhileRevalidateCache | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        completed_rollouts: LRUSet | None = None,
+    ):
         self.repo = repo
+        self.snapshot_reader = snapshot_reader
+        self.last_known_good = last_known_good
+        self.last_known_good_max_age = last_known_good_max_age
+        self.flag_cache = flag_cache
+        self.circuit_breaker = circuit_breaker
+        self.completed_rollouts = completed_rollouts
  
     def create_feature(self, request_feature: CreateFeatureDTO, actor: str):
         feature_name = request_feature.name.lower()
@@ -52,6 +90,7 @@ class FeatureService:
         previous_audit = map_env_for_audit(existing_env)
 
         self.repo.delete_env(feature_name, environment)
+        self._invalidate_flag(feature_name, environment)
 
         publish_audit(
             feature=feature_name,
@@ -80,6 +119,10 @@ class FeatureService:
 
         self.repo.delete_feature(feature_name)
 
+        for item in existing_items:
+            if item["SK"].startswith("ENV#"):
+                self._invalidate_flag(feature_name, item["SK"].replace("ENV#", ""))
+
     def get_feature(self, feature_name: str):
         feature_name = feature_name.lower()
 
@@ -94,48 +137,225 @@ class FeatureService:
         return feature
 
     def evaluate(self, request_evaluate: EvaluateDTO) -> bool:
+        now = now_ms()
+        feature_name = request_evaluate.feature.lower()
+        environment = request_evaluate.environment.value.lower()
+        state = self._evaluate_state(feature_name, environment, now)
+
+        return state.is_enabled(now) and self._prerequisites_met(
+            feature_name, environment, state, now
+        )
+
+    def evaluate_variant(self, request_evaluate: EvaluateDTO) -> tuple[bool, Variant | None]:
+        now = now_ms()
         feature_name = request_evaluate.feature.lower()
         environment = request_evaluate.environment.value.lower()
+        state = self._evaluate_state(feature_name, environment, now)
+
+        if not state.is_enabled(now):
+            return False, None
+        if not self._prerequisites_met(feature_name, environment, state, now):
+            return False, None
+        if not state.variants:
+            return True, None
+
+        return True, assign_variant(
+            feature_name,
+            state.variants,
+            user_key(request_evaluate.context),
+        )
+
+    def _prerequisites_met(
+        self, feature_name: str, environment: str, state: FlagState, now: int
+    ) -> bool:
+        if not state.prerequisites:
+            return True
+
+        memo = {}
+        if self.snapshot_reader is not None:
+            chain = self.snapshot_reader.prerequisite_chain(feature_name, environment)
+            if chain is not None:
+                return resolve(
+                    chain,
+                    lambda name: self.snapshot_reader.get(name, environment),
+                    now,
+                    memo,
+                )
+
+        states = {feature_name: state}
+        graph = {}
+        pending = [feature_name]
+        while pending:
+            name = pending.pop()
+            graph[name] = states[name].prerequisites if states[name] else ()
+            for prerequisite in graph[name]:
+                if prerequisite not in states:
+                    states[prerequisite] = self._prerequisite_state(
+                        prerequisite, environment, now
+                    )
+                    pending.append(prerequisite)
+
+        return resolve(
+            prerequisite_chains(graph)[feature_name], states.get, now, memo
+        )
+
+    def _prerequisite_state(
+        self, feature_name: str, environment: str, now: int
+    ) -> FlagState | None:
+        try:
+            return self._evaluate_state(feature_name, environment, now)
+        except (FeatureNotFoundException, EnvironmentNotFoundException):
+            return None
+
+    def _evaluate_state(self, feature_name: str, environment: str, now: int) -> FlagState:
+        if self.snapshot_reader is not None:
+            state = self.snapshot_reader.get(feature_name, environment)
+            if state is not None:
+                return self._served_from_snapshot(feature_name, environment, state, now)
+
+        if self.last_known_good is not None and self.last_known_good.is_fresh(
+            now, self.last_known_good_max_age
+        ):
+            state = self.last_known_good.get(feature_name, environment)
+            if state is not None:
+                return self._served_from_snapshot(feature_name, environment, state, now)
+
+        try:
+            state = self._read_flag_state(feature_name, environment)
+        except (ClientError, BotoCoreError, ServiceUnavailableException) as e:
+            state = None
+            if self.last_known_good is not None:
+                state = self.last_known_good.get(feature_name, environment)
+            if state is None:
+                raise
+            logger.warning(
+                f"Serving last-known-good flag | feature={feature_name} | "
+                f"env={environment} | error={e}"
+            )
+            return state
+        except (FeatureNotFoundException, EnvironmentNotFoundException):
+            if self.last_known_good is not None:
+                self.last_known_good.discard(feature_name, environment)
+            raise
+
+        if self.last_known_good is not None:
+            self.last_known_good.put(feature_name, environment, state)
+
+        return state
+
+    def _served_from_snapshot(
+        self, feature_name: str, environment: str, state: FlagState, now: int
+    ) -> FlagState:
+        if state.enabled or not state.is_enabled(now):
+            return state
+
+        # Snapshots never write, so a rollout that ended since the snapshot
+        # was built is persisted here, once per container and flag.
+        rollout = (feature_name, environment, state.rollout_end_at)
+        if self.completed_rollouts is not None:
+            if rollout in self.completed_rollouts:
+                return state
+            self.completed_rollouts.add(rollout)
+
+        try:
+            self._complete_rollout(feature_name, environment, now)
+        except (ClientError, BotoCoreError, ServiceUnavailableException) as e:
+            if self.completed_rollouts is not None:
+                self.completed_rollouts.discard(rollout)
+            logger.warning(
+                f"Auto-rollout not persisted | feature={feature_name} | "
+                f"env={environment} | error={e}"
+            )
+        return state
 
-        feature_items = self.repo.get_feature_items(feature_name)
-        if not feature_items:
+    def _complete_rollout(self, feature_name: str, environment: str, now: int) -> bool:
+        env_data = self.repo.get_env(feature_name, environment)
+        if not env_data or env_data["enabled"]:
+            return False
+
+        rollout_end_at = to_epoch_ms(env_data.get("rollout_end_at"))
+        if rollout_end_at is None or rollout_end_at > now:
+            return False
+
+        if not self.repo.complete_rollout(feature_name, environment, env_data):
+            return False
+
+        publish_audit(
+            feature=feature_name,
+            action=AuditAction.AUTO_ROLLOUT,
+            actor="SYSTEM",
+            old=map_env_for_audit(env_data),
+            new={
+                "environment": environment,
+                "enabled": True,
+            },
+        )
+        return True
+
+    def _read_flag_state(self, feature_name: str, environment: str) -> FlagState:
+        load = partial(self._load_flag_state, feature_name, environment)
+        if self.circuit_breaker is not None:
+            load = partial(self.circuit_breaker.call, load)
+
+        if self.flag_cache is None:
+            return load()
+        return self.flag_cache.get((feature_name, environment), load)
+
+    def _invalidate_flag(self, feature_name: str, environment: str):
+        if self.flag_cache is not None:
+            self.flag_cache.invalidate((feature_name, environment))
+
+    def _load_flag_state(self, feature_name: str, environment: str) -> FlagState:
+        item = self.repo.get_effective_state(feature_name, environment)
+        if item is None:
+            state = self._materialize_flag_state(feature_name, environment)
+        else:
+            state = self._state_from_effective_item(item)
+
+        now = now_ms()
+        if state.enabled or not state.is_enabled(now):
+            return state
+
+        self._complete_rollout(feature_name, environment, now)
+        return FlagState(
+            enabled=True,
+            variants=state.variants,
+            prerequisites=state.prerequisites,
+        )
+
+    @staticmethod
+    def _state_from_effective_item(item: dict) -> FlagState:
+        enable_at = item.get("enable_at")
+        return FlagState(
+            enabled=bool(item["enabled"]),
+            rollout_end_at=int(enable_at) if enable_at is not None else None,
+            variants=variants_from_item(item.get("variants")),
+            prerequisites=tuple(item.get("prerequisites") or ()),
+        )
+
+    def _materialize_flag_state(
+        self, feature_name: str, environment: str
+    ) -> FlagState:
+        if not self.repo.feature_exists(feature_name):
             raise FeatureNotFoundException(feature_name)
 
         env_data = self.repo.get_env(feature_name, environment)
         if not env_data:
             raise EnvironmentNotFoundException(feature_name,environment)
 
-        rollout_end = env_data.get("rollout_end_at")
-        if rollout_end:
-            now = datetime.now(timezone.utc)
-            rollout_time = datetime.fromisoformat(
-                rollout_end.replace("Z", "")
-            ).replace(tzinfo=timezone.utc)
-
-            if now >= rollout_time:
-                if not env_data["enabled"]:
-                    self.repo.put_env(
-                        feature_name=feature_name,
-                        env=environment,
-                        enabled=True,
-                        rollout_end_at=None,
-                    )
-
-                    previous_audit = map_env_for_audit(env_data)
-
-                    publish_audit(
-                        feature=feature_name,
-                        action=AuditAction.AUTO_ROLLOUT,
-                        actor="SYSTEM",
-                        old=previous_audit,
-                        new={
-                            "environment": environment,
-                            "enabled": True,
-                        },
-                    )
-                return True
-
-        return env_data["enabled"]
+        written = self.repo.put_effective_state(
+            feature_name,
+            environment,
+            env_data["enabled"],
+            env_data.get("rollout_end_at"),
+            env_data.get("variants"),
+            env_data.get("prerequisites"),
+        )
+        if not written:
+            item = self.repo.get_effective_state(feature_name, environment)
+            if item is not None:
+                return self._state_from_effective_item(item)
+        return flag_state_from_item(env_data)
 
     def get_audit_logs(self, feature_name: str):
         feature_items = self.repo.get_audit_logs(feature_name.lower())
@@ -154,6 +374,11 @@ class FeatureService:
         if not raw_existing_env:
             raise EnvironmentNotFoundException(feature_name,environment)
 
+        if request_feature.prerequisites:
+            self._validate_prerequisites(
+                environment, {feature_name: request_feature.prerequisites}
+            )
+
         previous_audit = map_env_for_audit(raw_existing_env)
 
         self.repo.put_env(
@@ -161,12 +386,19 @@ class FeatureService:
             env=environment,
             enabled=request_feature.enabled,
             rollout_end_at=request_feature.rollout_end_at,
+            variants=to_variant_items(request_feature.variants),
+            prerequisites=request_feature.prerequisites,
         )
+        self._invalidate_flag(feature_name, environment)
 
         current_audit = {
             "environment": environment,
-            **request_feature.model_dump(),
+            **request_feature.model_dump(exclude={"variants", "prerequisites"}),
         }
+        if request_feature.variants:
+            current_audit["variants"] = to_variant_items(request_feature.variants)
+        if request_feature.prerequisites:
+            current_audit["prerequisites"] = request_feature.prerequisites
 
         publish_audit(
             feature=feature_name,
@@ -176,6 +408,132 @@ class FeatureService:
             new=current_audit,
         )
 
+    def bulk_update_envs(self, request: BulkUpdateEnvDTO, actor: str) -> dict:
+        changes = [
+            (
+                change.feature.lower(),
+                change.environment.value,
+                change.enabled,
+                change.rollout_end_at,
+                to_variant_items(change.variants),
+                change.prerequisites,
+            )
+            for change in request.changes
+        ]
+
+        keys = [(feature_name, environment) for feature_name, environment, *_ in changes]
+        if len(set(keys)) != len(keys):
+            raise ValidationException(
+                "Each feature/environment pair may appear only once"
+            )
+
+        existing = self.repo.batch_get_envs(keys)
+        for feature_name, environment in keys:
+            if (feature_name, environment) not in existing:
+                raise EnvironmentNotFoundException(feature_name, environment)
+
+        graph_changes = {}
+        for feature_name, environment, *_, prerequisites in changes:
+            graph_changes.setdefault(environment, {})[feature_name] = tuple(prerequisites or ())
+        for environment, env_changes in graph_changes.items():
+            if any(env_changes.values()):
+                self._validate_prerequisites(environment, env_changes)
+
+        chunk_size = self.repo.ENV_CHANGES_PER_TRANSACTION
+        chunks = []
+        audit_failures = 0
+        for start in range(0, len(changes), chunk_size):
+            chunk = changes[start:start + chunk_size]
+            pairs = [
+                {"feature": feature_name, "environment": environment}
+                for feature_name, environment, *_ in chunk
+            ]
+
+            # Each chunk is its own transaction, so a failed chunk is reported
+            # and the remaining chunks are still written.
+            try:
+                self.repo.put_envs(chunk)
+            except (
+                EnvironmentNotFoundException,
+                ClientError,
+                BotoCoreError,
+                ServiceUnavailableException,
+            ) as e:
+                logger.error(
+                    f"Bulk env chunk failed | start={start} | size={len(chunk)} | error={e}"
+                )
+                chunks.append({"applied": [], "failed": pairs, "error": str(e)})
+                continue
+            chunks.append({"applied": pairs, "failed": []})
+
+            audits = []
+            for feature_name, environment, enabled, rollout_end_at, variants, prerequisites in chunk:
+                self._invalidate_flag(feature_name, environment)
+                current_audit = {
+                    "environment": environment,
+                    "enabled": enabled,
+                    "rollout_end_at": rollout_end_at,
+                }
+                if variants:
+                    current_audit["variants"] = variants
+                if prerequisites:
+                    current_audit["prerequisites"] = prerequisites
+                audits.append(build_audit(
+                    feature=feature_name,
+                    action=AuditAction.UPDATE_ENV,
+                    actor=actor,
+                    old=map_env_for_audit(existing[(feature_name, environment)]),
+                    new=current_audit,
+                ))
+            try:
+                publish_audits(audits)
+            except (RuntimeError, ClientError, BotoCoreError) as e:
+                logger.error(
+                    f"Bulk env audits not published | start={start} | error={e}"
+                )
+                metrics.increment("bulk_update_envs.audit_failures", len(audits))
+                audit_failures += len(audits)
+
+        updated = sum(len(chunk["applied"]) for chunk in chunks)
+        return {
+            "updated": updated,
+            "failed": len(changes) - updated,
+            "audit_failures": audit_failures,
+            "chunks": chunks,
+        }
+
+    def _validate_prerequisites(
+        self, environment: str, changes: dict[str, list[str] | tuple[str, ...]]
+    ):
+        graph = {name: tuple(prerequisites) for name, prerequisites in changes.items()}
+        required = {
+            prerequisite
+            for prerequisites in graph.values()
+            for prerequisite in prerequisites
+        }
+
+        pending = required - set(graph)
+        while pending:
+            found = self.repo.batch_get_envs(
+                [(name, environment) for name in sorted(pending)]
+            )
+            for name in pending:
+                item = found.get((name, environment))
+                if item is None and name in required:
+                    raise ValidationException(
+                        f"Prerequisite '{name}' is not configured in '{environment}'"
+                    )
+                graph[name] = tuple(item.get("prerequisites") or ()) if item else ()
+            pending = {
+                prerequisite for name in pending for prerequisite in graph[name]
+            } - set(graph)
+
+        cycle = find_cycle(graph)
+        if cycle:
+            raise ValidationException(
+                f"Prerequisites form a cycle in '{environment}': {' -> '.join(cycle)}"
+            )
+
     def list_features(self):
         items = self.repo.list_features()
         results = []
@@ -187,13 +545,11 @@ class FeatureService:
             if not pk or not pk.startswith("FEATURE#"):
                 continue
 
-            results.append(
-                FeatureListItemDTO(
-                    name=pk.replace("FEATURE#", ""),
-                    description=item.get("description"),
-                    created_at=item.get("created_at"),
-                )
-            )
+            results.append({
+                "name": pk.replace("FEATURE#", ""),
+                "description": item.get("description"),
+                "created_at": item.get("created_at"),
+            })
 
         return results
 
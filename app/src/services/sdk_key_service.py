@@ -0,0 +1,82 @@
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timezone
+
+from dto.auth_dto import CreateSDKKeyDTO
+from enums.enums import Role
+from error_handling.exceptions import UnauthorizedException
+from repository.sdk_key_repository import SDKKeyRepository
+from utils.swr_cache import StaleWhileRevalidateCache
+
+SDK_KEY_PREFIX = "ffsdk"
+
+
+class SDKKeyService:
+    def __init__(
+        self,
+        repo: SDKKeyRepository,
+        pepper: str,
+        cache: StaleWhileRevalidateCache | None = None,
+    ):
+        self.repo = repo
+        self.pepper = pepper.encode("utf-8")
+        self.cache = cache
+
+    def _hash(self, value: str) -> str:
+        return hmac.new(self.pepper, value.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def _secret_hash(self, key_id: str, version: int, secret: str) -> str:
+        return self._hash(f"{key_id}:{version}:{secret}")
+
+    def create_key(self, request: CreateSDKKeyDTO, actor: str) -> dict:
+        key_id = secrets.token_hex(8)
+        secret = secrets.token_urlsafe(32)
+        environment = request.environment.value
+
+        self.repo.create_key(
+            key_id=key_id,
+            environment=environment,
+            name=request.name,
+            secret_hash=self._secret_hash(key_id, 1, secret),
+            created_by=actor,
+            created_at=datetime.now(timezone.utc).isoformat(),
+        )
+
+        return {
+            "key_id": key_id,
+            "environment": environment,
+            "sdk_key": f"{SDK_KEY_PREFIX}_{key_id}_1_{secret}",
+        }
+
+    def revoke_key(self, key_id: str) -> dict:
+        version = self.repo.bump_version(key_id)
+        return {"key_id": key_id, "version": version}
+
+    def authenticate(self, raw_key: str) -> dict:
+        parts = raw_key.strip().split("_", 3)
+        if len(parts) != 4 or parts[0] != SDK_KEY_PREFIX or not parts[2].isdigit():
+            raise UnauthorizedException("Invalid SDK key")
+
+        _, key_id, version, secret = parts
+
+        def load():
+            return self._load_principal(key_id, int(version), secret)
+
+        if self.cache is None:
+            return load()
+        return self.cache.get(self._hash(raw_key.strip()), load)
+
+    def _load_principal(self, key_id: str, version: int, secret: str) -> dict:
+        item = self.repo.get_key(key_id)
+
+        expected = item["secret_hash"] if item else ""
+        valid = hmac.compare_digest(expected, self._secret_hash(key_id, version, secret))
+        if not item or not valid or int(item["key_version"]) != version:
+            raise UnauthorizedException("Invalid SDK key")
+
+        return {
+            "role": Role.SDK.value,
+            "sdk_key_id": key_id,
+            "environment": item["environment"],
+        }
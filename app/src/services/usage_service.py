@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+
+from error_handling.exceptions import NotFoundException, ValidationException
+from repository.usage_repository import UsageRepository
+
+MAX_USAGE_DAYS = 90
+
+
+class UsageService:
+    def __init__(self, repo: UsageRepository):
+        self.repo = repo
+
+    def get_unique_users(self, feature_name: str, days: int, environment: str | None = None) -> dict:
+        if not 1 <= days <= MAX_USAGE_DAYS:
+            raise ValidationException(f"days must be between 1 and {MAX_USAGE_DAYS}")
+
+        since = (datetime.now(timezone.utc) - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+
+        daily = []
+        totals = {}
+        for day, env, sketches in self.repo.get_unique_user_sketches(feature_name, since):
+            if environment and env != environment:
+                continue
+
+            daily.append({
+                "date": day,
+                "environment": env,
+                "unique_users": {variant: sketch.count() for variant, sketch in sketches.items()},
+            })
+
+            env_totals = totals.setdefault(env, {})
+            for variant, sketch in sketches.items():
+                if variant in env_totals:
+                    env_totals[variant].merge(sketch)
+                else:
+                    env_totals[variant] = sketch
+
+        return {
+            "feature": feature_name.lower(),
+            "since": since,
+            "days": daily,
+            "totals": {
+                env: {variant: sketch.count() for variant, sketch in sketches.items()}
+                for env, sketches in totals.items()
+            },
+        }
+
+    def get_stale_flag_report(self) -> dict:
+        report = self.repo.get_report(UsageRepository.STALE_FLAGS_REPORT)
+        if report is None:
+            raise NotFoundException("Stale flag report has not been generated yet")
+        return report
@@ -0,0 +1,380 @@
+import struct
+import zlib
+
+from snapshot.model import FlagState, Snapshot, Variant
+from snapshot.prerequisites import prerequisite_chains
+
+# Layout (little-endian):
+#   header | string index | string data | env table | per-env bitsets + rollouts + variants + prerequisites
+# Strings are feature names (sorted by UTF-8 bytes, so lookups can bisect)
+# followed by environment names and any prerequisite names that are not
+# features themselves. Each env entry points at an "enabled" and a
+# "configured" bitset indexed by feature position, plus a sorted array of
+# (feature index, rollout_end_at epoch ms) pairs for scheduled rollouts and a
+# sorted array of (feature index, offset, length) pointing at variant blobs.
+# A blob holds a count, then weight, name and pre-serialized JSON payload per
+# variant, so evaluate returns payload bytes without re-encoding them.
+# Prerequisites are a sorted array of (feature index, offset, count) pointing
+# at arrays of string indexes; the reader builds each environment's
+# dependency order from them once, when the file is loaded.
+# Version 1 and 2 files lack the variant / prerequisite tables and are still
+# readable.
+MAGIC = b"FFSN"
+FORMAT_VERSION = 3
+READABLE_VERSIONS = (1, 2, 3)
+
+HEADER = struct.Struct("<4sHHQQIIIII")
+STRING_ENTRY = struct.Struct("<II")
+ENV_ENTRY_V1 = struct.Struct("<IIIII")
+ENV_ENTRY_V2 = struct.Struct("<IIIIIII")
+ENV_ENTRY = struct.Struct("<IIIIIIIII")
+ROLLOUT = struct.Struct("<Iq")
+VARIANT_INDEX = struct.Struct("<III")
+VARIANT_COUNT = struct.Struct("<H")
+VARIANT_HEADER = struct.Struct("<IHI")
+PREREQUISITE_INDEX = struct.Struct("<III")
+PREREQUISITE = struct.Struct("<I")
+
+
+class SnapshotFormatError(ValueError):
+    pass
+
+
+def _set_bit(bitset: bytearray, index: int):
+    bitset[index >> 3] |= 1 << (index & 7)
+
+
+def _encode_variants(variants: tuple[Variant, ...]) -> bytes:
+    blob = bytearray(VARIANT_COUNT.pack(len(variants)))
+    for variant in variants:
+        name = variant.name.encode("utf-8")
+        payload = variant.payload.encode("utf-8")
+        blob += VARIANT_HEADER.pack(variant.weight, len(name), len(payload))
+        blob += name + payload
+    return bytes(blob)
+
+
+def encode(snapshot: Snapshot) -> bytes:
+    features = snapshot.features
+    envs = sorted(snapshot.flags)
+    positions = {name: i for i, name in enumerate(features)}
+    orphans = sorted({
+        prerequisite
+        for env_flags in snapshot.flags.values()
+        for state in env_flags.values()
+        for prerequisite in state.prerequisites
+        if prerequisite not in positions
+    })
+    string_positions = {
+        **positions,
+        **{name: len(features) + len(envs) + i for i, name in enumerate(orphans)},
+    }
+
+    string_index = bytearray()
+    string_data = bytearray()
+    for value in [*features, *envs, *orphans]:
+        encoded = value.encode("utf-8")
+        string_index += STRING_ENTRY.pack(len(string_data), len(encoded))
+        string_data += encoded
+
+    strings_offset = HEADER.size + len(string_index)
+    envs_offset = strings_offset + len(string_data)
+    data_offset = envs_offset + ENV_ENTRY.size * len(envs)
+    bitset_size = (len(features) + 7) // 8
+
+    env_table = bytearray()
+    data = bytearray()
+
+    for i, env in enumerate(envs):
+        enabled = bytearray(bitset_size)
+        configured = bytearray(bitset_size)
+        rollouts = bytearray()
+        variant_blobs = []
+        prerequisite_lists = []
+
+        env_flags = sorted(
+            snapshot.flags[env].items(),
+            key=lambda entry: positions[entry[0]],
+        )
+        for feature_name, state in env_flags:
+            position = positions[feature_name]
+            _set_bit(configured, position)
+            if state.enabled:
+                _set_bit(enabled, position)
+            if state.rollout_end_at is not None:
+                rollouts += ROLLOUT.pack(position, state.rollout_end_at)
+            if state.variants:
+                variant_blobs.append((position, _encode_variants(state.variants)))
+            if state.prerequisites:
+                prerequisite_lists.append((position, state.prerequisites))
+
+        enabled_offset = data_offset + len(data)
+        data += enabled
+        configured_offset = data_offset + len(data)
+        data += configured
+        rollouts_offset = data_offset + len(data)
+        data += rollouts
+
+        variants_offset = data_offset + len(data)
+        blob_offset = variants_offset + VARIANT_INDEX.size * len(variant_blobs)
+        for position, blob in variant_blobs:
+            data += VARIANT_INDEX.pack(position, blob_offset, len(blob))
+            blob_offset += len(blob)
+        for _, blob in variant_blobs:
+            data += blob
+
+        prerequisites_offset = data_offset + len(data)
+        list_offset = prerequisites_offset + PREREQUISITE_INDEX.size * len(prerequisite_lists)
+        for position, names in prerequisite_lists:
+            data += PREREQUISITE_INDEX.pack(position, list_offset, len(names))
+            list_offset += PREREQUISITE.size * len(names)
+        for _, names in prerequisite_lists:
+            for name in names:
+                data += PREREQUISITE.pack(string_positions[name])
+
+        env_table += ENV_ENTRY.pack(
+            len(features) + i,
+            enabled_offset,
+            configured_offset,
+            rollouts_offset,
+            len(rollouts) // ROLLOUT.size,
+            variants_offset,
+            len(variant_blobs),
+            prerequisites_offset,
+            len(prerequisite_lists),
+        )
+
+    payload = bytes(string_index + string_data + env_table + data)
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        0,
+        snapshot.version,
+        snapshot.generated_at,
+        len(features),
+        len(envs),
+        strings_offset,
+        envs_offset,
+        zlib.crc32(payload),
+    )
+    return header + payload
+
+
+class SnapshotView:
+    def __init__(self, buffer, verify: bool = True):
+        if len(buffer) < HEADER.size:
+            raise SnapshotFormatError("Snapshot is truncated")
+
+        (
+            magic,
+            format_version,
+            _,
+            self.version,
+            self.generated_at,
+            self.feature_count,
+            env_count,
+            self._strings_offset,
+            envs_offset,
+            self.checksum,
+        ) = HEADER.unpack_from(buffer, 0)
+
+        if magic != MAGIC:
+            raise SnapshotFormatError("Not a flag snapshot")
+        if format_version not in READABLE_VERSIONS:
+            raise SnapshotFormatError(
+                f"Unsupported snapshot format version {format_version}"
+            )
+
+        self._buffer = buffer
+        if verify and self.compute_checksum() != self.checksum:
+            raise SnapshotFormatError("Snapshot checksum mismatch")
+
+        env_entry = {1: ENV_ENTRY_V1, 2: ENV_ENTRY_V2}.get(format_version, ENV_ENTRY)
+        padding = (0,) * ((ENV_ENTRY.size - env_entry.size) // 4)
+        self._variants = {}
+        self._envs = {}
+        self._prerequisites = {}
+        self._chains = {}
+        for i in range(env_count):
+            name_index, *offsets = env_entry.unpack_from(
+                buffer, envs_offset + i * env_entry.size
+            )
+            env = self._string(name_index).decode("utf-8")
+            *offsets, prerequisites_offset, prerequisite_count = (*offsets, *padding)
+            self._envs[env] = tuple(offsets)
+            self._load_prerequisites(env, prerequisites_offset, prerequisite_count)
+
+    def _load_prerequisites(self, env: str, offset: int, count: int):
+        prerequisites = {}
+        graph = {}
+
+        for i in range(count):
+            position, list_offset, length = PREREQUISITE_INDEX.unpack_from(
+                self._buffer, offset + i * PREREQUISITE_INDEX.size
+            )
+            names = tuple(
+                self._string(index).decode("utf-8")
+                for (index,) in PREREQUISITE.iter_unpack(
+                    self._buffer[list_offset:list_offset + length * PREREQUISITE.size]
+                )
+            )
+            prerequisites[position] = names
+            graph[self._string(position).decode("utf-8")] = names
+
+        self._prerequisites[env] = prerequisites
+        self._chains[env] = prerequisite_chains(graph)
+
+    def compute_checksum(self) -> int:
+        with memoryview(self._buffer) as view:
+            with view[HEADER.size:] as payload:
+                return zlib.crc32(payload)
+
+    @property
+    def environments(self) -> list[str]:
+        return list(self._envs)
+
+    def _string(self, index: int) -> bytes:
+        offset, length = STRING_ENTRY.unpack_from(
+            self._buffer, HEADER.size + index * STRING_ENTRY.size
+        )
+        start = self._strings_offset + offset
+        return self._buffer[start:start + length]
+
+    def _find_feature(self, feature_name: str) -> int | None:
+        target = feature_name.encode("utf-8")
+        low, high = 0, self.feature_count
+
+        while low < high:
+            middle = (low + high) // 2
+            candidate = self._string(middle)
+            if candidate == target:
+                return middle
+            if candidate < target:
+                low = middle + 1
+            else:
+                high = middle
+
+        return None
+
+    def _find_rollout(self, offset: int, count: int, position: int) -> int | None:
+        low, high = 0, count
+
+        while low < high:
+            middle = (low + high) // 2
+            index, rollout_end_at = ROLLOUT.unpack_from(
+                self._buffer, offset + middle * ROLLOUT.size
+            )
+            if index == position:
+                return rollout_end_at
+            if index < position:
+                low = middle + 1
+            else:
+                high = middle
+
+        return None
+
+    def _find_variants(self, offset: int, count: int, position: int) -> tuple[Variant, ...]:
+        low, high = 0, count
+
+        while low < high:
+            middle = (low + high) // 2
+            index, blob_offset, blob_length = VARIANT_INDEX.unpack_from(
+                self._buffer, offset + middle * VARIANT_INDEX.size
+            )
+            if index == position:
+                variants = self._variants.get(blob_offset)
+                if variants is None:
+                    variants = self._decode_variants(blob_offset)
+                    self._variants[blob_offset] = variants
+                return variants
+            if index < position:
+                low = middle + 1
+            else:
+                high = middle
+
+        return ()
+
+    def _decode_variants(self, offset: int) -> tuple[Variant, ...]:
+        (count,) = VARIANT_COUNT.unpack_from(self._buffer, offset)
+        offset += VARIANT_COUNT.size
+        variants = []
+
+        for _ in range(count):
+            weight, name_length, payload_length = VARIANT_HEADER.unpack_from(
+                self._buffer, offset
+            )
+            offset += VARIANT_HEADER.size
+            name = self._buffer[offset:offset + name_length].decode("utf-8")
+            offset += name_length
+            payload = self._buffer[offset:offset + payload_length].decode("utf-8")
+            offset += payload_length
+            variants.append(Variant(name=name, weight=weight, payload=payload))
+
+        return tuple(variants)
+
+    def _state_at(
+        self, env_offsets: tuple, prerequisites: dict, position: int
+    ) -> FlagState | None:
+        (
+            enabled_offset,
+            configured_offset,
+            rollouts_offset,
+            rollout_count,
+            variants_offset,
+            variant_count,
+        ) = env_offsets
+        byte, bit = position >> 3, 1 << (position & 7)
+
+        if not self._buffer[configured_offset + byte] & bit:
+            return None
+
+        return FlagState(
+            enabled=bool(self._buffer[enabled_offset + byte] & bit),
+            rollout_end_at=self._find_rollout(
+                rollouts_offset, rollout_count, position
+            ),
+            variants=self._find_variants(
+                variants_offset, variant_count, position
+            ) if variant_count else (),
+            prerequisites=prerequisites.get(position, ()),
+        )
+
+    def lookup(self, feature_name: str, env: str) -> FlagState | None:
+        env_offsets = self._envs.get(env)
+        if env_offsets is None:
+            return None
+
+        position = self._find_feature(feature_name)
+        if position is None:
+            return None
+
+        return self._state_at(env_offsets, self._prerequisites[env], position)
+
+    def prerequisite_chain(self, feature_name: str, env: str) -> tuple[str, ...] | None:
+        return self._chains.get(env, {}).get(feature_name)
+
+    def to_snapshot(self) -> Snapshot:
+        features = [
+            self._string(i).decode("utf-8") for i in range(self.feature_count)
+        ]
+        flags = {}
+
+        for env, env_offsets in self._envs.items():
+            env_flags = {}
+            for position, feature_name in enumerate(features):
+                state = self._state_at(
+                    env_offsets, self._prerequisites[env], position
+                )
+                if state is not None:
+                    env_flags[feature_name] = state
+            flags[env] = env_flags
+
+        return Snapshot(
+            version=self.version,
+            generated_at=self.generated_at,
+            flags=flags,
+        )
+
+
+def decode(buffer) -> Snapshot:
+    return SnapshotView(buffer).to_snapshot()
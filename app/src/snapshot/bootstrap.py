@@ -0,0 +1,32 @@
+import logging
+import os
+
+from snapshot import binary_format, json_format
+from snapshot.model import Snapshot
+
+logger = logging.getLogger()
+
+
+def load_snapshot_file(path: str) -> Snapshot:
+    with open(path, "rb") as snapshot_file:
+        data = snapshot_file.read()
+
+    if data.startswith(binary_format.MAGIC):
+        return binary_format.decode(data)
+    return json_format.decode(data)
+
+
+def load_bootstrap(path: str | None) -> Snapshot | None:
+    if not path or not os.path.exists(path):
+        return None
+
+    try:
+        snapshot = load_snapshot_file(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring invalid bootstrap snapshot {path}: {e}")
+        return None
+
+    logger.info(
+        f"Loaded bootstrap snapshot | path={path} | version={snapshot.version}"
+    )
+    return snapshot
@@ -0,0 +1,89 @@
+import hashlib
+import json
+
+from snapshot.model import FlagState, Snapshot, Variant
+
+FORMAT_NAME = "feature-flag-snapshot"
+FORMAT_VERSION = 1
+
+
+class SnapshotChecksumError(ValueError):
+    pass
+
+
+def _state_to_dict(state: FlagState) -> dict:
+    data = {
+        "enabled": state.enabled,
+        "rollout_end_at": state.rollout_end_at,
+    }
+    if state.variants:
+        data["variants"] = [
+            [variant.name, variant.weight, variant.payload]
+            for variant in state.variants
+        ]
+    if state.prerequisites:
+        data["prerequisites"] = list(state.prerequisites)
+    return data
+
+
+def _flags_to_dict(snapshot: Snapshot) -> dict:
+    return {
+        env: {
+            feature_name: _state_to_dict(state)
+            for feature_name, state in sorted(env_flags.items())
+        }
+        for env, env_flags in sorted(snapshot.flags.items())
+    }
+
+
+def _checksum(flags: dict) -> str:
+    canonical = json.dumps(flags, sort_keys=True, separators=(",", ":"))
+    return "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def encode(snapshot: Snapshot) -> bytes:
+    flags = _flags_to_dict(snapshot)
+    document = {
+        "format": FORMAT_NAME,
+        "format_version": FORMAT_VERSION,
+        "version": snapshot.version,
+        "generated_at": snapshot.generated_at,
+        "checksum": _checksum(flags),
+        "flags": flags,
+    }
+    return json.dumps(document, indent=2, sort_keys=True).encode("utf-8")
+
+
+def decode(data: bytes) -> Snapshot:
+    document = json.loads(data)
+
+    if document.get("format") != FORMAT_NAME:
+        raise ValueError("Not a flag snapshot document")
+    if document.get("format_version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot format version {document.get('format_version')}"
+        )
+
+    flags = document["flags"]
+    if _checksum(flags) != document.get("checksum"):
+        raise SnapshotChecksumError("Snapshot checksum mismatch")
+
+    return Snapshot(
+        version=document["version"],
+        generated_at=document["generated_at"],
+        flags={
+            env: {
+                feature_name: FlagState(
+                    enabled=state["enabled"],
+                    rollout_end_at=state.get("rollout_end_at"),
+                    variants=tuple(
+                        Variant(name=name, weight=weight, payload=payload)
+                        for name, weight, payload in state.get("variants", ())
+                    ),
+                    prerequisites=tuple(state.get("prerequisites", ())),
+                )
+                for feature_name, state in env_flags.items()
+            }
+            for env, env_flags in flags.items()
+        },
+    )
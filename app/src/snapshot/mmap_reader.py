@@ -0,0 +1,82 @@
+import logging
+import mmap
+import os
+import time
+
+from snapshot.binary_format import SnapshotFormatError, SnapshotView
+from snapshot.model import FlagState, now_ms
+
+logger = logging.getLogger()
+
+
+class MmapSnapshotReader:
+    def __init__(self, path: str, check_interval: float = 1.0, max_age: float = 0):
+        self.path = path
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._view = None
+        self._file_identity = None
+        self._next_check = 0.0
+        self._stale_logged = None
+
+    @property
+    def version(self) -> int | None:
+        view = self._current_view()
+        return view.version if view else None
+
+    def _current_view(self) -> SnapshotView | None:
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            self._remap_if_replaced()
+
+        view = self._view
+        if view is not None and self.max_age > 0:
+            if now_ms() - view.generated_at > self.max_age * 1000:
+                # The refresher sidecar stopped replacing the file; fall back
+                # to DynamoDB rather than serve it forever.
+                if self._stale_logged is not view:
+                    logger.warning(
+                        f"Ignoring stale flag snapshot {self.path} | "
+                        f"generated_at={view.generated_at}"
+                    )
+                    self._stale_logged = view
+                return None
+        return view
+
+    def _remap_if_replaced(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if identity == self._file_identity:
+            return
+
+        try:
+            with open(self.path, "rb") as snapshot_file:
+                mapped = mmap.mmap(
+                    snapshot_file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            view = SnapshotView(mapped)
+        except (OSError, ValueError, SnapshotFormatError) as e:
+            logger.warning(f"Ignoring unreadable flag snapshot {self.path}: {e}")
+            return
+
+        # Readers that still hold the previous view keep a valid mapping of
+        # the replaced inode, so swapping the reference needs no lock.
+        self._view = view
+        self._file_identity = identity
+
+    def get(self, feature_name: str, env: str) -> FlagState | None:
+        view = self._current_view()
+        if view is None:
+            return None
+        return view.lookup(feature_name, env)
+
+    def prerequisite_chain(self, feature_name: str, env: str) -> tuple[str, ...] | None:
+        view = self._current_view()
+        if view is None:
+            return None
+        return view.prerequisite_chain(feature_name, env)
@@ -0,0 +1,114 @@
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+
+@dataclass(frozen=True)
+class Variant:
+    name: str
+    weight: int
+    payload: str = "null"
+
+
+@dataclass(frozen=True)
+class FlagState:
+    enabled: bool
+    rollout_end_at: int | None = None
+    variants: tuple[Variant, ...] = ()
+    prerequisites: tuple[str, ...] = ()
+
+    def is_enabled(self, now: int) -> bool:
+        if self.enabled:
+            return True
+        return self.rollout_end_at is not None and now >= self.rollout_end_at
+
+
+@dataclass
+class Snapshot:
+    version: int
+    generated_at: int
+    flags: dict[str, dict[str, FlagState]] = field(default_factory=dict)
+
+    def get(self, feature_name: str, env: str) -> FlagState | None:
+        return self.flags.get(env, {}).get(feature_name)
+
+    def put(self, feature_name: str, env: str, state: FlagState):
+        self.flags.setdefault(env, {})[feature_name] = state
+
+    def discard(self, feature_name: str, env: str):
+        self.flags.get(env, {}).pop(feature_name, None)
+
+    def is_fresh(self, now: int, max_age: int) -> bool:
+        return now - self.generated_at <= max_age
+
+    @property
+    def features(self) -> list[str]:
+        names = set()
+        for env_flags in self.flags.values():
+            names.update(env_flags)
+        return sorted(names, key=lambda name: name.encode("utf-8"))
+
+
+def now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def to_epoch_ms(value: str | None) -> int | None:
+    if not value:
+        return None
+
+    moment = datetime.fromisoformat(
+        value.replace("Z", "")
+    ).replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def variants_from_item(variants: list[dict] | None) -> tuple[Variant, ...]:
+    return tuple(
+        Variant(
+            name=variant["name"],
+            weight=int(variant["weight"]),
+            payload=variant.get("payload") or "null",
+        )
+        for variant in variants or ()
+    )
+
+
+def flag_state_from_item(item: dict) -> FlagState:
+    return FlagState(
+        enabled=bool(item["enabled"]),
+        rollout_end_at=to_epoch_ms(item.get("rollout_end_at")),
+        variants=variants_from_item(item.get("variants")),
+        prerequisites=tuple(item.get("prerequisites") or ()),
+    )
+
+
+def build_snapshot(items, version: int | None = None) -> Snapshot:
+    generated_at = now_ms()
+    features = set()
+    env_items = []
+
+    for item in items:
+        pk = item.get("PK", "")
+        if not pk.startswith("FEATURE#"):
+            continue
+
+        feature_name = pk.replace("FEATURE#", "")
+        sk = item["SK"]
+
+        if sk == "META":
+            features.add(feature_name)
+        elif sk.startswith("ENV#"):
+            env_items.append((feature_name, sk.replace("ENV#", ""), item))
+
+    flags = {}
+    for feature_name, env, item in env_items:
+        if feature_name not in features:
+            continue
+        flags.setdefault(env, {})[feature_name] = flag_state_from_item(item)
+
+    return Snapshot(
+        version=version if version is not None else generated_at,
+        generated_at=generated_at,
+        flags=flags,
+    )
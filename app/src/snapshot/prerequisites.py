@@ -0,0 +1,79 @@
+from snapshot.model import FlagState
+
+
+def topological_order(graph: dict[str, tuple[str, ...]]) -> tuple[list[str], set[str]]:
+    nodes = set(graph)
+    for prerequisites in graph.values():
+        nodes.update(prerequisites)
+
+    pending = {node: len(set(graph.get(node, ()))) for node in nodes}
+    dependents = {node: [] for node in nodes}
+    for node, prerequisites in graph.items():
+        for prerequisite in set(prerequisites):
+            dependents[prerequisite].append(node)
+
+    ready = sorted(node for node, count in pending.items() if count == 0)
+    order = []
+    while ready:
+        node = ready.pop()
+        order.append(node)
+        for dependent in dependents[node]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(dependent)
+
+    return order, nodes - set(order)
+
+
+def find_cycle(graph: dict[str, tuple[str, ...]]) -> list[str] | None:
+    _, blocked = topological_order(graph)
+    if not blocked:
+        return None
+
+    node = min(blocked)
+    path = []
+    while node not in path:
+        path.append(node)
+        node = min(p for p in graph.get(node, ()) if p in blocked)
+    return path[path.index(node):] + [node]
+
+
+def prerequisite_chains(graph: dict[str, tuple[str, ...]]) -> dict[str, tuple[str, ...]]:
+    order, blocked = topological_order(graph)
+    position = {node: index for index, node in enumerate(order)}
+    chains = {}
+
+    for node, prerequisites in graph.items():
+        if not prerequisites:
+            continue
+        if node in blocked:
+            chains[node] = ()
+            continue
+
+        ancestors = {node}
+        stack = list(prerequisites)
+        while stack:
+            ancestor = stack.pop()
+            if ancestor not in ancestors:
+                ancestors.add(ancestor)
+                stack.extend(graph.get(ancestor, ()))
+        chains[node] = tuple(sorted(ancestors, key=position.__getitem__))
+
+    return chains
+
+
+def resolve(chain: tuple[str, ...], lookup, now: int, memo: dict[str, bool]) -> bool:
+    if not chain:
+        return False
+
+    for name in chain:
+        if name in memo:
+            continue
+        state: FlagState | None = lookup(name)
+        memo[name] = (
+            state is not None
+            and state.is_enabled(now)
+            and all(memo.get(prerequisite, False) for prerequisite in state.prerequisites)
+        )
+
+    return memo[chain[-1]]
@@ -1,11 +1,17 @@
-import json
+import logging
 from datetime import datetime, timezone
 
-from infra.sqs.audit_queue import send_message
+from infra.sqs.audit_queue import send_message, send_message_batch
+from utils.serialization import dumps
 
+logger = logging.getLogger()
 
-def publish_audit(feature, action, actor, old, new):
-    payload = {
+SQS_BATCH_SIZE = 10
+BATCH_SEND_ATTEMPTS = 2
+
+
+def build_audit(feature, action, actor, old, new) -> dict:
+    return {
         "feature": feature,
         "action": action,
         "actor": actor,
@@ -14,4 +20,28 @@ def publish_audit(feature, action, actor, old, new):
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
 
-    send_message(json.dumps(payload))
+
+def publish_audit(feature, action, actor, old, new):
+    payload = build_audit(feature, action, actor, old, new)
+
+    send_message(dumps(payload))
+
+
+def publish_audits(payloads: list[dict]):
+    bodies = [dumps(payload) for payload in payloads]
+
+    for start in range(0, len(bodies), SQS_BATCH_SIZE):
+        pending = bodies[start:start + SQS_BATCH_SIZE]
+
+        for _ in range(BATCH_SEND_ATTEMPTS):
+            response = send_message_batch(pending)
+            failed = response.get("Failed") or []
+            pending = [pending[int(entry["Id"])] for entry in failed]
+            if not pending:
+                break
+
+        if pending:
+            logger.error(
+                f"Failed to publish audit events | count={len(pending)}"
+            )
+            raise RuntimeError(f"Failed to publish {len(pending)} audit events")
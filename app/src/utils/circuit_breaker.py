@@ -0,0 +1,100 @@
+import threading
+import time
+
+from error_handling.exceptions import ServiceUnavailableException
+from utils.metrics import MetricsRegistry, metrics as default_metrics
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+_STATE_GAUGE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenException(ServiceUnavailableException):
+    def __init__(self, name: str):
+        super().__init__(f"{name} is temporarily unavailable")
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        failure_exceptions: tuple = (Exception,),
+        metrics: MetricsRegistry = default_metrics,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_exceptions = failure_exceptions
+        self.metrics = metrics
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.metrics.set_gauge(f"{name}.breaker_state", _STATE_GAUGE[CLOSED])
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def _transition(self, state: str):
+        self._state = state
+        self.metrics.set_gauge(f"{self.name}.breaker_state", _STATE_GAUGE[state])
+        self.metrics.increment(f"{self.name}.breaker_{state}")
+
+    def _acquire(self):
+        with self._lock:
+            if self._state == CLOSED:
+                return
+
+            if self._state == OPEN:
+                if self.clock() - self._opened_at < self.reset_timeout:
+                    self.metrics.increment(f"{self.name}.breaker_rejected")
+                    raise CircuitOpenException(self.name)
+                self._transition(HALF_OPEN)
+
+            if self._probe_in_flight:
+                self.metrics.increment(f"{self.name}.breaker_rejected")
+                raise CircuitOpenException(self.name)
+
+            self._probe_in_flight = True
+            self.metrics.increment(f"{self.name}.breaker_probe")
+
+    def _record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def _record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+                if self._state != OPEN:
+                    self._transition(OPEN)
+
+    def call(self, func, *args, **kwargs):
+        self._acquire()
+
+        try:
+            result = func(*args, **kwargs)
+        except self.failure_exceptions:
+            self._record_failure()
+            raise
+        except BaseException:
+            # The dependency answered (e.g. "not found"), so it is healthy.
+            self._record_success()
+            raise
+
+        self._record_success()
+        return result
@@ -0,0 +1,117 @@
+import contextlib
+import contextvars
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+from infra.config import get_env
+from utils.metrics import format_emf
+
+DDB_CAPACITY_METRICS = get_env("DDB_CAPACITY_METRICS", "true").lower() in ("1", "true", "yes")
+
+READ_OPERATIONS = {"GetItem", "Query", "Scan", "BatchGetItem", "TransactGetItems"}
+
+_accumulator = contextvars.ContextVar("dynamodb_capacity", default=None)
+_NOOP = contextlib.nullcontext()
+
+
+def _capacity_units(consumed) -> float:
+    if isinstance(consumed, dict):
+        return float(consumed.get("CapacityUnits") or 0)
+    if isinstance(consumed, list):
+        return sum(_capacity_units(entry) for entry in consumed)
+    return 0.0
+
+
+class CapacityAccumulator:
+    def __init__(self):
+        self.calls = 0
+        self.read_units = 0.0
+        self.write_units = 0.0
+        self.retries = 0
+        self.latency_ms = 0.0
+        self.operations = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, response, elapsed_ms: float):
+        with self._lock:
+            self._record(operation, response, elapsed_ms)
+
+    def _record(self, operation: str, response, elapsed_ms: float):
+        self.calls += 1
+        self.latency_ms += elapsed_ms
+        self.operations[operation] = self.operations.get(operation, 0) + 1
+
+        if not isinstance(response, dict):
+            return
+
+        units = _capacity_units(response.get("ConsumedCapacity"))
+        if operation in READ_OPERATIONS:
+            self.read_units += units
+        else:
+            self.write_units += units
+
+        retries = (response.get("ResponseMetadata") or {}).get("RetryAttempts")
+        if isinstance(retries, int):
+            self.retries += retries
+
+    def summary(self) -> dict:
+        return {
+            "ddb_calls": self.calls,
+            "ddb_rcu": self.read_units,
+            "ddb_wcu": self.write_units,
+            "ddb_retries": self.retries,
+            "ddb_latency_ms": self.latency_ms,
+            **{f"ddb_{operation}_calls": count for operation, count in self.operations.items()},
+        }
+
+
+def dynamodb_call(operation: str, method, **kwargs):
+    accumulator = _accumulator.get()
+    if accumulator is None:
+        return method(**kwargs)
+
+    response = None
+    start = time.perf_counter()
+    try:
+        response = method(ReturnConsumedCapacity="TOTAL", **kwargs)
+        return response
+    except ClientError as e:
+        response = e.response
+        raise
+    finally:
+        accumulator.record(operation, response, (time.perf_counter() - start) * 1000)
+
+
+def paginate(operation: str, method, **kwargs):
+    while True:
+        response = dynamodb_call(operation, method, **kwargs)
+        yield from response.get("Items", [])
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+@contextlib.contextmanager
+def _tracked(function_name: str):
+    accumulator = CapacityAccumulator()
+    token = _accumulator.set(accumulator)
+    try:
+        yield accumulator
+    finally:
+        _accumulator.reset(token)
+        if accumulator.calls:
+            print(format_emf(
+                accumulator.summary(),
+                {"Function": function_name},
+                {"ddb_latency_ms": "Milliseconds"},
+            ))
+
+
+def track_capacity(function_name: str):
+    if not DDB_CAPACITY_METRICS:
+        return _NOOP
+    return _tracked(function_name)
@@ -3,8 +3,11 @@ from functools import wraps
 from json import JSONDecodeError
 from pydantic import ValidationError
 
-from error_handling.responses import error_response
+from error_handling.responses import compress_response, error_response
 from error_handling.exceptions import AppException
+from utils.dynamodb_capacity import track_capacity
+from utils.http_headers import get_header
+from utils.tracing import span, trace_invocation
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -13,24 +16,35 @@ logger.setLevel(logging.INFO)
 def error_handler(func):
     @wraps(func)
     def wrapper(event, context):
-        try:
-            return func(event, context)
+        with trace_invocation(func.__name__), track_capacity(func.__name__):
+            return _invoke(func, event, context)
 
-        except JSONDecodeError:
-            return error_response("Invalid JSON body", 400)
+    return wrapper
 
-        except ValidationError as e:
-            return error_response(e.errors(), 400)
 
-        except AppException as e:
-            logger.info(
-                f"Handled AppException | "
-                f"status={e.status_code} | message={e.message}"
+def _invoke(func, event, context):
+    try:
+        response = func(event, context)
+        with span("serialize"):
+            return compress_response(
+                response, get_header(event, "Accept-Encoding")
             )
-            return error_response(e.message, e.status_code)
 
-        except Exception as e:
-            logger.exception("Unhandled exception in lambda handler", exc_info=e)
-            return error_response("Internal Server Error", 500)
+    except JSONDecodeError:
+        return error_response("Invalid JSON body", 400)
 
-    return wrapper
+    except ValidationError as e:
+        if any(error["type"] == "json_invalid" for error in e.errors()):
+            return error_response("Invalid JSON body", 400)
+        return error_response(e.errors(), 400)
+
+    except AppException as e:
+        logger.info(
+            f"Handled AppException | "
+            f"status={e.status_code} | message={e.message}"
+        )
+        return error_response(e.message, e.status_code)
+
+    except Exception as e:
+        logger.exception("Unhandled exception in lambda handler", exc_info=e)
+        return error_response("Internal Server Error", 500)
@@ -0,0 +1,12 @@
+def get_header(event: dict, name: str) -> str | None:
+    headers = event.get("headers") or {}
+
+    value = headers.get(name)
+    if value is not None:
+        return value
+
+    lowered = name.lower()
+    for key, value in headers.items():
+        if key.lower() == lowered:
+            return value
+    return None
@@ -0,0 +1,200 @@
+import base64
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from infra.config import get_env
+from infra.sqs import impressions_queue
+from utils.hyperloglog import HyperLogLog
+from utils.metrics import metrics
+from utils.serialization import dumps
+
+logger = logging.getLogger()
+
+IMPRESSION_SAMPLE_RATE = float(get_env("IMPRESSION_SAMPLE_RATE", "0.01"))
+IMPRESSION_FLUSH_INTERVAL_SECONDS = float(get_env("IMPRESSION_FLUSH_INTERVAL_SECONDS", "10"))
+IMPRESSION_FLUSH_MAX_KEYS = int(get_env("IMPRESSION_FLUSH_MAX_KEYS", "500"))
+IMPRESSION_MAX_SAMPLES = int(get_env("IMPRESSION_MAX_SAMPLES", "100"))
+
+SQS_BATCH_SIZE = 10
+BATCH_SEND_ATTEMPTS = 2
+ENTRIES_PER_MESSAGE = 500
+SKETCHES_PER_MESSAGE = 4
+
+_aggregator = None
+
+
+def _minute(epoch_minute: int) -> str:
+    return datetime.fromtimestamp(epoch_minute * 60, timezone.utc).strftime("%Y-%m-%dT%H:%M")
+
+
+class ImpressionAggregator:
+    def __init__(
+        self,
+        send_batch,
+        max_keys: int = IMPRESSION_FLUSH_MAX_KEYS,
+        max_samples: int = IMPRESSION_MAX_SAMPLES,
+        flush_interval: float = IMPRESSION_FLUSH_INTERVAL_SECONDS,
+        sample_rate: float = IMPRESSION_SAMPLE_RATE,
+        clock=time.time,
+        rng=random.random,
+    ):
+        self.send_batch = send_batch
+        self.max_keys = max_keys
+        self.max_samples = max_samples
+        self.flush_interval = flush_interval
+        self.sample_rate = sample_rate
+        self.clock = clock
+        self.rng = rng
+
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._samples = []
+        self._sketches = {}
+        self._oldest_minute = None
+        self._last_flush = clock()
+
+    def record(
+        self,
+        feature: str,
+        environment: str,
+        variant: str,
+        actor: str | None = None,
+        user: str | None = None,
+    ):
+        now = self.clock()
+
+        minute = int(now // 60)
+
+        with self._lock:
+            self._counts[(feature, environment, variant, minute)] += 1
+            if self._oldest_minute is None or minute < self._oldest_minute:
+                self._oldest_minute = minute
+            if user is not None:
+                day = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d")
+                sketch_key = (feature, environment, variant, day)
+                if sketch_key not in self._sketches:
+                    self._sketches[sketch_key] = HyperLogLog()
+                self._sketches[sketch_key].add(user)
+            if self.sample_rate > 0 and self.rng() < self.sample_rate:
+                self._samples.append({
+                    "feature": feature,
+                    "environment": environment,
+                    "variant": variant,
+                    "actor": actor,
+                    "timestamp": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+                })
+            full = (
+                len(self._counts) + len(self._sketches) >= self.max_keys
+                or len(self._samples) >= self.max_samples
+            )
+
+        if full:
+            self.flush()
+
+    def due(self) -> bool:
+        if not (self._counts or self._samples or self._sketches):
+            return False
+
+        # A container can be frozen or reclaimed right after this invocation,
+        # so a finished minute (and with it a finished day) is sent now rather
+        # than waiting out the interval.
+        now = self.clock()
+        return (
+            now - self._last_flush >= self.flush_interval
+            or self._oldest_minute < int(now // 60)
+        )
+
+    def maybe_flush(self) -> int:
+        if self.due():
+            return self.flush()
+        return 0
+
+    def flush(self) -> int:
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            samples, self._samples = self._samples, []
+            sketches, self._sketches = self._sketches, {}
+            self._oldest_minute = None
+            self._last_flush = self.clock()
+
+        if not counts and not samples and not sketches:
+            return 0
+
+        rows = [
+            [feature, environment, variant, _minute(minute), count]
+            for (feature, environment, variant, minute), count in counts.items()
+        ]
+        bodies = [
+            dumps({"counts": rows[start:start + ENTRIES_PER_MESSAGE]})
+            for start in range(0, len(rows), ENTRIES_PER_MESSAGE)
+        ]
+        bodies += [
+            dumps({"samples": samples[start:start + ENTRIES_PER_MESSAGE]})
+            for start in range(0, len(samples), ENTRIES_PER_MESSAGE)
+        ]
+        sketch_rows = [
+            [feature, environment, variant, day, base64.b64encode(sketch.to_bytes()).decode()]
+            for (feature, environment, variant, day), sketch in sketches.items()
+        ]
+        bodies += [
+            dumps({"sketches": sketch_rows[start:start + SKETCHES_PER_MESSAGE]})
+            for start in range(0, len(sketch_rows), SKETCHES_PER_MESSAGE)
+        ]
+
+        failed = self._send(bodies)
+        metrics.increment("impressions.flushed", sum(counts.values()))
+        if failed:
+            metrics.increment("impressions.dropped_messages", failed)
+        return len(bodies) - failed
+
+    def _send(self, bodies: list[str]) -> int:
+        failed = 0
+
+        for start in range(0, len(bodies), SQS_BATCH_SIZE):
+            pending = bodies[start:start + SQS_BATCH_SIZE]
+
+            try:
+                for _ in range(BATCH_SEND_ATTEMPTS):
+                    response = self.send_batch(pending)
+                    pending = [
+                        pending[int(entry["Id"])]
+                        for entry in response.get("Failed") or []
+                    ]
+                    if not pending:
+                        break
+            except Exception as e:
+                logger.warning(f"Impression flush failed | error={e}")
+
+            failed += len(pending)
+
+        return failed
+
+
+def get_aggregator() -> ImpressionAggregator | None:
+    global _aggregator
+    if _aggregator is None and impressions_queue.QUEUE_URL:
+        _aggregator = ImpressionAggregator(impressions_queue.send_message_batch)
+    return _aggregator
+
+
+def record_impression(
+    feature: str,
+    environment: str,
+    variant: str,
+    actor: str | None = None,
+    user: str | None = None,
+):
+    aggregator = get_aggregator()
+    if aggregator is not None:
+        aggregator.record(feature, environment, variant, actor, user)
+
+
+def flush_impressions() -> int:
+    aggregator = get_aggregator()
+    if aggregator is None:
+        return 0
+    return aggregator.maybe_flush()
@@ -0,0 +1,111 @@
+from jose import ExpiredSignatureError, JWTError, jwk, jwt
+
+from infra.config import get_env
+from utils.serialization import loads
+
+HMAC_ALGORITHMS = ("HS256",)
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+DEFAULT_KID = "default"
+
+_keyring = None
+_keyring_config = None
+
+
+class JWTKeyring:
+    def __init__(
+        self,
+        algorithm: str,
+        active_kid: str,
+        signing_key: str | None,
+        verification_keys: dict[str, str] | None = None,
+    ):
+        if algorithm not in HMAC_ALGORITHMS + ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+
+        self.algorithm = algorithm
+        self.active_kid = active_kid
+        self._signing_key = jwk.construct(signing_key, algorithm) if signing_key else None
+
+        self._verification_keys = {
+            kid: self._public(jwk.construct(key, algorithm))
+            for kid, key in (verification_keys or {}).items()
+        }
+        if self._signing_key is not None:
+            self._verification_keys.setdefault(active_kid, self._public(self._signing_key))
+
+        if not self._verification_keys:
+            raise ValueError("No JWT signing or verification keys configured")
+
+    def _public(self, key):
+        if self.algorithm in ASYMMETRIC_ALGORITHMS:
+            return key.public_key()
+        return key
+
+    @property
+    def kids(self) -> list[str]:
+        return sorted(self._verification_keys)
+
+    def sign(self, payload: dict) -> str:
+        if self._signing_key is None:
+            raise RuntimeError("No JWT signing key configured")
+
+        return jwt.encode(
+            payload,
+            self._signing_key,
+            algorithm=self.algorithm,
+            headers={"kid": self.active_kid},
+        )
+
+    def verify(self, token: str) -> dict:
+        try:
+            kid = jwt.get_unverified_header(token).get("kid", DEFAULT_KID)
+        except JWTError:
+            raise ValueError("Invalid token")
+
+        key = self._verification_keys.get(kid)
+        if key is None:
+            raise ValueError("Invalid token")
+
+        try:
+            return jwt.decode(token, key, algorithms=[self.algorithm])
+        except ExpiredSignatureError:
+            raise ValueError("Token expired")
+        except JWTError:
+            raise ValueError("Invalid token")
+
+    def public_jwks(self) -> dict:
+        if self.algorithm not in ASYMMETRIC_ALGORITHMS:
+            return {"keys": []}
+
+        return {
+            "keys": [
+                {**self._verification_keys[kid].to_dict(), "kid": kid, "use": "sig"}
+                for kid in self.kids
+            ]
+        }
+
+
+def _load_config() -> tuple:
+    return (
+        get_env("JWT_ALGORITHM", "HS256"),
+        get_env("JWT_ACTIVE_KID", DEFAULT_KID),
+        get_env("JWT_SIGNING_KEY", "") or get_env("JWT_SECRET_KEY", ""),
+        get_env("JWT_VERIFICATION_KEYS", ""),
+    )
+
+
+def get_keyring() -> JWTKeyring:
+    global _keyring, _keyring_config
+
+    config = _load_config()
+    if _keyring is None or config != _keyring_config:
+        algorithm, active_kid, signing_key, verification_keys = config
+        _keyring = JWTKeyring(
+            algorithm,
+            active_kid,
+            signing_key or None,
+            loads(verification_keys) if verification_keys else None,
+        )
+        _keyring_config = config
+
+    return _keyring
@@ -0,0 +1,60 @@
+import json
+import threading
+import time
+from collections import Counter
+
+from infra.config import get_env
+
+NAMESPACE = get_env("METRICS_NAMESPACE", "FeatureFlags")
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = Counter()
+        self._gauges = {}
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float):
+        self._gauges[name] = value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {**self._counters, **self._gauges}
+
+    def flush(self) -> dict:
+        with self._lock:
+            values = {**self._counters, **self._gauges}
+            self._counters.clear()
+        return values
+
+
+metrics = MetricsRegistry()
+
+
+def format_emf(values: dict, dimensions: dict, units: dict | None = None) -> str:
+    units = units or {}
+    return json.dumps({
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": NAMESPACE,
+                "Dimensions": [list(dimensions)],
+                "Metrics": [
+                    {"Name": name, "Unit": units.get(name, "Count")}
+                    for name in values
+                ],
+            }],
+        },
+        **dimensions,
+        **values,
+    })
+
+
+def emit_metrics(function_name: str):
+    values = metrics.flush()
+    if values:
+        print(format_emf(values, {"Function": function_name}))
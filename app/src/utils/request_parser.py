@@ -0,0 +1,28 @@
+import base64
+import binascii
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+from error_handling.exceptions import ValidationException
+from utils.tracing import span
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def raw_body(event: dict) -> bytes:
+    body = event.get("body") or ""
+
+    if event.get("isBase64Encoded"):
+        try:
+            return base64.b64decode(body, validate=True)
+        except (binascii.Error, ValueError):
+            raise ValidationException("Invalid base64 body")
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    return body
+
+
+def parse_body(event: dict, model: type[ModelT]) -> ModelT:
+    with span("parse"):
+        return model.model_validate_json(raw_body(event))
@@ -0,0 +1,55 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+
+from infra.config import get_env
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+JSON_BACKEND = get_env("JSON_BACKEND", "orjson" if orjson else "stdlib")
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        if value == value.to_integral_value():
+            return int(value)
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, Exception):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _orjson_dumps_bytes(data) -> bytes:
+    return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _stdlib_dumps_bytes(data) -> bytes:
+    return json.dumps(
+        data,
+        default=_default,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+if JSON_BACKEND == "orjson" and orjson is not None:
+    dumps_bytes = _orjson_dumps_bytes
+    loads = orjson.loads
+else:
+    dumps_bytes = _stdlib_dumps_bytes
+    loads = json.loads
+
+
+def dumps(data) -> str:
+    return dumps_bytes(data).decode("utf-8")
@@ -0,0 +1,89 @@
+import logging
+import threading
+import time
+
+from utils.metrics import MetricsRegistry, metrics as default_metrics
+
+logger = logging.getLogger()
+
+
+class StaleWhileRevalidateCache:
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        max_stale: float,
+        evict_on: tuple = (),
+        metrics: MetricsRegistry = default_metrics,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.evict_on = evict_on
+        self.metrics = metrics
+        self.clock = clock
+
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, key, loader):
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            value, fetched_at = entry
+            age = self.clock() - fetched_at
+
+            if age < self.ttl:
+                self.metrics.increment(f"{self.name}.hit")
+                return value
+
+            if age < self.ttl + self.max_stale:
+                self.metrics.increment(f"{self.name}.stale_served")
+                self._revalidate(key, loader)
+                return value
+
+        self.metrics.increment(f"{self.name}.miss")
+        try:
+            value = loader()
+        except self.evict_on:
+            self.invalidate(key)
+            raise
+
+        self.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self._entries[key] = (value, self.clock())
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def _revalidate(self, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        threading.Thread(
+            target=self._refresh,
+            args=(key, loader),
+            daemon=True,
+        ).start()
+
+    def _refresh(self, key, loader):
+        try:
+            self.set(key, loader())
+            self.metrics.increment(f"{self.name}.refresh")
+        except self.evict_on:
+            self.invalidate(key)
+        except Exception as e:
+            self.metrics.increment(f"{self.name}.refresh_error")
+            logger.warning(
+                f"Background refresh failed | cache={self.name} | "
+                f"key={key} | error={e}"
+            )
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
@@ -0,0 +1,94 @@
+import contextlib
+import contextvars
+import time
+from functools import wraps
+
+from infra.config import get_env
+from utils.metrics import format_emf
+
+HOT_PATH_METRICS = get_env("HOT_PATH_METRICS", "false").lower() in ("1", "true", "yes")
+
+_spans = contextvars.ContextVar("hot_path_spans", default=None)
+_cold_start = True
+_NOOP = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ("spans", "name", "start")
+
+    def __init__(self, spans: dict, name: str):
+        self.spans = spans
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter_ns() - self.start
+        self.spans[self.name] = self.spans.get(self.name, 0) + elapsed
+        return False
+
+
+def span(name: str):
+    spans = _spans.get()
+    if spans is None:
+        return _NOOP
+    return _Span(spans, name)
+
+
+@contextlib.contextmanager
+def _invocation(function_name: str):
+    global _cold_start
+
+    start_type = "cold" if _cold_start else "warm"
+    _cold_start = False
+
+    spans = {}
+    token = _spans.set(spans)
+    start = time.perf_counter_ns()
+    try:
+        yield spans
+    finally:
+        total = time.perf_counter_ns() - start
+        _spans.reset(token)
+
+        values = {f"{name}_ms": elapsed / 1e6 for name, elapsed in spans.items()}
+        values["total_ms"] = total / 1e6
+        print(format_emf(
+            values,
+            {"Function": function_name, "StartType": start_type},
+            {name: "Milliseconds" for name in values},
+        ))
+
+
+def trace_invocation(function_name: str):
+    if not HOT_PATH_METRICS:
+        return _NOOP
+    return _invocation(function_name)
+
+
+class _Traced:
+    def __init__(self, target, phase: str):
+        self._target = target
+        self._phase = phase
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        phase = self._phase
+
+        @wraps(attr)
+        def call(*args, **kwargs):
+            with span(phase):
+                return attr(*args, **kwargs)
+
+        return call
+
+
+def traced(target, phase: str):
+    if not HOT_PATH_METRICS:
+        return target
+    return _Traced(target, phase)
@@ -1,20 +1,14 @@
 import bcrypt
 from dotenv import load_dotenv
 from typing import Dict, Any
-from jose import jwt, JWTError, ExpiredSignatureError
 
-from infra.config import get_env
+from utils.jwt_keys import get_keyring
+from utils.variants import from_variant_items
 from passlib.context import CryptContext
 
 
 load_dotenv()
 
-JWT_SECRET_KEY = get_env("JWT_SECRET_KEY")
-JWT_ALGORITHM = get_env("JWT_ALGORITHM", "HS256")
-
-if not JWT_SECRET_KEY:
-    raise RuntimeError("JWT_SECRET_KEY is not set")
-
 def hash_password(password: str) -> str:
     salt = bcrypt.gensalt()
     hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
@@ -30,36 +24,28 @@ def verify_password(password: str, hashed: str) -> bool:
 
 
 def generate_jwt(payload: Dict[str, Any]) -> str:
-    return jwt.encode(
-        payload,
-        JWT_SECRET_KEY,
-        algorithm=JWT_ALGORITHM,
-    )
+    return get_keyring().sign(payload)
 
 
 def verify_jwt(token: str) -> Dict[str, Any]:
-    try:
-        return jwt.decode(
-            token,
-            JWT_SECRET_KEY,
-            algorithms=[JWT_ALGORITHM],
-        )
-    except ExpiredSignatureError:
-        raise ValueError("Token expired")
-    except JWTError:
-        raise ValueError("Invalid token")
+    return get_keyring().verify(token)
 
 
 def map_env_for_audit(item: dict | None) -> dict | None:
     if not item:
         return None
 
-    return {
+    env = {
         "environment": item["environment"],
         "enabled": item["enabled"],
         "rollout_end_at": item.get("rollout_end_at"),
         "updated_at": item.get("updated_at"),
     }
+    if item.get("variants"):
+        env["variants"] = item["variants"]
+    if item.get("prerequisites"):
+        env["prerequisites"] = item["prerequisites"]
+    return env
 
 
 def map_feature_items(items: list[dict]) -> dict:
@@ -83,6 +69,10 @@ def map_feature_items(items: list[dict]) -> dict:
                 "rollout_end_at": item.get("rollout_end_at"),
                 "updated_at": item.get("updated_at"),
             }
+            if item.get("variants"):
+                feature["environments"][env]["variants"] = from_variant_items(item["variants"])
+            if item.get("prerequisites"):
+                feature["environments"][env]["prerequisites"] = item["prerequisites"]
             
     if feature["feature"] is None:
         return None        
@@ -0,0 +1,55 @@
+import hashlib
+
+from snapshot.model import Variant
+from utils.serialization import dumps, loads
+
+USER_KEY_ATTRIBUTES = ("user_id", "key")
+
+
+def user_key(context: dict | None) -> str | None:
+    for attribute in USER_KEY_ATTRIBUTES:
+        value = (context or {}).get(attribute)
+        if value is not None and value != "":
+            return str(value)
+    return None
+
+
+def assign_variant(feature_name: str, variants: tuple[Variant, ...], key: str | None) -> Variant:
+    total = sum(variant.weight for variant in variants)
+    if total <= 0:
+        return variants[0]
+    if key is None:
+        return next(variant for variant in variants if variant.weight > 0)
+
+    digest = hashlib.blake2b(f"{feature_name}:{key}".encode("utf-8"), digest_size=8).digest()
+    point = int.from_bytes(digest, "big") % total
+
+    for variant in variants:
+        if point < variant.weight:
+            return variant
+        point -= variant.weight
+    return variants[-1]
+
+
+def to_variant_items(variants) -> list[dict] | None:
+    if not variants:
+        return None
+
+    return [
+        {"name": variant.name, "weight": variant.weight, "payload": dumps(variant.payload)}
+        for variant in variants
+    ]
+
+
+def from_variant_items(items: list[dict] | None) -> list[dict] | None:
+    if not items:
+        return None
+
+    return [
+        {"name": item["name"], "weight": int(item["weight"]), "payload": loads(item["payload"])}
+        for item in items
+    ]
+
+
+def evaluation_body(variant: Variant) -> str:
+    return f'{{"enabled":true,"variant":{dumps(variant.name)},"payload":{variant.payload}}}'
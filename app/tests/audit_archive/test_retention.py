@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from audit_archive.retention import archive_cutoff, expires_at, parse_timestamp
+
+
+def test_expires_at_adds_retention_days():
+    assert expires_at("2026-01-01T00:00:00Z", retention_days=1) == int(
+        datetime(2026, 1, 2, tzinfo=timezone.utc).timestamp()
+    )
+
+
+def test_expires_at_disabled_or_invalid():
+    assert expires_at("2026-01-01T00:00:00Z", retention_days=0) is None
+    assert expires_at("not-a-date", retention_days=30) is None
+
+
+def test_parse_timestamp_assumes_utc_for_naive_values():
+    assert parse_timestamp("2026-01-01T00:00:00").tzinfo == timezone.utc
+
+
+def test_archive_cutoff_must_precede_expiry():
+    now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    assert archive_cutoff(now, archive_after_days=10, retention_days=90) == datetime(
+        2026, 2, 19, tzinfo=timezone.utc
+    )
+    with pytest.raises(ValueError):
+        archive_cutoff(now, archive_after_days=90, retention_days=90)
@@ -0,0 +1,66 @@
+import gzip
+from datetime import datetime, timezone
+
+from audit_archive.store import (
+    archive_records,
+    iter_archived,
+    partition_path,
+    read_partition,
+)
+
+
+def record(timestamp, action="UPDATE", feature="beta"):
+    return {
+        "feature": feature,
+        "action": action,
+        "actor": "admin@example.com",
+        "old": None,
+        "new": {"enabled": True},
+        "timestamp": timestamp,
+    }
+
+
+def test_archive_records_partitions_by_feature_and_month(tmp_path):
+    written = archive_records(str(tmp_path), [
+        record("2026-01-05T10:00:00+00:00"),
+        record("2026-02-01T10:00:00+00:00"),
+        record("2026-01-01T10:00:00+00:00", feature="gamma"),
+    ])
+
+    assert written == 3
+    january = partition_path(str(tmp_path), "beta", "2026-01")
+    assert read_partition(january) == [record("2026-01-05T10:00:00+00:00")]
+    with gzip.open(january, "rb") as archive:
+        assert archive.read().count(b"\n") == 1
+
+
+def test_archive_records_is_idempotent_and_sorted(tmp_path):
+    archive_records(str(tmp_path), [record("2026-01-05T10:00:00+00:00")])
+
+    written = archive_records(str(tmp_path), [
+        record("2026-01-05T10:00:00+00:00"),
+        record("2026-01-02T10:00:00+00:00"),
+    ])
+
+    assert written == 1
+    timestamps = [
+        r["timestamp"]
+        for r in read_partition(partition_path(str(tmp_path), "beta", "2026-01"))
+    ]
+    assert timestamps == ["2026-01-02T10:00:00+00:00", "2026-01-05T10:00:00+00:00"]
+
+
+def test_iter_archived_prunes_months_outside_range(tmp_path):
+    archive_records(str(tmp_path), [
+        record("2026-01-05T10:00:00+00:00"),
+        record("2026-03-05T10:00:00+00:00"),
+    ])
+
+    results = list(iter_archived(
+        str(tmp_path),
+        "beta",
+        since=datetime(2026, 2, 1, tzinfo=timezone.utc),
+    ))
+
+    assert [r["timestamp"] for r in results] == ["2026-03-05T10:00:00+00:00"]
+    assert list(iter_archived(str(tmp_path), "missing")) == []
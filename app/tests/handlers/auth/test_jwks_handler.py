@@ -0,0 +1,19 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from src.handlers.auth.jwks_handler.main import handler
+
+
+class TestJwksHandler(unittest.TestCase):
+
+    @patch("src.handlers.auth.jwks_handler.main.get_keyring")
+    def test_returns_public_key_set(self, mock_get_keyring):
+        mock_get_keyring.return_value.public_jwks.return_value = {
+            "keys": [{"kid": "2026-01", "kty": "RSA", "n": "abc", "e": "AQAB"}]
+        }
+
+        response = handler({}, context={})
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(json.loads(response["body"])["keys"][0]["kid"], "2026-01")
@@ -5,6 +5,7 @@ from unittest.mock import patch, MagicMock
 from src.handlers.evaluate.main import evaluate_feature_handler
 from enums.enums import Environment
 from error_handling.exceptions import AppException
+from snapshot.model import Variant
 
 
 class TestEvaluateFeatureHandler(unittest.TestCase):
@@ -26,7 +27,7 @@ class TestEvaluateFeatureHandler(unittest.TestCase):
         mock_get_user.return_value = {"user_id": "1"}
 
         mock_service = MagicMock()
-        mock_service.evaluate.return_value = True
+        mock_service.evaluate_variant.return_value = (True, None)
         mock_get_service.return_value = mock_service
 
         mock_success.return_value = {
@@ -38,9 +39,9 @@ class TestEvaluateFeatureHandler(unittest.TestCase):
 
         mock_get_user.assert_called_once_with(event)
 
-        mock_service.evaluate.assert_called_once()
+        mock_service.evaluate_variant.assert_called_once()
 
-        args, kwargs = mock_service.evaluate.call_args
+        args, kwargs = mock_service.evaluate_variant.call_args
 
         self.assertEqual(args[0].feature, "new-ui")
         self.assertEqual(args[0].environment, Environment.DEV.value)
@@ -52,6 +53,63 @@ class TestEvaluateFeatureHandler(unittest.TestCase):
 
         self.assertEqual(response["statusCode"], 200)
 
+    @patch("src.handlers.evaluate.main.flush_impressions")
+    @patch("src.handlers.evaluate.main.record_impression")
+    @patch("src.handlers.evaluate.main.get_current_user")
+    @patch("src.handlers.evaluate.main.get_feature_service")
+    def test_evaluate_records_impression(
+        self, mock_get_service, mock_get_user, mock_record, mock_flush
+    ):
+        event = {
+            "headers": {"X-SDK-Key": "ffsdk_a_1_b"},
+            "body": json.dumps({
+                "feature": "New-UI",
+                "environment": "prod",
+                "context": {"user_id": "u-1"},
+            }),
+        }
+        mock_get_user.return_value = {
+            "role": "SDK",
+            "sdk_key_id": "a",
+            "environment": "prod",
+        }
+        mock_get_service.return_value.evaluate_variant.return_value = (False, None)
+
+        evaluate_feature_handler(event, context={})
+
+        mock_record.assert_called_once_with("new-ui", "prod", "off", "a", "u-1")
+        mock_flush.assert_called_once()
+
+    @patch("src.handlers.evaluate.main.flush_impressions")
+    @patch("src.handlers.evaluate.main.record_impression")
+    @patch("src.handlers.evaluate.main.get_current_user")
+    @patch("src.handlers.evaluate.main.get_feature_service")
+    def test_evaluate_returns_pre_serialized_variant(
+        self, mock_get_service, mock_get_user, mock_record, mock_flush
+    ):
+        event = {
+            "headers": {"Authorization": "Bearer token"},
+            "body": json.dumps({
+                "feature": "checkout",
+                "environment": "dev",
+                "context": {"user_id": "u-1"},
+            }),
+        }
+        mock_get_user.return_value = {"role": "CLIENT", "email": "c@example.com"}
+        mock_get_service.return_value.evaluate_variant.return_value = (
+            True,
+            Variant(name="blue", weight=50, payload='{"color":"#00f"}'),
+        )
+
+        response = evaluate_feature_handler(event, context={})
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(
+            json.loads(response["body"]),
+            {"enabled": True, "variant": "blue", "payload": {"color": "#00f"}},
+        )
+        self.assertEqual(mock_record.call_args.args[2], "blue")
+
     @patch("src.handlers.evaluate.main.get_current_user")
     def test_evaluate_invalid_json(self, mock_get_user):
         event = {
@@ -99,7 +157,7 @@ class TestEvaluateFeatureHandler(unittest.TestCase):
         mock_get_user.return_value = {"user_id": "1"}
 
         mock_service = MagicMock()
-        mock_service.evaluate.side_effect = Exception("boom")
+        mock_service.evaluate_variant.side_effect = Exception("boom")
         mock_get_service.return_value = mock_service
 
         event = {
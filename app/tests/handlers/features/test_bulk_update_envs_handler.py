@@ -0,0 +1,77 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+from src.handlers.features.bulk_update_envs.main import (
+    bulk_update_envs_handler
+)
+from error_handling.exceptions import UnauthorizedException
+
+
+class TestBulkUpdateEnvsHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.get_user_patcher = patch(
+            "src.handlers.features.bulk_update_envs.main.get_current_user"
+        )
+        self.get_service_patcher = patch(
+            "src.handlers.features.bulk_update_envs.main.get_feature_service"
+        )
+
+        self.mock_get_user = self.get_user_patcher.start()
+        self.mock_get_service = self.get_service_patcher.start()
+
+        self.mock_get_user.return_value = {"role": "ADMIN"}
+        self.mock_service = MagicMock()
+        self.mock_get_service.return_value = self.mock_service
+
+        self.event = {
+            "headers": {"Authorization": "Bearer token"},
+            "body": json.dumps({
+                "changes": [
+                    {"feature": "checkout", "environment": "dev", "enabled": True},
+                    {"feature": "checkout", "environment": "prod", "enabled": True},
+                ]
+            }),
+        }
+
+    def tearDown(self):
+        self.get_user_patcher.stop()
+        self.get_service_patcher.stop()
+
+    def test_bulk_update_success(self):
+        self.mock_service.bulk_update_envs.return_value = {"updated": 2}
+
+        response = bulk_update_envs_handler(self.event, context={})
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(json.loads(response["body"]), {"updated": 2})
+        request = self.mock_service.bulk_update_envs.call_args.args[0]
+        self.assertEqual(len(request.changes), 2)
+        self.assertEqual(
+            self.mock_service.bulk_update_envs.call_args.kwargs, {"actor": "ADMIN"}
+        )
+
+    def test_bulk_update_partial_failure_is_multi_status(self):
+        self.mock_service.bulk_update_envs.return_value = {"updated": 1, "failed": 1}
+
+        response = bulk_update_envs_handler(self.event, context={})
+
+        self.assertEqual(response["statusCode"], 207)
+
+    def test_bulk_update_requires_changes(self):
+        self.event["body"] = json.dumps({"changes": []})
+
+        response = bulk_update_envs_handler(self.event, context={})
+
+        self.assertEqual(response["statusCode"], 400)
+        self.mock_service.bulk_update_envs.assert_not_called()
+
+    @patch("src.handlers.features.bulk_update_envs.main.require_admin")
+    def test_bulk_update_non_admin(self, mock_require_admin):
+        mock_require_admin.side_effect = UnauthorizedException("Admin access required")
+
+        response = bulk_update_envs_handler(self.event, context={})
+
+        self.assertEqual(response["statusCode"], 401)
+        self.mock_service.bulk_update_envs.assert_not_called()
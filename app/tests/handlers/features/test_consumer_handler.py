@@ -1,14 +1,15 @@
 import json
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import call, patch, MagicMock
 
 from src.handlers.features.audit.consumer.main import handler
 
 
 class TestAuditConsumer(unittest.TestCase):
 
+    @patch("src.handlers.features.audit.consumer.main._recorded_months", new_callable=set)
     @patch("src.handlers.features.audit.consumer.main.table")
-    def test_audit_consumer_success_single_record(self, mock_table):
+    def test_audit_consumer_success_single_record(self, mock_table, _months):
         event = {
             "Records": [
                 {
@@ -26,20 +27,51 @@ class TestAuditConsumer(unittest.TestCase):
 
         handler(event, context={})
 
-        mock_table.put_item.assert_called_once_with(
-            Item={
-                "PK": "FEATURE#newfeature",
-                "SK": "AUDIT#2026-01-01T10:00:00Z",
-                "action": "CREATE",
-                "actor": "ADMIN",
-                "old_value": None,
-                "new_value": {"enabled": True},
-                "created_at": "2026-01-01T10:00:00Z",
-            }
+        self.assertEqual(
+            mock_table.put_item.call_args_list,
+            [
+                call(Item={
+                    "PK": "AUDIT#newfeature#2026-01",
+                    "SK": "AUDIT#2026-01-01T10:00:00Z#CREATE",
+                    "feature": "newfeature",
+                    "action": "CREATE",
+                    "actor": "ADMIN",
+                    "old_value": None,
+                    "new_value": {"enabled": True},
+                    "created_at": "2026-01-01T10:00:00Z",
+                    "expires_at": 1775037600,
+                }),
+                call(Item={"PK": "AUDIT#newfeature", "SK": "MONTH#2026-01"}),
+            ],
         )
 
+    @patch(
+        "src.handlers.features.audit.consumer.main._recorded_months",
+        new_callable=lambda: {("featurea", "2026-01")},
+    )
     @patch("src.handlers.features.audit.consumer.main.table")
-    def test_audit_consumer_multiple_records(self, mock_table):
+    def test_audit_consumer_skips_known_month_markers(self, mock_table, _months):
+        event = {
+            "Records": [
+                {
+                    "body": json.dumps({
+                        "feature": "FeatureA",
+                        "action": "UPDATE",
+                        "actor": "ADMIN",
+                        "timestamp": f"2026-01-0{day}T10:00:00Z",
+                    })
+                }
+                for day in (1, 2)
+            ]
+        }
+
+        handler(event, context={})
+
+        self.assertEqual(mock_table.put_item.call_count, 2)
+
+    @patch("src.handlers.features.audit.consumer.main._recorded_months", new_callable=set)
+    @patch("src.handlers.features.audit.consumer.main.table")
+    def test_audit_consumer_multiple_records(self, mock_table, _months):
         event = {
             "Records": [
                 {
@@ -63,7 +95,7 @@ class TestAuditConsumer(unittest.TestCase):
 
         handler(event, context={})
 
-        self.assertEqual(mock_table.put_item.call_count, 2)
+        self.assertEqual(mock_table.put_item.call_count, 4)
     
     @patch("src.handlers.features.audit.consumer.main.table")
     def test_audit_consumer_missing_optional_fields(self, mock_table):
@@ -82,7 +114,7 @@ class TestAuditConsumer(unittest.TestCase):
 
         handler(event, context={})
 
-        item = mock_table.put_item.call_args.kwargs["Item"]
+        item = mock_table.put_item.call_args_list[0].kwargs["Item"]
         self.assertIsNone(item["old_value"])
         self.assertIsNone(item["new_value"])
     
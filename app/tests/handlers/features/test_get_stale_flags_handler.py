@@ -0,0 +1,46 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from src.handlers.features.usage.get_stale_flags.main import get_stale_flags_handler
+from error_handling.exceptions import AppException, NotFoundException
+
+
+class TestGetStaleFlagsHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.event = {"headers": {"Authorization": "Bearer token"}}
+
+    @patch("src.handlers.features.usage.get_stale_flags.main.get_usage_service")
+    @patch("src.handlers.features.usage.get_stale_flags.main.require_admin")
+    @patch("src.handlers.features.usage.get_stale_flags.main.get_current_user")
+    def test_returns_latest_report(self, mock_user, mock_admin, mock_get_service):
+        mock_user.return_value = {"role": "ADMIN"}
+        mock_get_service.return_value.get_stale_flag_report.return_value = {"entries": []}
+
+        response = get_stale_flags_handler(self.event, None)
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(json.loads(response["body"]), {"entries": []})
+
+    @patch("src.handlers.features.usage.get_stale_flags.main.get_usage_service")
+    @patch("src.handlers.features.usage.get_stale_flags.main.require_admin")
+    @patch("src.handlers.features.usage.get_stale_flags.main.get_current_user")
+    def test_missing_report(self, mock_user, mock_admin, mock_get_service):
+        mock_user.return_value = {"role": "ADMIN"}
+        mock_get_service.return_value.get_stale_flag_report.side_effect = NotFoundException(
+            "Stale flag report has not been generated yet"
+        )
+
+        response = get_stale_flags_handler(self.event, None)
+
+        self.assertEqual(response["statusCode"], 404)
+
+    @patch("src.handlers.features.usage.get_stale_flags.main.require_admin")
+    @patch("src.handlers.features.usage.get_stale_flags.main.get_current_user")
+    def test_non_admin_forbidden(self, mock_user, mock_admin):
+        mock_admin.side_effect = AppException("Forbidden", 403)
+
+        response = get_stale_flags_handler(self.event, None)
+
+        self.assertEqual(response["statusCode"], 403)
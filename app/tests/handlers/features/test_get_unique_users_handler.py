@@ -0,0 +1,62 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from src.handlers.features.usage.get_unique_users.main import get_feature_unique_users_handler
+from error_handling.exceptions import AppException
+
+
+class TestGetUniqueUsersHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.event = {
+            "headers": {"Authorization": "Bearer token"},
+            "pathParameters": {"flag": "beta"},
+            "queryStringParameters": {"days": "14", "environment": "prod"},
+        }
+
+    @patch("src.handlers.features.usage.get_unique_users.main.get_usage_service")
+    @patch("src.handlers.features.usage.get_unique_users.main.require_admin")
+    @patch("src.handlers.features.usage.get_unique_users.main.get_current_user")
+    def test_returns_unique_users(self, mock_user, mock_admin, mock_get_service):
+        mock_user.return_value = {"role": "ADMIN"}
+        service = mock_get_service.return_value
+        service.get_unique_users.return_value = {"feature": "beta", "days": [], "totals": {}}
+
+        response = get_feature_unique_users_handler(self.event, None)
+
+        self.assertEqual(response["statusCode"], 200)
+        service.get_unique_users.assert_called_once_with("beta", 14, "prod")
+        self.assertEqual(json.loads(response["body"])["feature"], "beta")
+
+    @patch("src.handlers.features.usage.get_unique_users.main.get_usage_service")
+    @patch("src.handlers.features.usage.get_unique_users.main.require_admin")
+    @patch("src.handlers.features.usage.get_unique_users.main.get_current_user")
+    def test_defaults_to_seven_days(self, mock_user, mock_admin, mock_get_service):
+        mock_user.return_value = {"role": "ADMIN"}
+        self.event["queryStringParameters"] = None
+
+        get_feature_unique_users_handler(self.event, None)
+
+        mock_get_service.return_value.get_unique_users.assert_called_once_with("beta", 7, None)
+
+    @patch("src.handlers.features.usage.get_unique_users.main.get_usage_service")
+    @patch("src.handlers.features.usage.get_unique_users.main.require_admin")
+    @patch("src.handlers.features.usage.get_unique_users.main.get_current_user")
+    def test_invalid_days(self, mock_user, mock_admin, mock_get_service):
+        mock_user.return_value = {"role": "ADMIN"}
+        self.event["queryStringParameters"] = {"days": "week"}
+
+        response = get_feature_unique_users_handler(self.event, None)
+
+        self.assertEqual(response["statusCode"], 400)
+        mock_get_service.assert_not_called()
+
+    @patch("src.handlers.features.usage.get_unique_users.main.require_admin")
+    @patch("src.handlers.features.usage.get_unique_users.main.get_current_user")
+    def test_non_admin_forbidden(self, mock_user, mock_admin):
+        mock_admin.side_effect = AppException("Forbidden", 403)
+
+        response = get_feature_unique_users_handler(self.event, None)
+
+        self.assertEqual(response["statusCode"], 403)
@@ -39,15 +39,9 @@ class TestListFeaturesHandler(unittest.TestCase):
         mock_get_user.return_value = self.admin_user
         mock_require_admin.return_value = None
 
-        feature1 = MagicMock()
-        feature1.model_dump.return_value = {"name": "f1"}
-
-        feature2 = MagicMock()
-        feature2.model_dump.return_value = {"name": "f2"}
-
         self.mock_service.list_features.return_value = [
-            feature1,
-            feature2,
+            {"name": "f1"},
+            {"name": "f2"},
         ]
 
         mock_success.return_value = {
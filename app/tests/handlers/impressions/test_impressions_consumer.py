@@ -0,0 +1,91 @@
+import base64
+import json
+import unittest
+from unittest.mock import patch
+
+from src.handlers.impressions.consumer.main import handler
+from utils.hyperloglog import HyperLogLog
+
+
+def encoded_sketch(*users):
+    sketch = HyperLogLog()
+    for user in users:
+        sketch.add(user)
+    return base64.b64encode(sketch.to_bytes()).decode()
+
+
+class TestImpressionsConsumer(unittest.TestCase):
+
+    @patch("src.handlers.impressions.consumer.main.UsageRepository")
+    def test_rolls_minutes_up_into_daily_usage(self, mock_repo_cls):
+        event = {
+            "Records": [
+                {"messageId": "m1", "body": json.dumps({"counts": [
+                    ["beta", "prod", "on", "2026-01-01T00:00", 3],
+                    ["beta", "prod", "off", "2026-01-01T00:01", 1],
+                    ["beta", "prod", "on", "2026-01-01T23:59", 2],
+                    ["beta", "prod", "on", "2026-01-02T00:00", 1],
+                ]})},
+                {"messageId": "m2", "body": json.dumps({"samples": [{"feature": "beta"}]})},
+            ]
+        }
+
+        response = handler(event, context={})
+
+        self.assertEqual(response, {"batchItemFailures": []})
+        repo = mock_repo_cls.return_value
+        calls = {
+            c.args[:3]: dict(c.args[3]) for c in repo.add_counts.call_args_list
+        }
+        self.assertEqual(calls, {
+            ("beta", "prod", "2026-01-01"): {"on": 5, "off": 1},
+            ("beta", "prod", "2026-01-02"): {"on": 1},
+        })
+        repo.put_samples.assert_called_with([{"feature": "beta"}])
+
+    @patch("src.handlers.impressions.consumer.main.UsageRepository")
+    def test_merges_sketches_per_day(self, mock_repo_cls):
+        event = {
+            "Records": [
+                {"messageId": "m1", "body": json.dumps({"sketches": [
+                    ["beta", "prod", "on", "2026-01-01", encoded_sketch("a", "b")],
+                    ["beta", "prod", "on", "2026-01-01", encoded_sketch("b", "c")],
+                    ["beta", "prod", "off", "2026-01-01", encoded_sketch("d")],
+                ]})},
+            ]
+        }
+
+        handler(event, context={})
+
+        repo = mock_repo_cls.return_value
+        repo.merge_sketches.assert_called_once()
+        feature, environment, day, sketches = repo.merge_sketches.call_args.args
+        self.assertEqual((feature, environment, day), ("beta", "prod", "2026-01-01"))
+        self.assertEqual(
+            {variant: sketch.count() for variant, sketch in sketches.items()},
+            {"on": 3, "off": 1},
+        )
+
+    @patch("src.handlers.impressions.consumer.main.UsageRepository")
+    def test_reports_only_failed_records(self, mock_repo_cls):
+        repo = mock_repo_cls.return_value
+        repo.add_counts.side_effect = [RuntimeError("throttled"), None]
+        event = {
+            "Records": [
+                {"messageId": "m1", "body": json.dumps({"counts": [
+                    ["beta", "prod", "on", "2026-01-01T00:00", 1],
+                ]})},
+                {"messageId": "m2", "body": "not json"},
+                {"messageId": "m3", "body": json.dumps({"counts": [
+                    ["beta", "prod", "on", "2026-01-01T00:01", 1],
+                ]})},
+            ]
+        }
+
+        response = handler(event, context={})
+
+        self.assertEqual(
+            response,
+            {"batchItemFailures": [{"itemIdentifier": "m1"}, {"itemIdentifier": "m2"}]},
+        )
+        self.assertEqual(repo.add_counts.call_count, 2)
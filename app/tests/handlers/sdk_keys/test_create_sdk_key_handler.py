@@ -0,0 +1,32 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from src.handlers.sdk_keys.create_sdk_key.main import create_sdk_key_handler
+
+
+class TestCreateSDKKeyHandler(unittest.TestCase):
+
+    @patch("src.handlers.sdk_keys.create_sdk_key.main.get_sdk_key_service")
+    @patch("src.handlers.sdk_keys.create_sdk_key.main.get_current_user")
+    def test_create_sdk_key(self, mock_get_user, mock_get_service):
+        mock_get_user.return_value = {"role": "ADMIN", "email": "admin@example.com"}
+        mock_get_service.return_value.create_key.return_value = {"sdk_key": "ffsdk_x_1_y"}
+        event = {
+            "headers": {"Authorization": "Bearer token"},
+            "body": json.dumps({"environment": "prod", "name": "checkout-api"}),
+        }
+
+        response = create_sdk_key_handler(event, context={})
+
+        self.assertEqual(response["statusCode"], 201)
+        dto = mock_get_service.return_value.create_key.call_args.args[0]
+        self.assertEqual(dto.environment.value, "prod")
+
+    @patch("src.handlers.sdk_keys.create_sdk_key.main.get_current_user")
+    def test_create_sdk_key_requires_admin(self, mock_get_user):
+        mock_get_user.return_value = {"role": "CLIENT"}
+
+        response = create_sdk_key_handler({"body": "{}"}, context={})
+
+        self.assertEqual(response["statusCode"], 401)
@@ -0,0 +1,20 @@
+import unittest
+from unittest.mock import patch
+
+from src.handlers.sdk_keys.revoke_sdk_key.main import revoke_sdk_key_handler
+
+
+class TestRevokeSDKKeyHandler(unittest.TestCase):
+
+    @patch("src.handlers.sdk_keys.revoke_sdk_key.main.get_sdk_key_service")
+    @patch("src.handlers.sdk_keys.revoke_sdk_key.main.get_current_user")
+    def test_revoke_sdk_key(self, mock_get_user, mock_get_service):
+        mock_get_user.return_value = {"role": "ADMIN"}
+        mock_get_service.return_value.revoke_key.return_value = {"key_id": "abc", "version": 2}
+
+        response = revoke_sdk_key_handler(
+            {"pathParameters": {"key_id": "abc"}}, context={}
+        )
+
+        self.assertEqual(response["statusCode"], 200)
+        mock_get_service.return_value.revoke_key.assert_called_once_with("abc")
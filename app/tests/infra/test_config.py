@@ -0,0 +1,110 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from infra import config
+from infra.config import SecretCache
+
+
+class ImmediateThread:
+    def __init__(self, target, daemon):
+        self.target = target
+
+    def start(self):
+        self.target()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_empty_secret_is_fetched_once():
+    fetch = MagicMock(return_value={})
+    cache = SecretCache(fetch, ttl_seconds=300)
+
+    for _ in range(5):
+        assert cache.get() == {}
+
+    fetch.assert_called_once()
+
+
+def test_failed_first_fetch_is_cached_then_retried(monkeypatch):
+    monkeypatch.setattr(config.threading, "Thread", ImmediateThread)
+    clock = FakeClock()
+    fetch = MagicMock(side_effect=[RuntimeError("unavailable"), {"KEY": "value"}])
+    cache = SecretCache(fetch, ttl_seconds=300, clock=clock, failure_ttl_seconds=30)
+
+    for _ in range(5):
+        assert cache.get() == {}
+    fetch.assert_called_once()
+
+    clock.now = 30
+    cache.get()
+    assert cache.get() == {"KEY": "value"}
+    assert fetch.call_count == 2
+
+
+def test_stale_secret_is_refreshed_in_background(monkeypatch):
+    monkeypatch.setattr(config.threading, "Thread", ImmediateThread)
+    clock = FakeClock()
+    fetch = MagicMock(side_effect=[{"KEY": "old"}, {"KEY": "new"}])
+    cache = SecretCache(fetch, ttl_seconds=60, clock=clock)
+
+    assert cache.get() == {"KEY": "old"}
+    clock.now = 30
+    assert cache.get() == {"KEY": "old"}
+    clock.now = 61
+    cache.get()
+
+    assert cache.get() == {"KEY": "new"}
+    assert fetch.call_count == 2
+
+
+def test_failed_refresh_keeps_cached_values(monkeypatch):
+    monkeypatch.setattr(config.threading, "Thread", ImmediateThread)
+    clock = FakeClock()
+    fetch = MagicMock(side_effect=[{"KEY": "old"}, RuntimeError("throttled")])
+    cache = SecretCache(fetch, ttl_seconds=60, clock=clock)
+
+    cache.get()
+    clock.now = 61
+    cache.get()
+
+    assert cache.get() == {"KEY": "old"}
+    assert fetch.call_count == 2
+
+
+def test_get_env_without_secret_arn_makes_no_aws_calls(monkeypatch):
+    monkeypatch.delenv("JWT_SECRET_ARN", raising=False)
+    monkeypatch.delenv("SOME_OPTIONAL_SETTING", raising=False)
+    monkeypatch.setattr(config, "_secret_cache", None)
+    client = MagicMock()
+    monkeypatch.setattr(config.boto3, "client", client)
+
+    assert config.get_env("SOME_OPTIONAL_SETTING", "x") == "x"
+    with pytest.raises(RuntimeError):
+        config.get_env("SOME_OPTIONAL_SETTING")
+
+    client.assert_not_called()
+
+
+def test_get_env_reads_secret_with_single_client(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET_ARN", "arn:secret")
+    monkeypatch.delenv("FROM_SECRET", raising=False)
+    monkeypatch.setattr(config, "_secret_cache", None)
+    monkeypatch.setattr(config, "_secrets_client", None)
+    client = MagicMock()
+    client.return_value.get_secret_value.return_value = {
+        "SecretString": '{"FROM_SECRET": "value"}'
+    }
+    monkeypatch.setattr(config.boto3, "client", client)
+
+    assert config.get_env("FROM_SECRET") == "value"
+    assert config.get_env("FROM_SECRET") == "value"
+
+    client.assert_called_once_with("secretsmanager")
+    client.return_value.get_secret_value.assert_called_once_with(SecretId="arn:secret")
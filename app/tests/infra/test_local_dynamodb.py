@@ -0,0 +1,143 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from error_handling.exceptions import ConflictException, EnvironmentNotFoundException
+from infra.local.dynamodb import InMemoryDynamoDB
+from repository.feature_repository import FeatureRepository
+
+
+@pytest.fixture
+def table():
+    return InMemoryDynamoDB().Table("FeatureTable")
+
+
+def test_conditional_put_and_get(table):
+    table.put_item(Item={"PK": "USER#a", "SK": "PROFILE", "name": "a"})
+
+    with pytest.raises(ClientError) as exc:
+        table.put_item(
+            Item={"PK": "USER#a", "SK": "PROFILE"},
+            ConditionExpression="attribute_not_exists(PK)",
+        )
+
+    assert exc.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
+    assert table.get_item(Key={"PK": "USER#a", "SK": "PROFILE"})["Item"]["name"] == "a"
+    assert table.get_item(Key={"PK": "USER#b", "SK": "PROFILE"}) == {}
+
+
+def test_returned_items_are_copies(table):
+    table.put_item(Item={"PK": "p", "SK": "s", "tags": ["a"]})
+
+    table.get_item(Key={"PK": "p", "SK": "s"})["Item"]["tags"].append("b")
+
+    assert table.get_item(Key={"PK": "p", "SK": "s"})["Item"]["tags"] == ["a"]
+
+
+def test_update_item_returns_all_new(table):
+    response = table.update_item(
+        Key={"PK": "p", "SK": "s"},
+        UpdateExpression="ADD hits :one",
+        ExpressionAttributeValues={":one": 1},
+        ReturnValues="ALL_NEW",
+    )
+
+    assert response["Attributes"] == {"PK": "p", "SK": "s", "hits": 1}
+
+
+def test_query_pagination_and_order(table):
+    for i in range(5):
+        table.put_item(Item={"PK": "p", "SK": f"AUDIT#{i}"})
+    table.put_item(Item={"PK": "other", "SK": "AUDIT#0"})
+
+    kwargs = {
+        "KeyConditionExpression": "PK = :pk AND begins_with(SK, :audit)",
+        "ExpressionAttributeValues": {":pk": "p", ":audit": "AUDIT#"},
+        "ScanIndexForward": False,
+        "Limit": 2,
+    }
+    seen = []
+    while True:
+        response = table.query(**kwargs)
+        seen.extend(item["SK"] for item in response["Items"])
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    assert seen == [f"AUDIT#{i}" for i in reversed(range(5))]
+
+
+def test_transaction_is_atomic(table):
+    client = table.meta.client
+    table.put_item(Item={"PK": "p", "SK": "a"})
+
+    with pytest.raises(ClientError) as exc:
+        client.transact_write_items(
+            TransactItems=[
+                {"Put": {"TableName": table.name, "Item": {"PK": "p", "SK": "b"}}},
+                {
+                    "Put": {
+                        "TableName": table.name,
+                        "Item": {"PK": "p", "SK": "a"},
+                        "ConditionExpression": "attribute_not_exists(PK)",
+                    }
+                },
+            ]
+        )
+
+    reasons = exc.value.response["CancellationReasons"]
+    assert [reason["Code"] for reason in reasons] == ["None", "ConditionalCheckFailed"]
+    assert table.get_item(Key={"PK": "p", "SK": "b"}) == {}
+
+
+def test_batch_writer_and_batch_get(table):
+    with table.batch_writer() as batch:
+        batch.put_item(Item={"PK": "p", "SK": "a", "v": 1})
+        batch.put_item(Item={"PK": "p", "SK": "b", "v": 2})
+
+    response = table.meta.client.batch_get_item(
+        RequestItems={
+            table.name: {
+                "Keys": [{"PK": "p", "SK": "a"}, {"PK": "p", "SK": "missing"}],
+                "ProjectionExpression": "v",
+            }
+        }
+    )
+
+    assert response["Responses"][table.name] == [{"v": 1}]
+
+
+def test_feature_repository_round_trip(table):
+    repo = FeatureRepository(table)
+
+    repo.create_feature("Checkout", "desc", {"dev": True, "prod": False})
+    with pytest.raises(ConflictException):
+        repo.create_feature("checkout", "desc", {})
+
+    repo.put_env("checkout", "prod", True, None)
+    with pytest.raises(EnvironmentNotFoundException):
+        repo.put_env("checkout", "stage", True, None)
+
+    assert repo.get_effective_state("checkout", "prod") == {
+        "enabled": True,
+        "enable_at": None,
+    }
+
+    repo.delete_env("checkout", "dev")
+    assert repo.get_env("checkout", "dev") is None
+    assert repo.get_effective_state("checkout", "dev") is None
+
+    table.page_size = 1
+    states = sorted(item["SK"] for item in repo.scan_flag_states())
+    assert states == ["ENV#prod", "META"]
+
+    table.put_item(Item={"PK": "FEATURE#checkout", "SK": "AUDIT#1"})
+    assert [item["SK"] for item in repo.get_feature_items("checkout")] == [
+        "ENV#prod",
+        "META",
+    ]
+    assert set(repo.get_feature_items("checkout")[1]) == {"PK", "SK", "description"}
+
+    repo.delete_feature("checkout")
+    assert repo.get_feature_items("checkout") == []
+    assert not repo.feature_exists("checkout")
+    assert table.get_item(Key={"PK": "FEATURE#checkout", "SK": "AUDIT#1"})["Item"]
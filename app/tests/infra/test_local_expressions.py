@@ -0,0 +1,92 @@
+import pytest
+
+from infra.local.expressions import Condition, ExpressionError, Projection, Update
+
+
+ITEM = {
+    "PK": "FEATURE#checkout",
+    "SK": "ENV#prod",
+    "enabled": True,
+    "count": 3,
+    "tags": ["a"],
+    "meta": {"owner": "team"},
+}
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("attribute_exists(PK) AND attribute_exists(SK)", True),
+        ("attribute_not_exists(missing)", True),
+        ("begins_with(SK, :env)", True),
+        ("SK = :meta OR begins_with(SK, :env)", True),
+        ("NOT enabled = :false", True),
+        ("#c BETWEEN :one AND :five", True),
+        ("#c > :five", False),
+        ("size(tags) = :one", True),
+        ("meta.owner = :owner", True),
+        ("SK IN (:meta, :prod)", True),
+        ("(enabled = :false OR #c >= :one) AND contains(tags, :a)", True),
+        ("missing <> :one", False),
+    ],
+)
+def test_condition(expression, expected):
+    condition = Condition(
+        expression,
+        {"#c": "count"},
+        {
+            ":env": "ENV#",
+            ":meta": "META",
+            ":prod": "ENV#prod",
+            ":false": False,
+            ":one": 1,
+            ":five": 5,
+            ":owner": "team",
+            ":a": "a",
+        },
+    )
+
+    assert condition.evaluate(ITEM) is expected
+
+
+def test_condition_rejects_undefined_value():
+    with pytest.raises(ExpressionError):
+        Condition("PK = :missing", values={})
+
+
+def test_key_condition_equality_value():
+    condition = Condition(
+        "PK = :pk AND begins_with(SK, :audit)",
+        values={":pk": "FEATURE#x", ":audit": "AUDIT#"},
+    )
+
+    assert condition.equality_value("PK") == "FEATURE#x"
+
+
+def test_update_set_remove_add():
+    item = dict(ITEM, tags=["a"])
+
+    updated = Update(
+        "SET enabled = :false, #c = #c + :one, tags = list_append(tags, :more), "
+        "created = if_not_exists(created, :now) REMOVE meta ADD visits :one",
+        {"#c": "count"},
+        {":false": False, ":one": 1, ":more": ["b"], ":now": "t0"},
+    ).apply(item)
+
+    assert item["enabled"] is False
+    assert item["count"] == 4
+    assert item["tags"] == ["a", "b"]
+    assert item["created"] == "t0"
+    assert item["visits"] == 1
+    assert "meta" not in item
+    assert updated == {"enabled", "count", "tags", "created", "meta", "visits"}
+
+
+def test_projection():
+    projection = Projection("PK, #e, meta.owner", {"#e": "enabled"})
+
+    assert projection.apply(ITEM) == {
+        "PK": "FEATURE#checkout",
+        "enabled": True,
+        "meta": {"owner": "team"},
+    }
@@ -0,0 +1,42 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from infra.local.sqs import InMemorySQSClient
+
+
+QUEUE = "http://queue/audit"
+
+
+def test_send_and_drain_event():
+    client = InMemorySQSClient()
+    client.send_message(QueueUrl=QUEUE, MessageBody="one")
+    client.send_message_batch(
+        QueueUrl=QUEUE,
+        Entries=[{"Id": "0", "MessageBody": "two"}, {"Id": "1", "MessageBody": "three"}],
+    )
+
+    event = client.drain_event(QUEUE, batch_size=2)
+
+    assert [record["body"] for record in event["Records"]] == ["one", "two"]
+    assert client.depth(QUEUE) == 1
+
+
+def test_receive_and_delete():
+    client = InMemorySQSClient()
+    client.send_message(QueueUrl=QUEUE, MessageBody="one")
+
+    messages = client.receive_message(QueueUrl=QUEUE, MaxNumberOfMessages=10)["Messages"]
+    client.delete_message(QueueUrl=QUEUE, ReceiptHandle=messages[0]["ReceiptHandle"])
+
+    assert messages[0]["Body"] == "one"
+    assert client.receive_message(QueueUrl=QUEUE) == {}
+
+
+def test_batch_limit():
+    client = InMemorySQSClient()
+
+    with pytest.raises(ClientError):
+        client.send_message_batch(
+            QueueUrl=QUEUE,
+            Entries=[{"Id": str(i), "MessageBody": "x"} for i in range(11)],
+        )
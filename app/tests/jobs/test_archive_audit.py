@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from audit_archive.store import iter_archived
+from jobs.archive_audit import archive_audit
+
+
+def test_archive_audit_exports_rows_older_than_cutoff(tmp_path):
+    repo = MagicMock()
+    repo.scan_audit_items.return_value = [
+        {
+            "PK": "FEATURE#beta",
+            "SK": "AUDIT#2026-01-05T10:00:00+00:00",
+            "action": "CREATE",
+            "actor": "admin@example.com",
+            "old_value": None,
+            "new_value": {"enabled": True},
+            "created_at": "2026-01-05T10:00:00+00:00",
+        }
+    ]
+
+    written = archive_audit(
+        repo, str(tmp_path), now=datetime(2026, 3, 1, tzinfo=timezone.utc)
+    )
+
+    assert written == 1
+    repo.scan_audit_items.assert_called_once_with("2026-01-30T00:00:00+00:00")
+    assert list(iter_archived(str(tmp_path), "beta")) == [
+        {
+            "feature": "beta",
+            "action": "CREATE",
+            "actor": "admin@example.com",
+            "old": None,
+            "new": {"enabled": True},
+            "timestamp": "2026-01-05T10:00:00+00:00",
+        }
+    ]
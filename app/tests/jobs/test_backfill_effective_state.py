@@ -0,0 +1,41 @@
+from unittest.mock import MagicMock
+
+from error_handling.exceptions import EnvironmentNotFoundException
+from jobs.backfill_effective_state import backfill
+
+
+def test_backfill_materializes_env_items():
+    repo = MagicMock()
+    repo.put_effective_state.return_value = True
+    repo.scan_flag_states.return_value = [
+        {"PK": "FEATURE#beta", "SK": "META"},
+        {"PK": "FEATURE#beta", "SK": "ENV#dev", "enabled": True},
+        {
+            "PK": "FEATURE#beta",
+            "SK": "ENV#prod",
+            "enabled": False,
+            "rollout_end_at": "2030-01-01T00:00:00Z",
+        },
+    ]
+
+    count = backfill(repo)
+
+    assert count == 2
+    repo.put_effective_state.assert_any_call("beta", "dev", True, None, None, None)
+    repo.put_effective_state.assert_any_call(
+        "beta", "prod", False, "2030-01-01T00:00:00Z", None, None
+    )
+
+
+def test_backfill_skips_envs_deleted_during_scan():
+    repo = MagicMock()
+    repo.scan_flag_states.return_value = [
+        {"PK": "FEATURE#beta", "SK": "ENV#dev", "enabled": True},
+        {"PK": "FEATURE#beta", "SK": "ENV#prod", "enabled": True},
+    ]
+    repo.put_effective_state.side_effect = [
+        EnvironmentNotFoundException("beta", "dev"),
+        True,
+    ]
+
+    assert backfill(repo) == 1
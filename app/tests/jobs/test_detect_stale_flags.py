@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from infra.local.dynamodb import InMemoryDynamoDB
+from jobs.detect_stale_flags import detect_stale_flags
+from repository.feature_repository import FeatureRepository
+
+NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def feature_rows(name, created_at, environments):
+    rows = [{"PK": f"FEATURE#{name}", "SK": "META", "created_at": created_at}]
+    rows += [
+        {"PK": f"FEATURE#{name}", "SK": f"ENV#{env}", "enabled": enabled}
+        for env, enabled in environments.items()
+    ]
+    return rows
+
+
+def report_for(rows, **kwargs):
+    repo = MagicMock()
+    repo.scan_flag_activity.return_value = iter(rows)
+    return detect_stale_flags(repo, now=NOW, **kwargs)
+
+
+def test_ranks_fully_rolled_out_and_unevaluated_flags():
+    rows = (
+        feature_rows("old-on", "2025-06-01T00:00:00+00:00", {"dev": True, "prod": True})
+        + [
+            {"PK": "AUDIT#old-on#2025-12", "SK": "AUDIT#2025-12-01T00:00:00+00:00#UPDATE_ENV"},
+            {"PK": "AUDIT#old-on#2026-02", "SK": "AUDIT#2026-02-20T00:00:00+00:00#CREATE_FEATURE"},
+            {"PK": "USAGE#old-on", "SK": "DAY#2026-02-28#ENV#prod"},
+        ]
+        + feature_rows("mixed", "2025-01-01T00:00:00+00:00", {"dev": True, "prod": False})
+        + [{"PK": "USAGE#mixed", "SK": "DAY#2026-02-28#ENV#dev"}]
+        + feature_rows("dead", "2025-01-01T00:00:00+00:00", {"dev": False, "prod": False})
+        + feature_rows("fresh", "2026-02-25T00:00:00+00:00", {"dev": True})
+        + [{"PK": "AUDIT#deleted#2025-01", "SK": "AUDIT#2025-01-01T00:00:00+00:00#UPDATE_ENV"}]
+    )
+
+    report = report_for(rows)
+
+    assert report["flags_scanned"] == 4
+    assert [entry["feature"] for entry in report["entries"]] == ["dead", "old-on"]
+
+    dead, old_on = report["entries"]
+    assert dead["reasons"] == ["fully_off"]
+    assert dead["usage"] == "unknown"
+    assert old_on["reasons"] == ["fully_rolled_out"]
+    assert old_on["last_changed_at"] == "2025-12-01T00:00:00+00:00"
+    assert old_on["days_since_evaluation"] == 1
+    assert old_on["usage"] == "recorded"
+
+
+def test_past_rollout_counts_as_on():
+    rows = feature_rows("ramped", "2025-01-01T00:00:00+00:00", {"prod": False})
+    rows[1]["rollout_end_at"] = "2025-02-01T00:00:00Z"
+    rows.append({"PK": "USAGE#ramped", "SK": "DAY#2026-02-28#ENV#prod"})
+
+    [entry] = report_for(rows)["entries"]
+
+    assert entry["reasons"] == ["fully_rolled_out"]
+
+
+def test_report_is_capped():
+    rows = []
+    for i in range(5):
+        rows += feature_rows(f"flag-{i}", f"2025-0{i + 1}-01T00:00:00+00:00", {"prod": True})
+
+    report = report_for(rows, max_entries=2)
+
+    assert report["candidates"] == 5
+    assert [entry["feature"] for entry in report["entries"]] == ["flag-0", "flag-1"]
+
+
+def test_scan_reads_every_page():
+    table = InMemoryDynamoDB().Table("flags", page_size=7)
+    for i in range(30):
+        table.put_item(Item={"PK": f"FEATURE#f{i}", "SK": "META", "created_at": "2025-01-01"})
+        table.put_item(Item={"PK": f"FEATURE#f{i}", "SK": "ENV#prod", "enabled": True})
+    table.put_item(Item={"PK": "USER#a@example.com", "SK": "PROFILE"})
+
+    report = detect_stale_flags(FeatureRepository(table), now=NOW)
+
+    assert report["flags_scanned"] == 30
+    assert report["candidates"] == 30
@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, call
+
+from audit_archive.store import iter_archived
+from jobs.migrate_audit_partitions import migrate
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def test_migrate_records_each_month_once_before_moving(tmp_path):
+    repo = MagicMock()
+    legacy = [
+        {"PK": "FEATURE#beta", "SK": f"AUDIT#{ts}", "created_at": ts}
+        for ts in (
+            "2026-05-20T10:00:00+00:00",
+            "2026-05-21T10:00:00+00:00",
+            "2026-06-01T00:00:00+00:00",
+        )
+    ]
+    repo.scan_legacy_audit_items.return_value = legacy
+
+    count = migrate(repo, str(tmp_path), now=NOW)
+
+    assert count == 3
+    assert repo.put_audit_month.call_args_list == [
+        call("beta", "2026-05"),
+        call("beta", "2026-06"),
+    ]
+    assert repo.move_legacy_audit.call_args_list == [call(item) for item in legacy]
+    assert repo.method_calls[0] == call.scan_legacy_audit_items()
+    assert repo.method_calls[1] == call.put_audit_month("beta", "2026-05")
+    assert list(iter_archived(str(tmp_path), "beta")) == []
+
+
+def test_migrate_archives_rows_past_retention_before_moving(tmp_path):
+    repo = MagicMock()
+    old = {
+        "PK": "FEATURE#beta",
+        "SK": "AUDIT#2025-12-01T10:00:00+00:00",
+        "action": "UPDATE_ENV",
+        "actor": "admin@example.com",
+        "old_value": None,
+        "new_value": {"enabled": True},
+        "created_at": "2025-12-01T10:00:00+00:00",
+    }
+    repo.scan_legacy_audit_items.return_value = [old]
+    repo.move_legacy_audit.side_effect = lambda item: assert_archived(tmp_path)
+
+    assert migrate(repo, str(tmp_path), now=NOW) == 1
+    repo.move_legacy_audit.assert_called_once_with(old)
+
+
+def assert_archived(root):
+    assert [record["timestamp"] for record in iter_archived(str(root), "beta")] == [
+        "2025-12-01T10:00:00+00:00"
+    ]
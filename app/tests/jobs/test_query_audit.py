@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from audit_archive.store import archive_records
+from jobs.query_audit import query_audit
+
+
+def table_item(timestamp, action="UPDATE"):
+    return {
+        "PK": "FEATURE#beta",
+        "SK": f"AUDIT#{timestamp}",
+        "action": action,
+        "actor": "admin@example.com",
+        "old_value": None,
+        "new_value": {"enabled": True},
+        "created_at": timestamp,
+    }
+
+
+def archived(timestamp, action="UPDATE"):
+    return {
+        "feature": "beta",
+        "action": action,
+        "actor": "admin@example.com",
+        "old": None,
+        "new": {"enabled": True},
+        "timestamp": timestamp,
+    }
+
+
+def test_query_audit_merges_tiers_without_duplicates(tmp_path):
+    archive_records(str(tmp_path), [
+        archived("2026-01-01T10:00:00+00:00", "CREATE"),
+        archived("2026-02-01T10:00:00+00:00"),
+    ])
+    repo = MagicMock()
+    repo.get_audit_logs.return_value = [
+        table_item("2026-02-01T10:00:00+00:00"),
+        table_item("2026-03-01T10:00:00+00:00"),
+    ]
+
+    results = query_audit(repo, str(tmp_path), "Beta")
+
+    repo.get_audit_logs.assert_called_once_with("beta")
+    assert [r["timestamp"] for r in results] == [
+        "2026-01-01T10:00:00+00:00",
+        "2026-02-01T10:00:00+00:00",
+        "2026-03-01T10:00:00+00:00",
+    ]
+
+
+def test_query_audit_filters_by_time_range(tmp_path):
+    archive_records(str(tmp_path), [archived("2026-01-01T10:00:00+00:00")])
+    repo = MagicMock()
+    repo.get_audit_logs.return_value = [table_item("2026-03-01T10:00:00+00:00")]
+
+    results = query_audit(
+        repo,
+        str(tmp_path),
+        "beta",
+        since=datetime(2026, 1, 15, tzinfo=timezone.utc),
+        until=datetime(2026, 3, 2, tzinfo=timezone.utc),
+    )
+
+    assert [r["timestamp"] for r in results] == ["2026-03-01T10:00:00+00:00"]
@@ -0,0 +1,20 @@
+from unittest.mock import MagicMock
+
+from jobs.snapshot_export import BINARY_FILE_NAME, JSON_FILE_NAME, export_snapshot
+from snapshot.bootstrap import load_snapshot_file
+
+
+def test_export_snapshot_writes_json_and_binary(tmp_path):
+    repo = MagicMock()
+    repo.scan_flag_states.return_value = [
+        {"PK": "FEATURE#beta", "SK": "META"},
+        {"PK": "FEATURE#beta", "SK": "ENV#dev", "enabled": True},
+    ]
+
+    snapshot = export_snapshot(repo, str(tmp_path))
+
+    from_json = load_snapshot_file(str(tmp_path / JSON_FILE_NAME))
+    from_binary = load_snapshot_file(str(tmp_path / BINARY_FILE_NAME))
+    assert from_json == snapshot
+    assert from_binary == snapshot
+    assert from_json.get("beta", "dev").enabled is True
@@ -0,0 +1,34 @@
+from unittest.mock import MagicMock
+
+from jobs.snapshot_refresher import refresh_once
+from snapshot.mmap_reader import MmapSnapshotReader
+
+
+def make_repo(enabled):
+    repo = MagicMock()
+    repo.scan_flag_states.return_value = [
+        {"PK": "FEATURE#beta", "SK": "META"},
+        {"PK": "FEATURE#beta", "SK": "ENV#dev", "enabled": enabled},
+    ]
+    return repo
+
+
+def test_refresh_once_writes_snapshot(tmp_path):
+    path = str(tmp_path / "flags.bin")
+
+    snapshot = refresh_once(make_repo(True), path)
+
+    reader = MmapSnapshotReader(path)
+    assert reader.get("beta", "dev").enabled is True
+    assert reader.version == snapshot.version
+
+
+def test_refresh_once_skips_unchanged_snapshot(tmp_path):
+    path = str(tmp_path / "flags.bin")
+    previous = refresh_once(make_repo(True), path)
+    mtime = (tmp_path / "flags.bin").stat().st_mtime_ns
+
+    result = refresh_once(make_repo(True), path, previous)
+
+    assert result is previous
+    assert (tmp_path / "flags.bin").stat().st_mtime_ns == mtime
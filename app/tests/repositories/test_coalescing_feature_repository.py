@@ -0,0 +1,46 @@
+import unittest
+from unittest.mock import MagicMock
+
+from repository.coalescing_feature_repository import CoalescingFeatureRepository
+from utils.metrics import MetricsRegistry
+from utils.single_flight import SingleFlight
+
+
+class TestCoalescingFeatureRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_table = MagicMock()
+        self.flight = MagicMock(wraps=SingleFlight(metrics=MetricsRegistry()))
+        self.repo = CoalescingFeatureRepository(self.mock_table, self.flight)
+
+    def test_get_feature_items_goes_through_single_flight(self):
+        self.mock_table.get_item.return_value = {"Item": {"SK": "META"}}
+        self.mock_table.query.return_value = {"Items": [{"SK": "ENV#dev"}]}
+
+        items = self.repo.get_feature_items("Feature")
+
+        self.assertEqual(items, [{"SK": "ENV#dev"}, {"SK": "META"}])
+        key = self.flight.do.call_args[0][0]
+        self.assertEqual(key, ("get_feature_items", "feature"))
+
+    def test_get_env_goes_through_single_flight(self):
+        self.mock_table.get_item.return_value = {"Item": {"enabled": True}}
+
+        env = self.repo.get_env("Feature", "DEV")
+
+        self.assertTrue(env["enabled"])
+        key = self.flight.do.call_args[0][0]
+        self.assertEqual(key, ("get_env", "feature", "dev"))
+
+    def test_feature_exists_goes_through_single_flight(self):
+        self.mock_table.get_item.return_value = {"Item": {"PK": "FEATURE#feature"}}
+
+        self.assertTrue(self.repo.feature_exists("Feature"))
+        key = self.flight.do.call_args[0][0]
+        self.assertEqual(key, ("feature_exists", "feature"))
+
+    def test_writes_are_not_coalesced(self):
+        self.repo.put_env("feature", "dev", True, None)
+
+        self.mock_table.meta.client.transact_write_items.assert_called_once()
+        self.flight.do.assert_not_called()
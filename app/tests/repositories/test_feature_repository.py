@@ -1,9 +1,14 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from botocore.exceptions import ClientError
 
+from infra.local.dynamodb import InMemoryDynamoDB
 from repository.feature_repository import FeatureRepository
-from error_handling.exceptions import ConflictException, EnvironmentNotFoundException
+from error_handling.exceptions import (
+    ConflictException,
+    EnvironmentNotFoundException,
+    ServiceUnavailableException,
+)
 
 
 class TestFeatureRepository(unittest.TestCase):
@@ -70,23 +75,65 @@ class TestFeatureRepository(unittest.TestCase):
         self.assertTrue(env["enabled"])
 
     def test_put_env_success(self):
-        self.mock_table.update_item.return_value = {}
+        self.mock_table.meta.client.transact_write_items.return_value = {}
 
         self.repo.put_env(
             feature_name="feature",
             env="dev",
-            enabled=True,
-            rollout_end_at=None
+            enabled=False,
+            rollout_end_at="2030-01-01T00:00:00Z"
         )
 
-        self.mock_table.update_item.assert_called_once()
-    
+        self.mock_table.meta.client.transact_write_items.assert_called_once()
+        transact_items = self.mock_table.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        self.assertEqual(transact_items[0]["Update"]["Key"]["SK"], "ENV#dev")
+        state = transact_items[1]["Put"]["Item"]
+        self.assertEqual(state["SK"], "STATE#dev")
+        self.assertFalse(state["enabled"])
+        self.assertEqual(state["enable_at"], 1893456000000)
+
+    def test_put_env_with_variants_writes_env_and_state(self):
+        self.mock_table.meta.client.transact_write_items.return_value = {}
+        variants = [{"name": "blue", "weight": 1, "payload": '{"color":"#00f"}'}]
+
+        self.repo.put_env("feature", "dev", True, None, variants)
+
+        transact_items = self.mock_table.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        update = transact_items[0]["Update"]
+        self.assertIn("variants = :variants", update["UpdateExpression"])
+        self.assertEqual(update["ExpressionAttributeValues"][":variants"], variants)
+        self.assertEqual(transact_items[1]["Put"]["Item"]["variants"], variants)
+
+    def test_put_env_stores_prerequisites(self):
+        self.mock_table.meta.client.transact_write_items.return_value = {}
+
+        self.repo.put_env("feature", "dev", True, None, None, ["beta"])
+
+        transact_items = self.mock_table.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        update = transact_items[0]["Update"]
+        self.assertIn("prerequisites = :prerequisites", update["UpdateExpression"])
+        self.assertTrue(update["UpdateExpression"].endswith("REMOVE variants"))
+        self.assertEqual(transact_items[1]["Put"]["Item"]["prerequisites"], ["beta"])
+
+    def test_put_env_without_variants_removes_them(self):
+        self.mock_table.meta.client.transact_write_items.return_value = {}
+
+        self.repo.put_env("feature", "dev", True, None)
+
+        transact_items = self.mock_table.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        self.assertTrue(transact_items[0]["Update"]["UpdateExpression"].endswith("REMOVE variants, prerequisites"))
+        self.assertNotIn("variants", transact_items[1]["Put"]["Item"])
+
     def test_put_env_not_found(self):
-        self.mock_table.update_item.side_effect = ClientError(
+        self.mock_table.meta.client.transact_write_items.side_effect = ClientError(
             error_response={
-                "Error": {"Code": "ConditionalCheckFailedException"}
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [
+                    {"Code": "ConditionalCheckFailed"},
+                    {"Code": "None"},
+                ],
             },
-            operation_name="UpdateItem"
+            operation_name="TransactWriteItems"
         )
 
         with self.assertRaises(EnvironmentNotFoundException):
@@ -98,11 +145,11 @@ class TestFeatureRepository(unittest.TestCase):
             )
 
     def test_put_env_unexpected_client_error(self):
-        self.mock_table.update_item.side_effect = ClientError(
+        self.mock_table.meta.client.transact_write_items.side_effect = ClientError(
             error_response={
                 "Error": {"Code": "ProvisionedThroughputExceededException"}
             },
-            operation_name="UpdateItem"
+            operation_name="TransactWriteItems"
         )
 
         with self.assertRaises(ClientError):
@@ -112,60 +159,230 @@ class TestFeatureRepository(unittest.TestCase):
                 enabled=True,
                 rollout_end_at=None
             )
-        
+
+    def test_delete_env_removes_env_and_state(self):
+        self.repo.delete_env("feature", "dev")
+
+        transact_items = self.mock_table.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        self.assertEqual(
+            [item["Delete"]["Key"]["SK"] for item in transact_items],
+            ["ENV#dev", "STATE#dev"],
+        )
 
     def test_delete_env_not_found(self):
-        self.mock_table.delete_item.side_effect = ClientError(
+        self.mock_table.meta.client.transact_write_items.side_effect = ClientError(
             error_response={
-                "Error": {"Code": "ConditionalCheckFailedException"}
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [{"Code": "ConditionalCheckFailed"}],
             },
-            operation_name="DeleteItem"
+            operation_name="TransactWriteItems"
         )
 
         with self.assertRaises(EnvironmentNotFoundException):
             self.repo.delete_env("feature", "prod")
+
     def test_delete_env_unexpected_client_error(self):
-        self.mock_table.delete_item.side_effect = ClientError(
+        self.mock_table.meta.client.transact_write_items.side_effect = ClientError(
             error_response={
                 "Error": {"Code": "InternalServerError"}
             },
-            operation_name="DeleteItem"
+            operation_name="TransactWriteItems"
         )
 
         with self.assertRaises(ClientError):
             self.repo.delete_env("feature", "dev")
-        
+
+    def test_create_feature_writes_effective_state(self):
+        self.repo.create_feature(
+            feature_name="NewFeature",
+            description="test",
+            environments={"dev": True}
+        )
+
+        transact_items = self.mock_table.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        self.assertEqual(
+            [item["Put"]["Item"]["SK"] for item in transact_items],
+            ["META", "ENV#dev", "STATE#dev"],
+        )
+
+    def test_put_effective_state_never_overwrites_existing_row(self):
+        repo = FeatureRepository(InMemoryDynamoDB().Table("features"))
+        repo.create_feature("feature", "desc", {"dev": True})
+        repo.table.delete_item(Key={"PK": "FEATURE#feature", "SK": "STATE#dev"})
+
+        self.assertTrue(repo.put_effective_state("Feature", "DEV", True, None))
+        self.assertFalse(repo.put_effective_state("Feature", "DEV", False, None))
+        self.assertTrue(repo.get_effective_state("feature", "dev")["enabled"])
+
+    def test_put_effective_state_requires_env_row(self):
+        repo = FeatureRepository(InMemoryDynamoDB().Table("features"))
+        repo.create_feature("feature", "desc", {"dev": True})
+        repo.delete_env("feature", "dev")
+
+        with self.assertRaises(EnvironmentNotFoundException):
+            repo.put_effective_state("feature", "dev", True, None)
+        self.assertIsNone(repo.get_effective_state("feature", "dev"))
+
+    def test_complete_rollout_is_conditional_on_unchanged_env(self):
+        repo = FeatureRepository(InMemoryDynamoDB().Table("features"))
+        repo.create_feature("feature", "desc", {"dev": False})
+        repo.put_env("feature", "dev", False, "2020-01-01T00:00:00+00:00")
+        env_item = repo.get_env("feature", "dev")
+
+        self.assertTrue(repo.complete_rollout("Feature", "DEV", env_item))
+        self.assertFalse(repo.complete_rollout("feature", "dev", env_item))
+
+        env = repo.get_env("feature", "dev")
+        self.assertTrue(env["enabled"])
+        self.assertIsNone(env.get("rollout_end_at"))
+        self.assertTrue(repo.get_effective_state("feature", "dev")["enabled"])
+
+    def test_get_effective_state_uses_projection(self):
+        self.mock_table.get_item.return_value = {"Item": {"enabled": True}}
+
+        item = self.repo.get_effective_state("Feature", "DEV")
+
+        self.assertTrue(item["enabled"])
+        kwargs = self.mock_table.get_item.call_args.kwargs
+        self.assertEqual(kwargs["Key"], {"PK": "FEATURE#feature", "SK": "STATE#dev"})
+        self.assertEqual(kwargs["ProjectionExpression"], "enabled, enable_at, variants, prerequisites")
+
     def test_get_feature_items(self):
-        self.mock_table.query.return_value = {
-            "Items": [{"SK": "META"}, {"SK": "ENV#dev"}]
-        }
+        self.mock_table.get_item.return_value = {"Item": {"SK": "META"}}
+        self.mock_table.query.return_value = {"Items": [{"SK": "ENV#dev"}]}
 
         items = self.repo.get_feature_items("feature")
 
-        self.assertEqual(len(items), 2)
-    def test_delete_feature_skips_audit_items(self):
-        self.mock_table.query.return_value = {
-            "Items": [
-                {"PK": "FEATURE#f1", "SK": "META"},
-                {"PK": "FEATURE#f1", "SK": "ENV#dev"},
-                {"PK": "FEATURE#f1", "SK": "AUDIT#123"},
-            ]
+        self.assertEqual([item["SK"] for item in items], ["ENV#dev", "META"])
+        self.mock_table.get_item.assert_called_once_with(
+            Key={"PK": "FEATURE#feature", "SK": "META"},
+            ProjectionExpression=FeatureRepository.META_PROJECTION,
+        )
+        kwargs = self.mock_table.query.call_args.kwargs
+        self.assertEqual(
+            kwargs["KeyConditionExpression"], "PK = :pk AND begins_with(SK, :env)"
+        )
+        self.assertEqual(kwargs["ProjectionExpression"], FeatureRepository.FEATURE_PROJECTION)
+
+    def test_get_feature_items_skips_state_rows(self):
+        repo = FeatureRepository(InMemoryDynamoDB().Table("features"))
+        repo.create_feature("feature", "desc", {"dev": True, "prod": False})
+
+        items = repo.get_feature_items("Feature")
+
+        self.assertEqual(
+            [item["SK"] for item in items], ["ENV#dev", "ENV#prod", "META"]
+        )
+
+    def test_feature_exists_reads_meta_key_only(self):
+        self.mock_table.get_item.return_value = {}
+
+        self.assertFalse(self.repo.feature_exists("Feature"))
+        self.mock_table.get_item.assert_called_once_with(
+            Key={"PK": "FEATURE#feature", "SK": "META"},
+            ProjectionExpression="PK",
+        )
+
+    def test_delete_feature_skips_audit_range_and_deletes_meta_last(self):
+        self.mock_table.query.side_effect = [
+            {
+                "Items": [
+                    {"PK": "FEATURE#f1", "SK": "ENV#dev"},
+                    {"PK": "FEATURE#f1", "SK": "META"},
+                ],
+                "LastEvaluatedKey": {"PK": "FEATURE#f1", "SK": "META"},
+            },
+            {"Items": [{"PK": "FEATURE#f1", "SK": "STATE#dev"}]},
+        ]
+        self.mock_table.meta.client.batch_write_item.return_value = {
+            "UnprocessedItems": {}
         }
 
-        mock_batch = MagicMock()
-        self.mock_table.batch_writer.return_value.__enter__.return_value = mock_batch
+        self.repo.delete_feature("f1")
+
+        first_query = self.mock_table.query.call_args_list[0].kwargs
+        self.assertEqual(
+            first_query["KeyConditionExpression"], "PK = :pk AND SK >= :config"
+        )
+        self.assertEqual(first_query["ExpressionAttributeValues"][":config"], "ENV#")
+        self.assertEqual(first_query["ProjectionExpression"], "PK, SK")
+        self.assertEqual(
+            self.mock_table.query.call_args_list[1].kwargs["ExclusiveStartKey"],
+            {"PK": "FEATURE#f1", "SK": "META"},
+        )
+
+        request = self.mock_table.meta.client.batch_write_item.call_args.kwargs["RequestItems"]
+        deleted = [r["DeleteRequest"]["Key"]["SK"] for r in request["FeatureTable"]]
+        self.assertEqual(deleted, ["ENV#dev", "STATE#dev"])
+        self.mock_table.delete_item.assert_called_once_with(
+            Key={"PK": "FEATURE#f1", "SK": "META"}
+        )
+
+    def test_delete_feature_chunks_batch_deletes(self):
+        self.mock_table.query.return_value = {
+            "Items": [{"PK": "FEATURE#f1", "SK": f"ENV#e{i}"} for i in range(60)]
+        }
+        self.mock_table.meta.client.batch_write_item.return_value = {
+            "UnprocessedItems": {}
+        }
 
         self.repo.delete_feature("f1")
 
-        self.assertEqual(mock_batch.delete_item.call_count, 2)
-    def test_get_audit_logs(self):
+        sizes = sorted(
+            len(c.kwargs["RequestItems"]["FeatureTable"])
+            for c in self.mock_table.meta.client.batch_write_item.call_args_list
+        )
+        self.assertEqual(sizes, [10, 25, 25])
+
+    @patch("repository.feature_repository.time.sleep")
+    def test_delete_feature_incomplete_keeps_meta(self, mock_sleep):
         self.mock_table.query.return_value = {
-            "Items": [{"SK": "AUDIT#1"}, {"SK": "AUDIT#2"}]
+            "Items": [{"PK": "FEATURE#f1", "SK": "ENV#dev"}]
         }
+        self.mock_table.meta.client.batch_write_item.return_value = {
+            "UnprocessedItems": {"FeatureTable": [{"DeleteRequest": {}}]}
+        }
+
+        with self.assertRaises(ServiceUnavailableException):
+            self.repo.delete_feature("f1")
+
+        self.mock_table.delete_item.assert_not_called()
+    def test_get_audit_logs(self):
+        self.mock_table.query.side_effect = [
+            {"Items": [{"SK": "MONTH#2026-01"}, {"SK": "MONTH#2026-02"}]},
+            {"Items": [{"SK": "AUDIT#1"}]},
+            {"Items": [{"SK": "AUDIT#2"}]},
+        ]
 
-        logs = self.repo.get_audit_logs("feature")
+        logs = self.repo.get_audit_logs("Feature")
 
         self.assertEqual(len(logs), 2)
+        partitions = [
+            c.kwargs["ExpressionAttributeValues"][":pk"]
+            for c in self.mock_table.query.call_args_list
+        ]
+        self.assertEqual(
+            partitions,
+            ["AUDIT#feature", "AUDIT#feature#2026-01", "AUDIT#feature#2026-02"],
+        )
+
+    def test_move_legacy_audit_puts_and_deletes_in_one_transaction(self):
+        feature_name, month = self.repo.move_legacy_audit({
+            "PK": "FEATURE#f1",
+            "SK": "AUDIT#2026-01-05T10:00:00+00:00",
+            "action": "UPDATE",
+            "actor": "admin",
+            "created_at": "2026-01-05T10:00:00+00:00",
+        })
+
+        self.assertEqual((feature_name, month), ("f1", "2026-01"))
+        items = self.mock_table.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        self.assertEqual(items[0]["Put"]["Item"]["PK"], "AUDIT#f1#2026-01")
+        self.assertEqual(
+            items[1]["Delete"]["Key"],
+            {"PK": "FEATURE#f1", "SK": "AUDIT#2026-01-05T10:00:00+00:00"},
+        )
+
     def test_list_features_success(self):
         self.mock_table.scan.return_value = {
             "Items": [
@@ -190,6 +407,23 @@ class TestFeatureRepository(unittest.TestCase):
         self.assertEqual(items[0]["SK"], "META")
         self.mock_table.scan.assert_called_once()
     
+    def test_list_features_paginates(self):
+        self.mock_table.scan.side_effect = [
+            {
+                "Items": [{"PK": "FEATURE#f1", "SK": "META"}],
+                "LastEvaluatedKey": {"PK": "FEATURE#f1", "SK": "META"},
+            },
+            {"Items": [{"PK": "FEATURE#f2", "SK": "META"}]},
+        ]
+
+        items = self.repo.list_features()
+
+        self.assertEqual([item["PK"] for item in items], ["FEATURE#f1", "FEATURE#f2"])
+        self.assertEqual(
+            self.mock_table.scan.call_args.kwargs["ExclusiveStartKey"],
+            {"PK": "FEATURE#f1", "SK": "META"},
+        )
+
     def test_list_features_empty(self):
         self.mock_table.scan.return_value = {}
 
@@ -198,3 +432,111 @@ class TestFeatureRepository(unittest.TestCase):
         self.assertEqual(items, [])
         self.mock_table.scan.assert_called_once()
 
+    def test_scan_flag_states_paginates(self):
+        self.mock_table.scan.side_effect = [
+            {
+                "Items": [{"PK": "FEATURE#f1", "SK": "META"}],
+                "LastEvaluatedKey": {"PK": "FEATURE#f1", "SK": "META"},
+            },
+            {
+                "Items": [{"PK": "FEATURE#f1", "SK": "ENV#dev", "enabled": True}],
+            },
+        ]
+
+        items = list(self.repo.scan_flag_states())
+
+        self.assertEqual(len(items), 2)
+        self.assertEqual(self.mock_table.scan.call_count, 2)
+        second_call = self.mock_table.scan.call_args_list[1].kwargs
+        self.assertEqual(
+            second_call["ExclusiveStartKey"],
+            {"PK": "FEATURE#f1", "SK": "META"},
+        )
+
+    def test_scan_audit_items_filters_before_cutoff(self):
+        self.mock_table.scan.side_effect = [
+            {
+                "Items": [{"PK": "FEATURE#f1", "SK": "AUDIT#2026-01-01T00:00:00+00:00"}],
+                "LastEvaluatedKey": {"PK": "FEATURE#f1", "SK": "AUDIT#2026-01-01T00:00:00+00:00"},
+            },
+            {"Items": []},
+        ]
+
+        items = list(self.repo.scan_audit_items("2026-02-01T00:00:00+00:00"))
+
+        self.assertEqual(len(items), 1)
+        first_call = self.mock_table.scan.call_args_list[0].kwargs
+        self.assertEqual(
+            first_call["ExpressionAttributeValues"][":before"],
+            "AUDIT#2026-02-01T00:00:00+00:00",
+        )
+        self.assertIn("ExclusiveStartKey", self.mock_table.scan.call_args_list[1].kwargs)
+
+    def test_put_envs_maps_condition_failure_to_change(self):
+        self.mock_table.meta.client.transact_write_items.side_effect = ClientError(
+            error_response={
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [
+                    {"Code": "None"},
+                    {"Code": "None"},
+                    {"Code": "ConditionalCheckFailed"},
+                    {"Code": "None"},
+                ],
+            },
+            operation_name="TransactWriteItems"
+        )
+
+        with self.assertRaises(EnvironmentNotFoundException) as ctx:
+            self.repo.put_envs([
+                ("a", "dev", True, None, None, None),
+                ("B", "PROD", True, None, None, None),
+            ])
+
+        self.assertIn("'prod'", ctx.exception.message)
+        self.assertIn("'b'", ctx.exception.message)
+
+    def test_put_envs_rejects_oversized_transaction(self):
+        changes = [(f"f{i}", "dev", True, None, None, None) for i in range(51)]
+
+        with self.assertRaises(ValueError):
+            self.repo.put_envs(changes)
+
+        self.mock_table.meta.client.transact_write_items.assert_not_called()
+
+    @patch("repository.feature_repository.time.sleep")
+    def test_batch_get_envs_retries_unprocessed_keys(self, mock_sleep):
+        unprocessed = {
+            "FeatureTable": {"Keys": [{"PK": "FEATURE#b", "SK": "ENV#dev"}]}
+        }
+        self.mock_table.meta.client.batch_get_item.side_effect = [
+            {
+                "Responses": {"FeatureTable": [
+                    {"PK": "FEATURE#a", "SK": "ENV#dev", "enabled": True}
+                ]},
+                "UnprocessedKeys": unprocessed,
+            },
+            {
+                "Responses": {"FeatureTable": [
+                    {"PK": "FEATURE#b", "SK": "ENV#dev", "enabled": False}
+                ]},
+                "UnprocessedKeys": {},
+            },
+        ]
+
+        found = self.repo.batch_get_envs([("A", "dev"), ("b", "DEV"), ("a", "dev")])
+
+        self.assertEqual(set(found), {("a", "dev"), ("b", "dev")})
+        calls = self.mock_table.meta.client.batch_get_item.call_args_list
+        self.assertEqual(len(calls[0].kwargs["RequestItems"]["FeatureTable"]["Keys"]), 2)
+        self.assertEqual(calls[1].kwargs["RequestItems"], unprocessed)
+        mock_sleep.assert_called_once()
+
+    def test_batch_get_envs_chunks_keys(self):
+        self.mock_table.meta.client.batch_get_item.return_value = {"Responses": {}}
+
+        self.repo.batch_get_envs([(f"f{i}", "dev") for i in range(150)])
+
+        calls = self.mock_table.meta.client.batch_get_item.call_args_list
+        sizes = [len(c.kwargs["RequestItems"]["FeatureTable"]["Keys"]) for c in calls]
+        self.assertEqual(sizes, [100, 50])
+
@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from error_handling.exceptions import ConflictException, NotFoundException
+from repository.sdk_key_repository import SDKKeyRepository
+
+
+def conditional_check_failed(operation):
+    return ClientError(
+        error_response={"Error": {"Code": "ConditionalCheckFailedException"}},
+        operation_name=operation,
+    )
+
+
+class TestSDKKeyRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_table = MagicMock()
+        self.repo = SDKKeyRepository(self.mock_table)
+
+    def test_create_key_conflict(self):
+        self.mock_table.put_item.side_effect = conditional_check_failed("PutItem")
+
+        with self.assertRaises(ConflictException):
+            self.repo.create_key("abc", "prod", "api", "hash", "admin", "2026-01-01")
+
+    def test_get_key_projects_auth_attributes(self):
+        self.mock_table.get_item.return_value = {"Item": {"key_version": 1}}
+
+        self.assertEqual(self.repo.get_key("abc"), {"key_version": 1})
+        self.mock_table.get_item.assert_called_once_with(
+            Key={"PK": "SDKKEY#abc", "SK": "META"},
+            ProjectionExpression=SDKKeyRepository.KEY_PROJECTION,
+        )
+
+    def test_bump_version(self):
+        self.mock_table.update_item.return_value = {"Attributes": {"key_version": 3}}
+
+        self.assertEqual(self.repo.bump_version("abc"), 3)
+
+    def test_bump_version_missing_key(self):
+        self.mock_table.update_item.side_effect = conditional_check_failed("UpdateItem")
+
+        with self.assertRaises(NotFoundException):
+            self.repo.bump_version("abc")
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from infra.local.dynamodb import InMemoryDynamoDB
+from repository.usage_repository import UsageRepository
+from utils.hyperloglog import HyperLogLog
+
+
+def sketch(*users):
+    result = HyperLogLog()
+    for user in users:
+        result.add(user)
+    return result
+
+
+class TestUsageRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_table = MagicMock()
+        self.repo = UsageRepository(self.mock_table)
+
+    def test_add_counts_increments_total_and_variants(self):
+        self.repo.add_counts("Beta", "prod", "2026-01-01", {"on": 3, "off": 2})
+
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        self.assertEqual(
+            kwargs["Key"], {"PK": "USAGE#beta", "SK": "DAY#2026-01-01#ENV#prod"}
+        )
+        self.assertEqual(
+            kwargs["UpdateExpression"],
+            "SET #environment = :environment ADD evaluations :total, #v0 :v0, #v1 :v1",
+        )
+        self.assertEqual(kwargs["ExpressionAttributeNames"]["#v0"], "variant_off")
+        self.assertEqual(kwargs["ExpressionAttributeValues"][":total"], 5)
+
+    def test_put_samples_sets_ttl(self):
+        writer = self.mock_table.batch_writer.return_value.__enter__.return_value
+
+        self.repo.put_samples([{
+            "feature": "beta",
+            "environment": "prod",
+            "variant": "on",
+            "actor": "a@example.com",
+            "timestamp": "2026-01-01T00:00:00+00:00",
+        }])
+
+        item = writer.put_item.call_args.kwargs["Item"]
+        self.assertTrue(item["SK"].startswith("SAMPLE#2026-01-01T00:00:00+00:00#"))
+        self.assertIn("expires_at", item)
+
+    def test_merge_sketches_unions_with_stored_sketch(self):
+        repo = UsageRepository(InMemoryDynamoDB().Table("usage"))
+
+        repo.merge_sketches("Beta", "prod", "2026-01-01", {"on": sketch("a", "b")})
+        repo.merge_sketches("beta", "prod", "2026-01-01", {"on": sketch("b", "c"), "off": sketch("d")})
+        repo.merge_sketches("beta", "prod", "2025-12-31", {"on": sketch("z")})
+
+        [(day, environment, sketches)] = repo.get_unique_user_sketches("beta", "2026-01-01")
+        self.assertEqual((day, environment), ("2026-01-01", "prod"))
+        self.assertEqual(
+            {variant: value.count() for variant, value in sketches.items()},
+            {"on": 3, "off": 1},
+        )
+
+    def test_merge_sketches_retries_on_version_conflict(self):
+        conflict = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+        )
+        self.mock_table.get_item.return_value = {}
+        self.mock_table.update_item.side_effect = [conflict, {}]
+
+        self.repo.merge_sketches("beta", "prod", "2026-01-01", {"on": sketch("a")})
+
+        self.assertEqual(self.mock_table.update_item.call_count, 2)
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        self.assertEqual(kwargs["Key"]["SK"], "USERS#2026-01-01#ENV#prod")
+        self.assertEqual(kwargs["ExpressionAttributeValues"][":next"], 1)
+
+    def test_report_round_trip(self):
+        repo = UsageRepository(InMemoryDynamoDB().Table("usage"))
+
+        self.assertIsNone(repo.get_report("stale-flags"))
+        repo.put_report("stale-flags", {"entries": [{"feature": "beta"}]})
+
+        self.assertEqual(repo.get_report("stale-flags"), {"entries": [{"feature": "beta"}]})
@@ -6,6 +6,7 @@ from dto.auth_dto import SignuprequestDTO, LoginRequestDTO
 from error_handling.exceptions import ConflictException, UnauthorizedException
 from models.user_model import UserModel
 from enums.enums import Role
+from utils.lru_set import LRUSet
 
 
 class TestAuthService(unittest.TestCase):
@@ -16,7 +17,6 @@ class TestAuthService(unittest.TestCase):
 
     @patch("services.auth_service.hash_password")
     def test_signup_success(self, mock_hash):
-        self.repo.get_user_by_email.return_value = None
         mock_hash.return_value = "hashed-password"
 
         req = SignuprequestDTO(
@@ -28,10 +28,12 @@ class TestAuthService(unittest.TestCase):
         result = self.service.signup(req)
 
         self.repo.create_user.assert_called_once()
+        self.repo.get_user_by_email.assert_not_called()
         self.assertEqual(result["message"], "User created successfully")
 
-    def test_signup_conflict(self):
-        self.repo.get_user_by_email.return_value = MagicMock()
+    @patch("services.auth_service.hash_password")
+    def test_signup_conflict(self, mock_hash):
+        self.repo.create_user.side_effect = ConflictException("User already exists")
 
         req = SignuprequestDTO(
             username="test",
@@ -41,6 +43,40 @@ class TestAuthService(unittest.TestCase):
 
         with self.assertRaises(ConflictException):
             self.service.signup(req)
+        self.repo.get_user_by_email.assert_not_called()
+
+    @patch("services.auth_service.hash_password")
+    def test_signup_known_duplicate_skips_hash_and_write(self, mock_hash):
+        service = AuthService(self.repo, known_emails=LRUSet(10))
+        self.repo.create_user.side_effect = ConflictException("User already exists")
+        req = SignuprequestDTO(
+            username="test",
+            email="Test@example.com",
+            password="password123"
+        )
+
+        for _ in range(3):
+            with self.assertRaises(ConflictException):
+                service.signup(req)
+
+        mock_hash.assert_called_once()
+        self.repo.create_user.assert_called_once()
+
+    @patch("services.auth_service.hash_password")
+    def test_signup_backend_error_is_not_cached(self, mock_hash):
+        known_emails = LRUSet(10)
+        service = AuthService(self.repo, known_emails=known_emails)
+        self.repo.create_user.side_effect = RuntimeError("throttled")
+        req = SignuprequestDTO(
+            username="test",
+            email="test@example.com",
+            password="password123"
+        )
+
+        with self.assertRaises(RuntimeError):
+            service.signup(req)
+
+        self.assertNotIn("test@example.com", known_emails)
 
     @patch("services.auth_service.verify_password")
     @patch("services.auth_service.generate_jwt")
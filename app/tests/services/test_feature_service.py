@@ -3,17 +3,30 @@ from unittest.mock import MagicMock, patch
 from datetime import datetime, timezone, timedelta
 
 from services.feature_service import FeatureService
-from dto.feature_dto import CreateFeatureDTO, UpdateFeatureEnvDTO, EvaluateDTO
+from dto.feature_dto import (
+    BulkUpdateEnvDTO,
+    CreateFeatureDTO,
+    UpdateFeatureEnvDTO,
+    EvaluateDTO,
+)
 from error_handling.exceptions import (
     FeatureNotFoundException,
     EnvironmentNotFoundException,
+    ValidationException,
 )
 from enums.enums import Environment
+from snapshot.model import FlagState, Snapshot, Variant, now_ms
+from botocore.exceptions import ClientError
+from utils.circuit_breaker import CircuitBreaker
+from utils.lru_set import LRUSet
+from utils.metrics import MetricsRegistry
+from utils.swr_cache import StaleWhileRevalidateCache
 
 class TestFeatureService(unittest.TestCase):
 
     def setUp(self):
         self.repo = MagicMock()
+        self.repo.get_effective_state.return_value = None
         self.service = FeatureService(self.repo)
 
     @patch("services.feature_service.publish_audit")
@@ -83,7 +96,7 @@ class TestFeatureService(unittest.TestCase):
     def test_evaluate_auto_rollout(self, mock_audit):
         rollout_time = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat()
 
-        self.repo.get_feature_items.return_value = [{"SK": "META"}]
+        self.repo.feature_exists.return_value = True
         self.repo.get_env.return_value = {
             "enabled": False,
             "rollout_end_at": rollout_time,
@@ -98,11 +111,13 @@ class TestFeatureService(unittest.TestCase):
         result = self.service.evaluate(req)
 
         self.assertTrue(result)
-        self.repo.put_env.assert_called_once()
+        self.repo.complete_rollout.assert_called_once_with(
+            "feature", "dev", self.repo.get_env.return_value
+        )
         mock_audit.assert_called_once()
      
     def test_evaluate_feature_not_found(self):
-        self.repo.get_feature_items.return_value = []
+        self.repo.feature_exists.return_value = False
 
         req = EvaluateDTO(
             feature="feature",
@@ -117,7 +132,7 @@ class TestFeatureService(unittest.TestCase):
     def test_evaluate_rollout_not_expired(self):
         future_time = (datetime.now(timezone.utc) + timedelta(minutes=5)).isoformat()
 
-        self.repo.get_feature_items.return_value = [{"SK": "META"}]
+        self.repo.feature_exists.return_value = True
         self.repo.get_env.return_value = {
             "enabled": False,
             "rollout_end_at": future_time,
@@ -136,7 +151,7 @@ class TestFeatureService(unittest.TestCase):
         self.repo.put_env.assert_not_called()
     
     def test_evaluate_no_rollout(self):
-        self.repo.get_feature_items.return_value = [{"SK": "META"}]
+        self.repo.feature_exists.return_value = True
         self.repo.get_env.return_value = {
             "enabled": True,
             "rollout_end_at": None,
@@ -156,7 +171,7 @@ class TestFeatureService(unittest.TestCase):
     def test_evaluate_rollout_expired_already_enabled(self):
         past_time = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat()
 
-        self.repo.get_feature_items.return_value = [{"SK": "META"}]
+        self.repo.feature_exists.return_value = True
         self.repo.get_env.return_value = {
             "enabled": True,
             "rollout_end_at": past_time,
@@ -198,7 +213,7 @@ class TestFeatureService(unittest.TestCase):
         self.repo.put_env.assert_called_once()
         mock_audit.assert_called_once()
     def test_evaluate_env_not_found(self):
-        self.repo.get_feature_items.return_value = [{"SK": "META"}]
+        self.repo.feature_exists.return_value = True
         self.repo.get_env.return_value = None
 
         req = EvaluateDTO(
@@ -218,6 +233,7 @@ class TestFeatureService(unittest.TestCase):
 
         self.service.delete_feature("feature", actor="admin")
 
+        self.repo.get_feature_items.assert_called_once_with("feature")
         self.repo.delete_feature.assert_called_once_with("feature")
         mock_audit.assert_called_once()
  
@@ -248,7 +264,7 @@ class TestFeatureService(unittest.TestCase):
             self.service.update_env("feature", "dev", req, actor="admin")
     
     def test_evaluate_env_not_found(self):
-        self.repo.get_feature_items.return_value = [{"SK": "META"}]
+        self.repo.feature_exists.return_value = True
         self.repo.get_env.return_value = None
 
         req = EvaluateDTO(
@@ -287,8 +303,8 @@ class TestFeatureService(unittest.TestCase):
 
         self.repo.list_features.assert_called_once()
         self.assertEqual(len(result), 2)
-        self.assertEqual(result[0].name, "f1")
-        self.assertEqual(result[1].name, "f2")
+        self.assertEqual(result[0]["name"], "f1")
+        self.assertEqual(result[1]["name"], "f2")
 
     
     def test_list_features_empty(self):
@@ -310,4 +326,560 @@ class TestFeatureService(unittest.TestCase):
         self.assertEqual(result, [])
         mock_mapper.assert_not_called()
 
-            
+    def test_evaluate_served_from_snapshot(self):
+        reader = MagicMock()
+        reader.get.return_value = FlagState(enabled=True)
+        service = FeatureService(self.repo, snapshot_reader=reader)
+
+        req = EvaluateDTO(feature="Feature", environment=Environment.DEV)
+
+        self.assertTrue(service.evaluate(req))
+        reader.get.assert_called_once_with("feature", "dev")
+        self.repo.feature_exists.assert_not_called()
+
+    def test_evaluate_snapshot_miss_reads_repository(self):
+        reader = MagicMock()
+        reader.get.return_value = None
+        service = FeatureService(self.repo, snapshot_reader=reader)
+        self.repo.feature_exists.return_value = True
+        self.repo.get_env.return_value = {
+            "enabled": False,
+            "rollout_end_at": None,
+            "environment": "dev",
+        }
+
+        req = EvaluateDTO(feature="feature", environment=Environment.DEV)
+
+        self.assertFalse(service.evaluate(req))
+        self.repo.get_env.assert_called_once_with("feature", "dev")
+
+    def test_evaluate_serves_last_known_good_on_backend_error(self):
+        last_known_good = Snapshot(
+            version=1,
+            generated_at=0,
+            flags={"dev": {"feature": FlagState(enabled=True)}},
+        )
+        service = FeatureService(self.repo, last_known_good=last_known_good)
+        self.repo.feature_exists.side_effect = ClientError(
+            error_response={"Error": {"Code": "ProvisionedThroughputExceededException"}},
+            operation_name="Query",
+        )
+
+        req = EvaluateDTO(feature="feature", environment=Environment.DEV)
+
+        self.assertTrue(service.evaluate(req))
+
+    def test_evaluate_backend_error_without_last_known_good(self):
+        service = FeatureService(
+            self.repo,
+            last_known_good=Snapshot(version=0, generated_at=0),
+        )
+        self.repo.feature_exists.side_effect = ClientError(
+            error_response={"Error": {"Code": "InternalServerError"}},
+            operation_name="Query",
+        )
+
+        req = EvaluateDTO(feature="feature", environment=Environment.DEV)
+
+        with self.assertRaises(ClientError):
+            service.evaluate(req)
+
+    def test_evaluate_fresh_bootstrap_skips_repository(self):
+        bootstrap = Snapshot(
+            version=1,
+            generated_at=now_ms(),
+            flags={"dev": {"feature": FlagState(enabled=False)}},
+        )
+        service = FeatureService(
+            self.repo,
+            last_known_good=bootstrap,
+            last_known_good_max_age=60_000,
+        )
+
+        req = EvaluateDTO(feature="feature", environment=Environment.DEV)
+
+        self.assertFalse(service.evaluate(req))
+        self.repo.feature_exists.assert_not_called()
+
+    def test_evaluate_remembers_last_known_good(self):
+        last_known_good = Snapshot(version=0, generated_at=0)
+        service = FeatureService(self.repo, last_known_good=last_known_good)
+        self.repo.feature_exists.return_value = True
+        self.repo.get_env.return_value = {
+            "enabled": True,
+            "rollout_end_at": None,
+            "environment": "dev",
+        }
+
+        service.evaluate(EvaluateDTO(feature="feature", environment=Environment.DEV))
+
+        self.assertEqual(last_known_good.get("feature", "dev"), FlagState(enabled=True))
+
+    def test_evaluate_uses_flag_cache(self):
+        cache = StaleWhileRevalidateCache(
+            "flags", ttl=60, max_stale=60, metrics=MetricsRegistry()
+        )
+        service = FeatureService(self.repo, flag_cache=cache)
+        self.repo.feature_exists.return_value = True
+        self.repo.get_env.return_value = {
+            "enabled": True,
+            "rollout_end_at": None,
+            "environment": "dev",
+        }
+        req = EvaluateDTO(feature="feature", environment=Environment.DEV)
+
+        self.assertTrue(service.evaluate(req))
+        self.assertTrue(service.evaluate(req))
+
+        self.repo.get_env.assert_called_once()
+
+    @patch("services.feature_service.publish_audit")
+    def test_update_env_invalidates_flag_cache(self, mock_audit):
+        cache = MagicMock()
+        service = FeatureService(self.repo, flag_cache=cache)
+        self.repo.get_env.return_value = {"environment": "dev", "enabled": False}
+
+        service.update_env(
+            "feature", "dev", UpdateFeatureEnvDTO(enabled=True), actor="admin"
+        )
+
+        cache.invalidate.assert_called_once_with(("feature", "dev"))
+
+    def test_evaluate_open_breaker_serves_last_known_good(self):
+        breaker = CircuitBreaker(
+            "store",
+            failure_threshold=1,
+            failure_exceptions=(ClientError,),
+            metrics=MetricsRegistry(),
+        )
+        last_known_good = Snapshot(
+            version=1,
+            generated_at=0,
+            flags={"dev": {"feature": FlagState(enabled=True)}},
+        )
+        service = FeatureService(
+            self.repo,
+            last_known_good=last_known_good,
+            circuit_breaker=breaker,
+        )
+        self.repo.feature_exists.side_effect = ClientError(
+            error_response={"Error": {"Code": "ThrottlingException"}},
+            operation_name="Query",
+        )
+        req = EvaluateDTO(feature="feature", environment=Environment.DEV)
+
+        self.assertTrue(service.evaluate(req))
+        self.assertTrue(service.evaluate(req))
+
+        self.repo.feature_exists.assert_called_once()
+
+    def test_evaluate_reads_single_effective_state_item(self):
+        self.repo.get_effective_state.return_value = {
+            "enabled": True,
+            "enable_at": None,
+        }
+
+        req = EvaluateDTO(feature="Feature", environment=Environment.DEV)
+
+        self.assertTrue(self.service.evaluate(req))
+        self.repo.get_effective_state.assert_called_once_with("feature", "dev")
+        self.repo.feature_exists.assert_not_called()
+        self.repo.get_env.assert_not_called()
+
+    def test_evaluate_effective_state_future_rollout(self):
+        future = now_ms() + 60_000
+        self.repo.get_effective_state.return_value = {
+            "enabled": False,
+            "enable_at": future,
+        }
+
+        req = EvaluateDTO(feature="feature", environment=Environment.DEV)
+
+        self.assertFalse(self.service.evaluate(req))
+        self.repo.put_env.assert_not_called()
+
+    @patch("services.feature_service.publish_audit")
+    def test_evaluate_effective_state_expired_rollout(self, mock_audit):
+        self.repo.get_effective_state.return_value = {
+            "enabled": False,
+            "enable_at": now_ms() - 1000,
+        }
+        env_item = {
+            "environment": "dev",
+            "enabled": False,
+            "rollout_end_at": (
+                datetime.now(timezone.utc) - timedelta(seconds=1)
+            ).isoformat(),
+        }
+        self.repo.get_env.return_value = env_item
+
+        req = EvaluateDTO(feature="feature", environment=Environment.DEV)
+
+        self.assertTrue(self.service.evaluate(req))
+        self.repo.complete_rollout.assert_called_once_with("feature", "dev", env_item)
+        mock_audit.assert_called_once()
+
+    @patch("services.feature_service.publish_audit")
+    def test_evaluate_rollout_lost_race_is_not_audited(self, mock_audit):
+        self.repo.feature_exists.return_value = True
+        self.repo.get_env.return_value = {
+            "environment": "dev",
+            "enabled": False,
+            "rollout_end_at": (
+                datetime.now(timezone.utc) - timedelta(seconds=1)
+            ).isoformat(),
+        }
+        self.repo.complete_rollout.return_value = False
+
+        req = EvaluateDTO(feature="feature", environment=Environment.DEV)
+
+        self.assertTrue(self.service.evaluate(req))
+        mock_audit.assert_not_called()
+
+    @patch("services.feature_service.publish_audit")
+    def test_snapshot_expired_rollout_is_persisted_once(self, mock_audit):
+        reader = MagicMock()
+        reader.get.return_value = FlagState(
+            enabled=False, rollout_end_at=now_ms() - 1000
+        )
+        reader.prerequisite_chain.return_value = None
+        self.repo.get_env.return_value = {
+            "environment": "dev",
+            "enabled": False,
+            "rollout_end_at": (
+                datetime.now(timezone.utc) - timedelta(seconds=1)
+            ).isoformat(),
+        }
+        service = FeatureService(
+            self.repo, snapshot_reader=reader, completed_rollouts=LRUSet(10)
+        )
+
+        req = EvaluateDTO(feature="feature", environment=Environment.DEV)
+
+        self.assertTrue(service.evaluate(req))
+        self.assertTrue(service.evaluate(req))
+        self.repo.complete_rollout.assert_called_once()
+        mock_audit.assert_called_once()
+
+    @patch("services.feature_service.publish_audit")
+    def test_snapshot_rollout_write_failure_is_retried(self, mock_audit):
+        reader = MagicMock()
+        reader.get.return_value = FlagState(
+            enabled=False, rollout_end_at=now_ms() - 1000
+        )
+        reader.prerequisite_chain.return_value = None
+        self.repo.get_env.side_effect = ClientError(
+            {"Error": {"Code": "ProvisionedThroughputExceededException"}}, "GetItem"
+        )
+        service = FeatureService(
+            self.repo, snapshot_reader=reader, completed_rollouts=LRUSet(10)
+        )
+
+        req = EvaluateDTO(feature="feature", environment=Environment.DEV)
+
+        self.assertTrue(service.evaluate(req))
+        self.assertTrue(service.evaluate(req))
+        self.assertEqual(self.repo.get_env.call_count, 2)
+        mock_audit.assert_not_called()
+
+    def test_evaluate_missing_effective_state_is_backfilled(self):
+        self.repo.feature_exists.return_value = True
+        self.repo.get_env.return_value = {
+            "enabled": True,
+            "rollout_end_at": None,
+            "environment": "dev",
+        }
+
+        req = EvaluateDTO(feature="feature", environment=Environment.DEV)
+
+        self.assertTrue(self.service.evaluate(req))
+        self.repo.put_effective_state.assert_called_once_with(
+            "feature", "dev", True, None, None, None
+        )
+
+    def test_materialize_keeps_state_written_by_concurrent_update(self):
+        self.repo.feature_exists.return_value = True
+        self.repo.get_env.return_value = {"enabled": True, "environment": "dev"}
+        self.repo.put_effective_state.return_value = False
+        self.repo.get_effective_state.side_effect = [
+            None,
+            {"enabled": False, "enable_at": None},
+        ]
+
+        req = EvaluateDTO(feature="feature", environment=Environment.DEV)
+
+        self.assertFalse(self.service.evaluate(req))
+
+    def test_materialize_for_deleted_env_is_not_found(self):
+        self.repo.feature_exists.return_value = True
+        self.repo.get_env.return_value = {"enabled": True, "environment": "dev"}
+        self.repo.put_effective_state.side_effect = EnvironmentNotFoundException("feature", "dev")
+
+        with self.assertRaises(EnvironmentNotFoundException):
+            self.service.evaluate(EvaluateDTO(feature="feature", environment=Environment.DEV))
+
+    def _bulk_request(self, count):
+        return BulkUpdateEnvDTO(changes=[
+            {"feature": f"Feature{i}", "environment": "DEV", "enabled": True}
+            for i in range(count)
+        ])
+
+    @patch("services.feature_service.publish_audits")
+    def test_bulk_update_envs_chunks_transactions(self, mock_audits):
+        self.repo.ENV_CHANGES_PER_TRANSACTION = 50
+        self.repo.batch_get_envs.return_value = {
+            (f"feature{i}", "dev"): {"environment": "dev", "enabled": False}
+            for i in range(60)
+        }
+
+        result = self.service.bulk_update_envs(self._bulk_request(60), actor="ADMIN")
+
+        self.assertEqual(result["updated"], 60)
+        self.assertEqual(result["failed"], 0)
+        self.assertEqual(result["audit_failures"], 0)
+        self.assertEqual(
+            [len(chunk["applied"]) for chunk in result["chunks"]], [50, 10]
+        )
+        self.repo.batch_get_envs.assert_called_once_with(
+            [(f"feature{i}", "dev") for i in range(60)]
+        )
+        chunks = [c.args[0] for c in self.repo.put_envs.call_args_list]
+        self.assertEqual([len(chunk) for chunk in chunks], [50, 10])
+        self.assertEqual(chunks[0][0], ("feature0", "dev", True, None, None, None))
+        self.assertEqual(mock_audits.call_count, 2)
+        audit = mock_audits.call_args_list[0].args[0][0]
+        self.assertEqual(audit["old"]["enabled"], False)
+        self.assertEqual(audit["new"]["enabled"], True)
+
+    @patch("services.feature_service.publish_audits")
+    def test_bulk_update_envs_missing_env_writes_nothing(self, mock_audits):
+        self.repo.ENV_CHANGES_PER_TRANSACTION = 50
+        self.repo.batch_get_envs.return_value = {
+            ("feature0", "dev"): {"environment": "dev", "enabled": False}
+        }
+
+        with self.assertRaises(EnvironmentNotFoundException):
+            self.service.bulk_update_envs(self._bulk_request(2), actor="ADMIN")
+
+        self.repo.put_envs.assert_not_called()
+        mock_audits.assert_not_called()
+
+    @patch("services.feature_service.publish_audits")
+    def test_bulk_update_envs_failed_chunk_does_not_stop_later_chunks(self, mock_audits):
+        self.repo.ENV_CHANGES_PER_TRANSACTION = 2
+        self.repo.batch_get_envs.return_value = {
+            (f"feature{i}", "dev"): {"environment": "dev", "enabled": False}
+            for i in range(4)
+        }
+        self.repo.put_envs.side_effect = [
+            EnvironmentNotFoundException("feature1", "dev"),
+            None,
+        ]
+
+        result = self.service.bulk_update_envs(self._bulk_request(4), actor="ADMIN")
+
+        self.assertEqual(self.repo.put_envs.call_count, 2)
+        self.assertEqual(result["updated"], 2)
+        self.assertEqual(result["failed"], 2)
+        first, second = result["chunks"]
+        self.assertEqual(first["applied"], [])
+        self.assertEqual(
+            first["failed"],
+            [
+                {"feature": "feature0", "environment": "dev"},
+                {"feature": "feature1", "environment": "dev"},
+            ],
+        )
+        self.assertIn("feature1", first["error"])
+        self.assertEqual(
+            second["applied"],
+            [
+                {"feature": "feature2", "environment": "dev"},
+                {"feature": "feature3", "environment": "dev"},
+            ],
+        )
+        mock_audits.assert_called_once()
+
+    @patch("services.feature_service.publish_audits")
+    def test_bulk_update_envs_counts_audit_failures(self, mock_audits):
+        self.repo.ENV_CHANGES_PER_TRANSACTION = 2
+        self.repo.batch_get_envs.return_value = {
+            (f"feature{i}", "dev"): {"environment": "dev", "enabled": False}
+            for i in range(4)
+        }
+        mock_audits.side_effect = [RuntimeError("Failed to publish 2 audit events"), None]
+
+        result = self.service.bulk_update_envs(self._bulk_request(4), actor="ADMIN")
+
+        self.assertEqual(self.repo.put_envs.call_count, 2)
+        self.assertEqual(result["updated"], 4)
+        self.assertEqual(result["audit_failures"], 2)
+
+    def test_bulk_update_envs_rejects_duplicates(self):
+        request = BulkUpdateEnvDTO(changes=[
+            {"feature": "f", "environment": "dev", "enabled": True},
+            {"feature": "F", "environment": "DEV", "enabled": False},
+        ])
+
+        with self.assertRaises(ValidationException):
+            self.service.bulk_update_envs(request, actor="ADMIN")
+
+        self.repo.batch_get_envs.assert_not_called()
+
+    def test_evaluate_variant_assigns_sticky_variant(self):
+        self.repo.get_effective_state.return_value = {
+            "enabled": True,
+            "enable_at": None,
+            "variants": [
+                {"name": "control", "weight": 1, "payload": "null"},
+                {"name": "blue", "weight": 1, "payload": '{"color":"#00f"}'},
+            ],
+        }
+        req = EvaluateDTO(
+            feature="Checkout", environment=Environment.DEV, context={"user_id": "u-1"}
+        )
+
+        enabled, variant = self.service.evaluate_variant(req)
+
+        self.assertTrue(enabled)
+        self.assertIn(variant.name, ("control", "blue"))
+        self.assertEqual(self.service.evaluate_variant(req), (True, variant))
+        self.assertTrue(self.service.evaluate(req))
+
+    def test_evaluate_variant_disabled_or_boolean_has_no_variant(self):
+        self.repo.get_effective_state.return_value = {
+            "enabled": False,
+            "enable_at": None,
+            "variants": [{"name": "control", "weight": 1, "payload": "null"}],
+        }
+        req = EvaluateDTO(feature="checkout", environment=Environment.DEV)
+
+        self.assertEqual(self.service.evaluate_variant(req), (False, None))
+
+        self.repo.get_effective_state.return_value = {"enabled": True, "enable_at": None}
+        self.assertEqual(self.service.evaluate_variant(req), (True, None))
+
+    def test_evaluate_variant_reads_snapshot_variants(self):
+        reader = MagicMock()
+        reader.get.return_value = FlagState(
+            enabled=True, variants=(Variant(name="only", weight=1, payload="1"),)
+        )
+        service = FeatureService(self.repo, snapshot_reader=reader)
+
+        enabled, variant = service.evaluate_variant(
+            EvaluateDTO(feature="checkout", environment=Environment.DEV)
+        )
+
+        self.assertEqual((enabled, variant.name), (True, "only"))
+        self.repo.get_effective_state.assert_not_called()
+
+    @patch("services.feature_service.publish_audit")
+    def test_update_env_stores_serialized_variants(self, mock_audit):
+        self.repo.get_env.return_value = {"environment": "dev", "enabled": False}
+        req = UpdateFeatureEnvDTO(
+            enabled=True,
+            variants=[{"name": "blue", "weight": 100, "payload": {"color": "#00f"}}],
+        )
+
+        self.service.update_env("feature", "dev", req, actor="admin")
+
+        variants = [{"name": "blue", "weight": 100, "payload": '{"color":"#00f"}'}]
+        self.assertEqual(self.repo.put_env.call_args.kwargs["variants"], variants)
+        self.assertEqual(mock_audit.call_args.kwargs["new"]["variants"], variants)
+
+    def _effective_states(self, states):
+        self.repo.get_effective_state.side_effect = lambda feature, env: states.get(feature)
+
+    def test_evaluate_requires_prerequisites(self):
+        states = {
+            "checkout": {"enabled": True, "enable_at": None, "prerequisites": ["payments"]},
+            "payments": {"enabled": False, "enable_at": None},
+        }
+        self._effective_states(states)
+        req = EvaluateDTO(feature="checkout", environment=Environment.DEV)
+
+        self.assertFalse(self.service.evaluate(req))
+        self.assertEqual(self.service.evaluate_variant(req), (False, None))
+
+        states["payments"] = {"enabled": True, "enable_at": None}
+        self.assertTrue(self.service.evaluate(req))
+
+    def test_evaluate_treats_missing_prerequisite_as_off(self):
+        self._effective_states({
+            "checkout": {"enabled": True, "enable_at": None, "prerequisites": ["gone"]},
+        })
+        self.repo.feature_exists.return_value = False
+
+        req = EvaluateDTO(feature="checkout", environment=Environment.DEV)
+
+        self.assertFalse(self.service.evaluate(req))
+
+    def test_evaluate_walks_precomputed_snapshot_chain(self):
+        states = {
+            "beta": FlagState(enabled=True),
+            "checkout": FlagState(enabled=True, prerequisites=("beta",)),
+        }
+        reader = MagicMock()
+        reader.get.side_effect = lambda feature, env: states.get(feature)
+        reader.prerequisite_chain.return_value = ("beta", "checkout")
+        service = FeatureService(self.repo, snapshot_reader=reader)
+
+        self.assertTrue(
+            service.evaluate(EvaluateDTO(feature="checkout", environment=Environment.DEV))
+        )
+        reader.prerequisite_chain.assert_called_once_with("checkout", "dev")
+        self.repo.get_effective_state.assert_not_called()
+
+    @patch("services.feature_service.publish_audit")
+    def test_update_env_stores_prerequisites(self, mock_audit):
+        self.repo.get_env.return_value = {"environment": "dev", "enabled": False}
+        self.repo.batch_get_envs.side_effect = [
+            {("payments", "dev"): {"prerequisites": ["beta"]}},
+            {("beta", "dev"): {}},
+        ]
+        req = UpdateFeatureEnvDTO(enabled=True, prerequisites=["Payments"])
+
+        self.service.update_env("checkout", "dev", req, actor="admin")
+
+        self.assertEqual(self.repo.put_env.call_args.kwargs["prerequisites"], ["payments"])
+        self.assertEqual(mock_audit.call_args.kwargs["new"]["prerequisites"], ["payments"])
+
+    def test_update_env_rejects_prerequisite_cycle(self):
+        self.repo.get_env.return_value = {"environment": "dev", "enabled": False}
+        self.repo.batch_get_envs.return_value = {
+            ("payments", "dev"): {"prerequisites": ["checkout"]},
+        }
+        req = UpdateFeatureEnvDTO(enabled=True, prerequisites=["payments"])
+
+        with self.assertRaises(ValidationException) as error:
+            self.service.update_env("checkout", "dev", req, actor="admin")
+
+        self.assertIn("checkout -> payments -> checkout", str(error.exception.message))
+        self.repo.put_env.assert_not_called()
+
+    def test_update_env_rejects_unknown_prerequisite(self):
+        self.repo.get_env.return_value = {"environment": "dev", "enabled": False}
+        self.repo.batch_get_envs.return_value = {}
+        req = UpdateFeatureEnvDTO(enabled=True, prerequisites=["payments"])
+
+        with self.assertRaises(ValidationException):
+            self.service.update_env("checkout", "dev", req, actor="admin")
+
+        self.repo.put_env.assert_not_called()
+
+    def test_bulk_update_checks_prerequisites_against_pending_changes(self):
+        request = BulkUpdateEnvDTO(changes=[
+            {"feature": "checkout", "environment": "dev", "enabled": True,
+             "prerequisites": ["payments"]},
+            {"feature": "payments", "environment": "dev", "enabled": True,
+             "prerequisites": ["checkout"]},
+        ])
+        self.repo.batch_get_envs.return_value = {
+            ("checkout", "dev"): {"environment": "dev", "enabled": False},
+            ("payments", "dev"): {"environment": "dev", "enabled": False},
+        }
+
+        with self.assertRaises(ValidationException):
+            self.service.bulk_update_envs(request, actor="ADMIN")
+
+        self.repo.put_envs.assert_not_called()
@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import MagicMock
+
+from dto.auth_dto import CreateSDKKeyDTO
+from error_handling.exceptions import UnauthorizedException
+from infra.local.dynamodb import InMemoryDynamoDB
+from repository.sdk_key_repository import SDKKeyRepository
+from services.sdk_key_service import SDKKeyService
+from utils.metrics import MetricsRegistry
+from utils.swr_cache import StaleWhileRevalidateCache
+
+
+class TestSDKKeyService(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = MagicMock()
+        self.service = SDKKeyService(self.repo, pepper="pepper")
+
+        created = self.service.create_key(
+            CreateSDKKeyDTO(environment="prod", name="checkout-api"),
+            actor="admin@example.com",
+        )
+        self.raw_key = created["sdk_key"]
+        stored = self.repo.create_key.call_args.kwargs
+        self.repo.get_key.return_value = {
+            "environment": stored["environment"],
+            "secret_hash": stored["secret_hash"],
+            "key_version": 1,
+        }
+
+    def test_create_key_stores_only_keyed_hash(self):
+        stored = self.repo.create_key.call_args.kwargs
+
+        self.assertTrue(self.raw_key.startswith(f"ffsdk_{stored['key_id']}_1_"))
+        self.assertNotIn(self.raw_key.split("_", 3)[3], stored["secret_hash"])
+        self.assertEqual(len(stored["secret_hash"]), 64)
+
+    def test_authenticate_returns_environment_scope(self):
+        principal = self.service.authenticate(self.raw_key)
+
+        self.assertEqual(principal["role"], "SDK")
+        self.assertEqual(principal["environment"], "prod")
+
+    def test_authenticate_rejects_wrong_secret_and_malformed_keys(self):
+        for raw_key in (self.raw_key + "x", "ffsdk_abc", "Bearer token"):
+            with self.assertRaises(UnauthorizedException):
+                self.service.authenticate(raw_key)
+
+    def test_authenticate_rejects_revoked_version(self):
+        self.repo.get_key.return_value["key_version"] = 2
+
+        with self.assertRaises(UnauthorizedException):
+            self.service.authenticate(self.raw_key)
+
+    def test_revoked_key_with_edited_version_is_rejected(self):
+        self.repo.get_key.return_value["key_version"] = 2
+        key_id = self.repo.create_key.call_args.kwargs["key_id"]
+
+        with self.assertRaises(UnauthorizedException):
+            self.service.authenticate(self.raw_key.replace(f"_{key_id}_1_", f"_{key_id}_2_", 1))
+
+    def test_revoke_invalidates_key_against_table(self):
+        service = SDKKeyService(
+            SDKKeyRepository(InMemoryDynamoDB().Table("sdk-keys")), pepper="pepper"
+        )
+        created = service.create_key(
+            CreateSDKKeyDTO(environment="prod", name="checkout-api"),
+            actor="admin@example.com",
+        )
+        raw_key, key_id = created["sdk_key"], created["key_id"]
+        self.assertEqual(service.authenticate(raw_key)["environment"], "prod")
+
+        service.revoke_key(key_id)
+
+        for candidate in (raw_key, raw_key.replace(f"_{key_id}_1_", f"_{key_id}_2_", 1)):
+            with self.assertRaises(UnauthorizedException):
+                service.authenticate(candidate)
+
+    def test_cached_key_skips_repository(self):
+        service = SDKKeyService(
+            self.repo,
+            pepper="pepper",
+            cache=StaleWhileRevalidateCache(
+                "sdk_key_cache", ttl=60, max_stale=0, metrics=MetricsRegistry()
+            ),
+        )
+
+        service.authenticate(self.raw_key)
+        service.authenticate(self.raw_key)
+
+        self.repo.get_key.assert_called_once()
+
+    def test_revoke_key_bumps_version(self):
+        self.repo.bump_version.return_value = 2
+
+        self.assertEqual(self.service.revoke_key("abc"), {"key_id": "abc", "version": 2})
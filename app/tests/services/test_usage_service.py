@@ -0,0 +1,66 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from error_handling.exceptions import NotFoundException, ValidationException
+from services.usage_service import UsageService
+from utils.hyperloglog import HyperLogLog
+
+
+def sketch(*users):
+    result = HyperLogLog()
+    for user in users:
+        result.add(user)
+    return result
+
+
+class TestUsageService(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_repo = MagicMock()
+        self.service = UsageService(self.mock_repo)
+
+    def test_unique_users_per_day_and_merged_totals(self):
+        self.mock_repo.get_unique_user_sketches.return_value = [
+            ("2026-01-01", "prod", {"on": sketch("a", "b"), "off": sketch("c")}),
+            ("2026-01-02", "prod", {"on": sketch("b", "d")}),
+            ("2026-01-02", "dev", {"on": sketch("x")}),
+        ]
+
+        result = self.service.get_unique_users("Beta", 7)
+
+        self.assertEqual(result["feature"], "beta")
+        self.assertEqual(result["days"][0]["unique_users"], {"on": 2, "off": 1})
+        self.assertEqual(result["totals"], {"prod": {"on": 3, "off": 1}, "dev": {"on": 1}})
+
+        expected_since = (datetime.now(timezone.utc) - timedelta(days=6)).strftime("%Y-%m-%d")
+        self.mock_repo.get_unique_user_sketches.assert_called_once_with("Beta", expected_since)
+
+    def test_environment_filter(self):
+        self.mock_repo.get_unique_user_sketches.return_value = [
+            ("2026-01-01", "prod", {"on": sketch("a")}),
+            ("2026-01-01", "dev", {"on": sketch("b")}),
+        ]
+
+        result = self.service.get_unique_users("beta", 1, "dev")
+
+        self.assertEqual([day["environment"] for day in result["days"]], ["dev"])
+        self.assertEqual(list(result["totals"]), ["dev"])
+
+    def test_days_out_of_range(self):
+        with self.assertRaises(ValidationException):
+            self.service.get_unique_users("beta", 0)
+        with self.assertRaises(ValidationException):
+            self.service.get_unique_users("beta", 91)
+
+    def test_stale_flag_report(self):
+        self.mock_repo.get_report.return_value = {"entries": []}
+
+        self.assertEqual(self.service.get_stale_flag_report(), {"entries": []})
+        self.mock_repo.get_report.assert_called_once_with("stale-flags")
+
+    def test_stale_flag_report_missing(self):
+        self.mock_repo.get_report.return_value = None
+
+        with self.assertRaises(NotFoundException):
+            self.service.get_stale_flag_report()
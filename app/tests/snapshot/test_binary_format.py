@@ -0,0 +1,200 @@
+import zlib
+
+import pytest
+
+from snapshot.binary_format import (
+    ENV_ENTRY_V1,
+    ENV_ENTRY_V2,
+    HEADER,
+    MAGIC,
+    STRING_ENTRY,
+    SnapshotFormatError,
+    SnapshotView,
+    decode,
+    encode,
+)
+from snapshot.model import FlagState, Snapshot, Variant, build_snapshot, to_epoch_ms
+
+
+def make_snapshot():
+    return Snapshot(
+        version=7,
+        generated_at=1_700_000_000_000,
+        flags={
+            "dev": {
+                "beta": FlagState(enabled=True),
+                "checkout": FlagState(enabled=False, rollout_end_at=1_800_000_000_000),
+            },
+            "prod": {
+                "beta": FlagState(enabled=False),
+            },
+        },
+    )
+
+
+def test_encode_decode_round_trip():
+    snapshot = make_snapshot()
+
+    decoded = decode(encode(snapshot))
+
+    assert decoded.version == 7
+    assert decoded.generated_at == 1_700_000_000_000
+    assert decoded.flags == snapshot.flags
+
+
+def test_lookup_reads_single_flag():
+    view = SnapshotView(encode(make_snapshot()))
+
+    assert view.lookup("beta", "dev") == FlagState(enabled=True)
+    assert view.lookup("checkout", "dev").rollout_end_at == 1_800_000_000_000
+    assert view.lookup("checkout", "prod") is None
+    assert view.lookup("missing", "dev") is None
+    assert view.lookup("beta", "qa") is None
+
+
+def test_lookup_with_many_features():
+    flags = {f"flag-{i:04d}": FlagState(enabled=i % 3 == 0) for i in range(500)}
+    view = SnapshotView(encode(Snapshot(version=1, generated_at=1, flags={"dev": flags})))
+
+    for name, state in flags.items():
+        assert view.lookup(name, "dev") == state
+
+
+def test_corrupted_payload_fails_checksum():
+    data = bytearray(encode(make_snapshot()))
+    data[-1] ^= 0xFF
+
+    with pytest.raises(SnapshotFormatError, match="checksum"):
+        SnapshotView(bytes(data))
+
+
+def test_rejects_unknown_magic():
+    with pytest.raises(SnapshotFormatError):
+        SnapshotView(b"\x00" * 64)
+
+
+def test_build_snapshot_from_repository_items():
+    items = [
+        {"PK": "FEATURE#beta", "SK": "META"},
+        {"PK": "FEATURE#beta", "SK": "ENV#dev", "enabled": True, "rollout_end_at": None},
+        {
+            "PK": "FEATURE#beta",
+            "SK": "ENV#prod",
+            "enabled": False,
+            "rollout_end_at": "2030-01-01T00:00:00Z",
+        },
+        {"PK": "FEATURE#orphan", "SK": "ENV#dev", "enabled": True},
+    ]
+
+    snapshot = build_snapshot(items, version=3)
+
+    assert snapshot.version == 3
+    assert snapshot.get("beta", "dev") == FlagState(enabled=True)
+    assert snapshot.get("beta", "prod").rollout_end_at == to_epoch_ms("2030-01-01T00:00:00Z")
+    assert snapshot.get("orphan", "dev") is None
+
+
+def test_flag_state_rollout():
+    state = FlagState(enabled=False, rollout_end_at=1000)
+
+    assert state.is_enabled(999) is False
+    assert state.is_enabled(1000) is True
+
+
+def test_variants_round_trip_with_pre_serialized_payloads():
+    variants = (
+        Variant(name="control", weight=50, payload="null"),
+        Variant(name="blue", weight=50, payload='{"color":"#00f","sizes":[1,2]}'),
+    )
+    flags = {f"flag-{i:02d}": FlagState(enabled=True) for i in range(20)}
+    flags["flag-07"] = FlagState(enabled=True, variants=variants)
+    flags["flag-13"] = FlagState(enabled=False, variants=variants[:1])
+    snapshot = Snapshot(version=1, generated_at=1, flags={"dev": flags})
+
+    view = SnapshotView(encode(snapshot))
+
+    assert view.lookup("flag-07", "dev").variants == variants
+    assert view.lookup("flag-13", "dev").variants == variants[:1]
+    assert view.lookup("flag-08", "dev").variants == ()
+    assert decode(encode(snapshot)).flags == snapshot.flags
+
+
+def test_reads_version_1_snapshots():
+    strings_offset = HEADER.size + 2 * STRING_ENTRY.size
+    envs_offset = strings_offset + len(b"betadev")
+    data_offset = envs_offset + ENV_ENTRY_V1.size
+    payload = (
+        STRING_ENTRY.pack(0, 4)
+        + STRING_ENTRY.pack(4, 3)
+        + b"betadev"
+        + ENV_ENTRY_V1.pack(1, data_offset, data_offset + 1, data_offset + 2, 0)
+        + bytes([1, 1])
+    )
+    header = HEADER.pack(MAGIC, 1, 0, 4, 5, 1, 1, strings_offset, envs_offset, zlib.crc32(payload))
+
+    view = SnapshotView(header + payload)
+
+    assert view.lookup("beta", "dev") == FlagState(enabled=True)
+
+
+def test_reads_version_2_snapshots_without_prerequisites():
+    strings_offset = HEADER.size + 2 * STRING_ENTRY.size
+    envs_offset = strings_offset + len(b"betadev")
+    data_offset = envs_offset + ENV_ENTRY_V2.size
+    payload = (
+        STRING_ENTRY.pack(0, 4)
+        + STRING_ENTRY.pack(4, 3)
+        + b"betadev"
+        + ENV_ENTRY_V2.pack(1, data_offset, data_offset + 1, data_offset + 2, 0, data_offset + 2, 0)
+        + bytes([1, 1])
+    )
+    header = HEADER.pack(MAGIC, 2, 0, 4, 5, 1, 1, strings_offset, envs_offset, zlib.crc32(payload))
+
+    view = SnapshotView(header + payload)
+
+    assert view.lookup("beta", "dev") == FlagState(enabled=True)
+    assert view.prerequisite_chain("beta", "dev") is None
+
+
+def test_prerequisites_round_trip_and_chains_are_precomputed():
+    snapshot = Snapshot(
+        version=1,
+        generated_at=1,
+        flags={
+            "dev": {
+                "beta": FlagState(enabled=True),
+                "payments": FlagState(enabled=True, prerequisites=("beta",)),
+                "checkout": FlagState(enabled=True, prerequisites=("payments", "removed")),
+            },
+            "prod": {
+                "checkout": FlagState(enabled=True),
+            },
+        },
+    )
+
+    view = SnapshotView(encode(snapshot))
+
+    assert view.lookup("checkout", "dev").prerequisites == ("payments", "removed")
+    assert view.prerequisite_chain("payments", "dev") == ("beta", "payments")
+    assert view.prerequisite_chain("checkout", "dev")[-1] == "checkout"
+    assert set(view.prerequisite_chain("checkout", "dev")) == {
+        "beta", "payments", "removed", "checkout"
+    }
+    assert view.prerequisite_chain("checkout", "prod") is None
+    assert decode(encode(snapshot)).flags == snapshot.flags
+
+
+def test_build_snapshot_keeps_variants():
+    items = [
+        {"PK": "FEATURE#beta", "SK": "META"},
+        {
+            "PK": "FEATURE#beta",
+            "SK": "ENV#dev",
+            "enabled": True,
+            "variants": [{"name": "a", "weight": 1, "payload": '"x"'}],
+        },
+    ]
+
+    snapshot = build_snapshot(items)
+
+    assert snapshot.get("beta", "dev").variants == (Variant(name="a", weight=1, payload='"x"'),)
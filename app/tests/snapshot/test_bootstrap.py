@@ -0,0 +1,38 @@
+from snapshot import binary_format, json_format
+from snapshot.bootstrap import load_bootstrap
+from snapshot.model import FlagState, Snapshot
+
+
+SNAPSHOT = Snapshot(
+    version=2,
+    generated_at=10,
+    flags={"dev": {"beta": FlagState(enabled=True)}},
+)
+
+
+def test_load_bootstrap_json(tmp_path):
+    path = tmp_path / "flags.snapshot.json"
+    path.write_bytes(json_format.encode(SNAPSHOT))
+
+    assert load_bootstrap(str(path)) == SNAPSHOT
+
+
+def test_load_bootstrap_binary(tmp_path):
+    path = tmp_path / "flags.snapshot.bin"
+    path.write_bytes(binary_format.encode(SNAPSHOT))
+
+    assert load_bootstrap(str(path)) == SNAPSHOT
+
+
+def test_load_bootstrap_missing_file(tmp_path):
+    assert load_bootstrap(str(tmp_path / "missing.json")) is None
+    assert load_bootstrap(None) is None
+
+
+def test_load_bootstrap_corrupted_file(tmp_path):
+    path = tmp_path / "flags.snapshot.bin"
+    data = bytearray(binary_format.encode(SNAPSHOT))
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    assert load_bootstrap(str(path)) is None
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from snapshot.json_format import SnapshotChecksumError, decode, encode
+from snapshot.model import FlagState, Snapshot, Variant
+
+
+def make_snapshot():
+    return Snapshot(
+        version=5,
+        generated_at=1_700_000_000_000,
+        flags={
+            "dev": {"beta": FlagState(enabled=True)},
+            "prod": {"beta": FlagState(enabled=False, rollout_end_at=1_800_000_000_000)},
+        },
+    )
+
+
+def test_encode_decode_round_trip():
+    snapshot = make_snapshot()
+
+    decoded = decode(encode(snapshot))
+
+    assert decoded == snapshot
+
+
+def test_variants_round_trip():
+    snapshot = make_snapshot()
+    snapshot.put("checkout", "dev", FlagState(
+        enabled=True,
+        variants=(Variant(name="a", weight=1, payload='{"x":1}'),),
+    ))
+
+    assert decode(encode(snapshot)) == snapshot
+
+
+def test_document_is_versioned_and_checksummed():
+    document = json.loads(encode(make_snapshot()))
+
+    assert document["format_version"] == 1
+    assert document["version"] == 5
+    assert document["checksum"].startswith("sha256:")
+
+
+def test_tampered_document_is_rejected():
+    document = json.loads(encode(make_snapshot()))
+    document["flags"]["prod"]["beta"]["enabled"] = True
+
+    with pytest.raises(SnapshotChecksumError):
+        decode(json.dumps(document).encode("utf-8"))
@@ -0,0 +1,75 @@
+import os
+
+from snapshot.binary_format import encode
+from snapshot.mmap_reader import MmapSnapshotReader
+from snapshot.model import FlagState, Snapshot, now_ms
+from snapshot.storage import write_atomic
+
+
+def write_snapshot(path, version, enabled):
+    snapshot = Snapshot(
+        version=version,
+        generated_at=version,
+        flags={"dev": {"beta": FlagState(enabled=enabled)}},
+    )
+    write_atomic(str(path), encode(snapshot))
+
+
+def test_reader_returns_none_without_file(tmp_path):
+    reader = MmapSnapshotReader(str(tmp_path / "flags.bin"))
+
+    assert reader.get("beta", "dev") is None
+    assert reader.version is None
+
+
+def test_reader_maps_snapshot(tmp_path):
+    path = tmp_path / "flags.bin"
+    write_snapshot(path, version=1, enabled=True)
+
+    reader = MmapSnapshotReader(str(path))
+
+    assert reader.get("beta", "dev") == FlagState(enabled=True)
+    assert reader.version == 1
+
+
+def test_reader_picks_up_atomic_replacement(tmp_path):
+    path = tmp_path / "flags.bin"
+    write_snapshot(path, version=1, enabled=True)
+    reader = MmapSnapshotReader(str(path), check_interval=0)
+    assert reader.get("beta", "dev").enabled is True
+
+    write_snapshot(path, version=2, enabled=False)
+
+    assert reader.get("beta", "dev").enabled is False
+    assert reader.version == 2
+
+
+def test_reader_keeps_last_good_snapshot_on_corrupt_file(tmp_path):
+    path = tmp_path / "flags.bin"
+    write_snapshot(path, version=1, enabled=True)
+    reader = MmapSnapshotReader(str(path), check_interval=0)
+    reader.get("beta", "dev")
+
+    write_atomic(str(path), b"garbage")
+
+    assert reader.get("beta", "dev") == FlagState(enabled=True)
+
+
+def test_write_atomic_leaves_no_temp_files(tmp_path):
+    path = tmp_path / "flags.bin"
+    write_snapshot(path, version=1, enabled=True)
+
+    assert os.listdir(tmp_path) == ["flags.bin"]
+
+
+def test_reader_ignores_snapshot_older_than_max_age(tmp_path):
+    path = tmp_path / "flags.bin"
+    write_snapshot(path, version=1, enabled=True)
+    reader = MmapSnapshotReader(str(path), max_age=60)
+
+    assert reader.get("beta", "dev") is None
+
+    write_snapshot(path, version=now_ms(), enabled=True)
+    reader = MmapSnapshotReader(str(path), max_age=60)
+
+    assert reader.get("beta", "dev") == FlagState(enabled=True)
@@ -0,0 +1,65 @@
+from snapshot.model import FlagState
+from snapshot.prerequisites import (
+    find_cycle,
+    prerequisite_chains,
+    resolve,
+    topological_order,
+)
+
+
+def test_topological_order_puts_prerequisites_first():
+    graph = {"checkout": ("payments", "beta"), "payments": ("beta",)}
+
+    order, blocked = topological_order(graph)
+
+    assert order.index("beta") < order.index("payments") < order.index("checkout")
+    assert blocked == set()
+
+
+def test_find_cycle_reports_path():
+    graph = {"a": ("b",), "b": ("c",), "c": ("a",), "d": ("a",)}
+
+    assert find_cycle(graph) == ["a", "b", "c", "a"]
+    assert find_cycle({"a": ("a",)}) == ["a", "a"]
+    assert find_cycle({"a": ("b",), "b": ()}) is None
+
+
+def test_chains_list_ancestors_in_dependency_order():
+    graph = {"checkout": ("payments",), "payments": ("beta",), "beta": ()}
+
+    chains = prerequisite_chains(graph)
+
+    assert chains == {
+        "checkout": ("beta", "payments", "checkout"),
+        "payments": ("beta", "payments"),
+    }
+
+
+def test_flags_behind_a_cycle_have_no_chain():
+    chains = prerequisite_chains({"a": ("b",), "b": ("a",), "c": ("a",)})
+
+    assert chains == {"a": (), "b": (), "c": ()}
+    assert resolve(chains["c"], lambda name: FlagState(enabled=True), 0, {}) is False
+
+
+def test_resolve_requires_every_prerequisite_and_memoizes():
+    states = {
+        "beta": FlagState(enabled=True),
+        "payments": FlagState(enabled=False, prerequisites=("beta",)),
+        "checkout": FlagState(enabled=True, prerequisites=("payments",)),
+        "search": FlagState(enabled=True, prerequisites=("beta", "missing")),
+    }
+    lookups = []
+
+    def lookup(name):
+        lookups.append(name)
+        return states.get(name)
+
+    memo = {}
+    assert resolve(("beta", "payments", "checkout"), lookup, 0, memo) is False
+    assert resolve(("beta", "payments"), lookup, 0, memo) is False
+    assert resolve(("beta", "missing", "search"), lookup, 0, memo) is False
+    assert lookups == ["beta", "payments", "checkout", "missing", "search"]
+
+    states["payments"] = FlagState(enabled=True, prerequisites=("beta",))
+    assert resolve(("beta", "payments", "checkout"), states.get, 0, {}) is True
@@ -1,5 +1,8 @@
+import json
+
+import pytest
 from unittest.mock import patch
-from src.utils.audit import publish_audit
+from src.utils.audit import publish_audit, publish_audits
 
 
 @patch("src.utils.audit.send_message")
@@ -14,6 +17,40 @@ def test_publish_audit_sends_message(mock_send):
 
     mock_send.assert_called_once()
 
-    payload = mock_send.call_args[0][0]
-    assert '"feature": "test"' in payload
-    assert '"action": "CREATE"' in payload
+    payload = json.loads(mock_send.call_args[0][0])
+    assert payload["feature"] == "test"
+    assert payload["action"] == "CREATE"
+    assert payload["new"] == {"enabled": True}
+
+
+@patch("src.utils.audit.send_message_batch")
+def test_publish_audits_sends_batches_of_ten(mock_send_batch):
+    mock_send_batch.return_value = {"Successful": [], "Failed": []}
+
+    publish_audits([{"feature": f"f{i}"} for i in range(23)])
+
+    sizes = [len(c.args[0]) for c in mock_send_batch.call_args_list]
+    assert sizes == [10, 10, 3]
+    assert json.loads(mock_send_batch.call_args_list[2].args[0][0]) == {"feature": "f20"}
+
+
+@patch("src.utils.audit.send_message_batch")
+def test_publish_audits_retries_failed_entries(mock_send_batch):
+    mock_send_batch.side_effect = [
+        {"Failed": [{"Id": "1"}]},
+        {"Failed": []},
+    ]
+
+    publish_audits([{"feature": "a"}, {"feature": "b"}])
+
+    retried = mock_send_batch.call_args_list[1].args[0]
+    assert [json.loads(body) for body in retried] == [{"feature": "b"}]
+
+
+@patch("src.utils.audit.send_message_batch")
+def test_publish_audits_raises_when_retries_exhausted(mock_send_batch):
+    mock_send_batch.return_value = {"Failed": [{"Id": "0"}]}
+
+    with pytest.raises(RuntimeError):
+        publish_audits([{"feature": "a"}])
+
@@ -0,0 +1,109 @@
+import pytest
+
+from utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenException,
+)
+from utils.metrics import MetricsRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class BackendError(Exception):
+    pass
+
+
+def fail():
+    raise BackendError("throttled")
+
+
+def make_breaker(clock):
+    return CircuitBreaker(
+        "store",
+        failure_threshold=2,
+        reset_timeout=10,
+        failure_exceptions=(BackendError,),
+        metrics=MetricsRegistry(),
+        clock=clock,
+    )
+
+
+def test_opens_after_threshold_and_rejects():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    for _ in range(2):
+        with pytest.raises(BackendError):
+            breaker.call(fail)
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenException) as exc:
+        breaker.call(lambda: "ok")
+    assert exc.value.status_code == 503
+    assert breaker.metrics.snapshot()["store.breaker_rejected"] == 1
+
+
+def test_half_open_probe_closes_on_success():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(2):
+        with pytest.raises(BackendError):
+            breaker.call(fail)
+
+    clock.now = 11
+
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+    assert breaker.metrics.snapshot()["store.breaker_state"] == 0
+
+
+def test_half_open_probe_failure_reopens():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(2):
+        with pytest.raises(BackendError):
+            breaker.call(fail)
+
+    clock.now = 11
+    with pytest.raises(BackendError):
+        breaker.call(fail)
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenException):
+        breaker.call(lambda: "ok")
+
+
+def test_only_one_probe_while_half_open():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(2):
+        with pytest.raises(BackendError):
+            breaker.call(fail)
+    clock.now = 11
+
+    def probe():
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenException):
+            breaker.call(lambda: "second")
+        return "first"
+
+    assert breaker.call(probe) == "first"
+
+
+def test_non_failure_exceptions_do_not_trip():
+    breaker = make_breaker(FakeClock())
+
+    for _ in range(3):
+        with pytest.raises(KeyError):
+            breaker.call(lambda: {}["missing"])
+
+    assert breaker.state == CLOSED
@@ -62,3 +62,41 @@ def test_require_admin_success():
 def test_require_admin_unauthorized():
     with pytest.raises(UnauthorizedException):
         require_admin({"role": "USER"})
+
+
+
+@patch("src.dependency.get_sdk_key_service")
+@patch("src.dependency.verify_jwt")
+def test_get_current_user_prefers_sdk_key(mock_verify, mock_get_service):
+    mock_get_service.return_value.authenticate.return_value = {
+        "role": "SDK",
+        "environment": "prod",
+    }
+
+    user = get_current_user({"headers": {"x-sdk-key": "ffsdk_a_1_b"}})
+
+    mock_get_service.return_value.authenticate.assert_called_once_with("ffsdk_a_1_b")
+    mock_verify.assert_not_called()
+    assert user["environment"] == "prod"
+
+
+@patch("src.dependency.get_env")
+def test_sdk_keys_require_pepper(mock_get_env):
+    from src.dependency import get_sdk_key_service
+
+    mock_get_env.return_value = ""
+
+    with pytest.raises(AppException) as exc:
+        get_sdk_key_service()
+
+    assert exc.value.status_code == 503
+
+
+def test_require_environment_scopes_sdk_keys():
+    from src.dependency import require_environment
+
+    require_environment({"role": "SDK", "environment": "prod"}, "prod")
+    require_environment({"role": "CLIENT"}, "dev")
+
+    with pytest.raises(UnauthorizedException):
+        require_environment({"role": "SDK", "environment": "prod"}, "dev")
@@ -0,0 +1,116 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from infra.local.dynamodb import InMemoryDynamoDB
+from repository.feature_repository import FeatureRepository
+from utils import dynamodb_capacity
+from utils.dynamodb_capacity import (
+    CapacityAccumulator,
+    dynamodb_call,
+    paginate,
+    track_capacity,
+)
+
+
+def test_call_outside_invocation_is_passthrough():
+    method = MagicMock(return_value={"Item": {}})
+
+    dynamodb_call("GetItem", method, Key={"PK": "a"})
+
+    method.assert_called_once_with(Key={"PK": "a"})
+
+
+def test_paginate_follows_last_evaluated_key():
+    method = MagicMock(side_effect=[
+        {"Items": [1, 2], "LastEvaluatedKey": {"PK": "b"}},
+        {"Items": [3]},
+    ])
+
+    assert list(paginate("Scan", method, Limit=2)) == [1, 2, 3]
+    assert method.call_args_list[1].kwargs == {"Limit": 2, "ExclusiveStartKey": {"PK": "b"}}
+
+
+def test_call_requests_and_records_capacity(capsys):
+    method = MagicMock(return_value={
+        "ConsumedCapacity": {"TableName": "t", "CapacityUnits": 2.5},
+        "ResponseMetadata": {"RetryAttempts": 1},
+    })
+
+    with track_capacity("list_features_handler") as accumulator:
+        dynamodb_call("Scan", method, FilterExpression="SK = :meta")
+
+    method.assert_called_once_with(
+        ReturnConsumedCapacity="TOTAL", FilterExpression="SK = :meta"
+    )
+    assert accumulator.read_units == 2.5
+    assert accumulator.retries == 1
+
+    line = json.loads(capsys.readouterr().out)
+    assert line["Function"] == "list_features_handler"
+    assert line["ddb_rcu"] == 2.5
+    assert line["ddb_Scan_calls"] == 1
+
+
+def test_failed_call_is_recorded():
+    method = MagicMock(side_effect=ClientError(
+        {
+            "Error": {"Code": "ProvisionedThroughputExceededException"},
+            "ResponseMetadata": {"RetryAttempts": 3},
+        },
+        "PutItem",
+    ))
+
+    with track_capacity("signup") as accumulator:
+        with pytest.raises(ClientError):
+            dynamodb_call("PutItem", method, Item={})
+
+    assert accumulator.calls == 1
+    assert accumulator.retries == 3
+
+
+def test_accumulator_ignores_non_dict_responses():
+    accumulator = CapacityAccumulator()
+
+    accumulator.record("GetItem", MagicMock(), 1.0)
+
+    assert accumulator.calls == 1
+    assert accumulator.read_units == 0
+
+
+def test_transaction_capacity_list_counts_as_writes():
+    accumulator = CapacityAccumulator()
+
+    accumulator.record(
+        "TransactWriteItems",
+        {"ConsumedCapacity": [{"CapacityUnits": 2}, {"CapacityUnits": 4}]},
+        1.0,
+    )
+
+    assert accumulator.write_units == 6
+
+
+def test_disabled_emits_nothing(monkeypatch, capsys):
+    monkeypatch.setattr(dynamodb_capacity, "DDB_CAPACITY_METRICS", False)
+    method = MagicMock(return_value={})
+
+    with track_capacity("evaluate"):
+        dynamodb_call("GetItem", method, Key={})
+
+    method.assert_called_once_with(Key={})
+    assert capsys.readouterr().out == ""
+
+
+def test_repository_against_in_memory_table(capsys):
+    table = InMemoryDynamoDB().Table("FeatureTable")
+    repo = FeatureRepository(table)
+
+    with track_capacity("create_feature_handler") as accumulator:
+        repo.create_feature("checkout", "desc", {"dev": True})
+        repo.list_features()
+
+    assert accumulator.write_units == 6
+    assert accumulator.read_units == 0.5
+    assert accumulator.operations == {"TransactWriteItems": 1, "Scan": 1}
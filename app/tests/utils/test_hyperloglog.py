@@ -0,0 +1,46 @@
+import pytest
+
+from utils.hyperloglog import HyperLogLog
+
+
+def test_count_is_exact_enough_for_small_sets():
+    sketch = HyperLogLog()
+    for i in range(100):
+        sketch.add(f"user-{i}")
+        sketch.add(f"user-{i}")
+
+    assert sketch.count() == pytest.approx(100, abs=2)
+
+
+def test_count_error_stays_within_bounds():
+    sketch = HyperLogLog()
+    for i in range(50_000):
+        sketch.add(f"user-{i}")
+
+    assert sketch.count() == pytest.approx(50_000, rel=0.05)
+
+
+def test_merge_is_a_union():
+    first, second = HyperLogLog(), HyperLogLog()
+    for i in range(3000):
+        first.add(f"user-{i}")
+    for i in range(2000, 5000):
+        second.add(f"user-{i}")
+
+    assert first.merge(second).count() == pytest.approx(5000, rel=0.05)
+
+
+def test_round_trips_through_bytes():
+    sketch = HyperLogLog()
+    for i in range(500):
+        sketch.add(f"user-{i}")
+
+    data = sketch.to_bytes()
+
+    assert len(data) < 4096
+    assert HyperLogLog.from_bytes(data).registers == sketch.registers
+
+
+def test_merge_rejects_mismatched_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(12).merge(HyperLogLog(10))
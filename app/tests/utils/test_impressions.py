@@ -0,0 +1,139 @@
+import base64
+import json
+from unittest.mock import MagicMock, patch
+
+from utils import impressions
+from utils.hyperloglog import HyperLogLog
+from utils.impressions import ImpressionAggregator
+
+
+class FakeClock:
+    def __init__(self, now=1_767_225_600.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_aggregator(**kwargs):
+    send_batch = MagicMock(return_value={"Successful": [], "Failed": []})
+    options = {
+        "max_keys": 100,
+        "max_samples": 100,
+        "flush_interval": 10,
+        "sample_rate": 0,
+        "clock": FakeClock(),
+    }
+    options.update(kwargs)
+    return ImpressionAggregator(send_batch, **options), send_batch
+
+
+def sent_messages(send_batch):
+    return [
+        json.loads(body)
+        for call in send_batch.call_args_list
+        for body in call.args[0]
+    ]
+
+
+def test_counts_are_aggregated_per_minute():
+    aggregator, send_batch = make_aggregator()
+
+    for _ in range(3):
+        aggregator.record("beta", "prod", "on", "a@example.com")
+    aggregator.record("beta", "prod", "off")
+    aggregator.clock.now += 60
+    aggregator.record("beta", "prod", "on")
+    aggregator.flush()
+
+    send_batch.assert_called_once()
+    assert sorted(sent_messages(send_batch)[0]["counts"]) == [
+        ["beta", "prod", "off", "2026-01-01T00:00", 1],
+        ["beta", "prod", "on", "2026-01-01T00:00", 3],
+        ["beta", "prod", "on", "2026-01-01T00:01", 1],
+    ]
+
+
+def test_size_trigger_flushes_during_record():
+    aggregator, send_batch = make_aggregator(max_keys=2)
+
+    aggregator.record("a", "prod", "on")
+    send_batch.assert_not_called()
+    aggregator.record("b", "prod", "on")
+
+    send_batch.assert_called_once()
+
+
+def test_maybe_flush_waits_for_interval():
+    aggregator, send_batch = make_aggregator()
+    aggregator.record("a", "prod", "on")
+
+    assert aggregator.maybe_flush() == 0
+    aggregator.clock.now += 10
+    assert aggregator.maybe_flush() == 1
+
+    send_batch.assert_called_once()
+
+
+def test_maybe_flush_sends_finished_minute_before_interval():
+    aggregator, send_batch = make_aggregator(flush_interval=3600)
+    aggregator.record("a", "prod", "on")
+
+    assert aggregator.maybe_flush() == 0
+    aggregator.clock.now += 60
+    assert aggregator.maybe_flush() == 1
+
+    send_batch.assert_called_once()
+    aggregator.record("a", "prod", "on")
+    assert aggregator.maybe_flush() == 0
+
+
+def test_samples_are_sent_separately():
+    aggregator, send_batch = make_aggregator(sample_rate=0.5, rng=iter([0.1, 0.9]).__next__)
+
+    aggregator.record("a", "prod", "on", "first@example.com")
+    aggregator.record("a", "prod", "on", "second@example.com")
+    aggregator.flush()
+
+    samples = sent_messages(send_batch)[1]["samples"]
+    assert [s["actor"] for s in samples] == ["first@example.com"]
+
+
+def test_failed_entries_are_retried_then_dropped():
+    aggregator, send_batch = make_aggregator()
+    send_batch.side_effect = [{"Failed": [{"Id": "0"}]}, {"Failed": [{"Id": "0"}]}]
+    aggregator.record("a", "prod", "on")
+
+    assert aggregator.flush() == 0
+    assert send_batch.call_count == 2
+
+
+def test_send_errors_never_raise():
+    aggregator, send_batch = make_aggregator()
+    send_batch.side_effect = RuntimeError("throttled")
+    aggregator.record("a", "prod", "on")
+
+    assert aggregator.flush() == 0
+
+
+@patch.object(impressions.impressions_queue, "QUEUE_URL", "")
+@patch.object(impressions, "_aggregator", None)
+def test_disabled_without_queue_url():
+    impressions.record_impression("a", "prod", "on")
+
+    assert impressions.get_aggregator() is None
+    assert impressions.flush_impressions() == 0
+
+
+def test_user_keys_are_sketched_per_day():
+    aggregator, send_batch = make_aggregator()
+
+    for user in ["u1", "u2", "u1"]:
+        aggregator.record("beta", "prod", "on", user=user)
+    aggregator.record("beta", "prod", "off")
+    aggregator.flush()
+
+    rows = sent_messages(send_batch)[1]["sketches"]
+    assert [row[:4] for row in rows] == [["beta", "prod", "on", "2026-01-01"]]
+    sketch = HyperLogLog.from_bytes(base64.b64decode(rows[0][4]))
+    assert sketch.count() == 2
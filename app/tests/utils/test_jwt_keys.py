@@ -0,0 +1,80 @@
+import ecdsa
+import pytest
+import rsa
+from jose import jwt
+
+from utils import jwt_keys
+from utils.jwt_keys import JWTKeyring, get_keyring
+
+
+@pytest.fixture(scope="module")
+def ec_keys():
+    private = ecdsa.SigningKey.generate(curve=ecdsa.NIST256p)
+    return private.to_pem().decode(), private.get_verifying_key().to_pem().decode()
+
+
+def test_rotation_window_accepts_previous_kid():
+    old = JWTKeyring("HS256", "2026-01", "old-secret")
+    new = JWTKeyring("HS256", "2026-02", "new-secret", {"2026-01": "old-secret"})
+
+    old_token = old.sign({"sub": "1"})
+    new_token = new.sign({"sub": "1"})
+
+    assert jwt.get_unverified_header(new_token)["kid"] == "2026-02"
+    assert new.verify(old_token) == {"sub": "1"}
+    assert new.verify(new_token) == {"sub": "1"}
+    with pytest.raises(ValueError, match="Invalid token"):
+        old.verify(new_token)
+
+
+def test_token_without_kid_uses_default_kid():
+    keyring = JWTKeyring("HS256", "default", "secret")
+    legacy = jwt.encode({"sub": "1"}, "secret", algorithm="HS256")
+
+    assert keyring.verify(legacy) == {"sub": "1"}
+
+
+def test_expired_token():
+    keyring = JWTKeyring("HS256", "default", "secret")
+
+    with pytest.raises(ValueError, match="Token expired"):
+        keyring.verify(keyring.sign({"sub": "1", "exp": 0}))
+
+
+def test_verifier_only_keyring_uses_public_keys(ec_keys):
+    private_pem, public_pem = ec_keys
+    signer = JWTKeyring("ES256", "k1", private_pem)
+    verifier = JWTKeyring("ES256", "k1", None, {"k1": public_pem})
+
+    assert verifier.verify(signer.sign({"sub": "1"})) == {"sub": "1"}
+    with pytest.raises(RuntimeError):
+        verifier.sign({"sub": "1"})
+
+
+def test_public_jwks_never_exposes_private_material(ec_keys):
+    private_pem, _ = ec_keys
+    rsa_private = rsa.newkeys(1024)[1].save_pkcs1().decode()
+
+    ec_jwks = JWTKeyring("ES256", "k1", private_pem).public_jwks()
+    rsa_jwks = JWTKeyring("RS256", "k2", rsa_private).public_jwks()
+
+    assert ec_jwks["keys"][0]["kid"] == "k1"
+    assert rsa_jwks["keys"][0]["kty"] == "RSA"
+    assert all("d" not in key for key in ec_jwks["keys"] + rsa_jwks["keys"])
+    assert JWTKeyring("HS256", "k1", "secret").public_jwks() == {"keys": []}
+
+
+def test_unsupported_algorithm():
+    with pytest.raises(ValueError):
+        JWTKeyring("EdDSA", "k1", "secret")
+
+
+def test_get_keyring_rebuilds_when_config_changes(monkeypatch):
+    monkeypatch.setattr(jwt_keys, "_keyring", None)
+    monkeypatch.setenv("JWT_ACTIVE_KID", "2026-01")
+    first = get_keyring()
+
+    assert get_keyring() is first
+
+    monkeypatch.setenv("JWT_ACTIVE_KID", "2026-02")
+    assert get_keyring().active_kid == "2026-02"
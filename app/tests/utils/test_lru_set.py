@@ -0,0 +1,23 @@
+from utils.lru_set import LRUSet
+
+
+def test_lru_set_evicts_least_recently_used():
+    keys = LRUSet(2)
+    keys.add("a")
+    keys.add("b")
+
+    assert "a" in keys
+    keys.add("c")
+
+    assert "a" in keys
+    assert "b" not in keys
+    assert len(keys) == 2
+
+
+def test_lru_set_discard():
+    keys = LRUSet(2)
+    keys.add("a")
+    keys.discard("a")
+    keys.discard("missing")
+
+    assert "a" not in keys
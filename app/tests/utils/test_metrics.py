@@ -0,0 +1,22 @@
+import json
+
+from utils.metrics import MetricsRegistry, format_emf
+
+
+def test_flush_resets_counters_but_keeps_gauges():
+    registry = MetricsRegistry()
+    registry.increment("hits", 2)
+    registry.set_gauge("state", 1)
+
+    assert registry.flush() == {"hits": 2, "state": 1}
+    assert registry.flush() == {"state": 1}
+
+
+def test_format_emf():
+    line = json.loads(format_emf({"hits": 3}, {"Function": "evaluate"}))
+
+    directive = line["_aws"]["CloudWatchMetrics"][0]
+    assert directive["Dimensions"] == [["Function"]]
+    assert directive["Metrics"] == [{"Name": "hits", "Unit": "Count"}]
+    assert line["Function"] == "evaluate"
+    assert line["hits"] == 3
@@ -0,0 +1,66 @@
+import base64
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from dto.feature_dto import EvaluateDTO, UpdateFeatureEnvDTO
+from utils.handler_decorator import error_handler
+from utils.request_parser import parse_body
+
+
+def test_parse_body_plain():
+    event = {"body": '{"feature": "checkout", "environment": "prod"}'}
+
+    dto = parse_body(event, EvaluateDTO)
+
+    assert dto.feature == "checkout"
+    assert dto.environment.value == "prod"
+
+
+def test_parse_body_base64():
+    raw = json.dumps({"enabled": True}).encode()
+    event = {"body": base64.b64encode(raw).decode(), "isBase64Encoded": True}
+
+    dto = parse_body(event, UpdateFeatureEnvDTO)
+
+    assert dto.enabled is True
+    assert dto.rollout_end_at is None
+
+
+def test_parse_body_missing_body_raises_validation_error():
+    with pytest.raises(ValidationError):
+        parse_body({"body": None}, UpdateFeatureEnvDTO)
+
+
+def test_error_handler_maps_invalid_base64_to_400():
+    @error_handler
+    def handler(event, context):
+        return parse_body(event, UpdateFeatureEnvDTO)
+
+    response = handler({"body": "not base64!", "isBase64Encoded": True}, None)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"]) == {"error": "Invalid base64 body"}
+
+
+def test_error_handler_maps_invalid_json_to_400():
+    @error_handler
+    def handler(event, context):
+        return parse_body(event, UpdateFeatureEnvDTO)
+
+    response = handler({"body": "{not json"}, None)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"]) == {"error": "Invalid JSON body"}
+
+
+def test_error_handler_maps_validation_errors_to_400():
+    @error_handler
+    def handler(event, context):
+        return parse_body(event, UpdateFeatureEnvDTO)
+
+    response = handler({"body": "{}"}, None)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"])["error"][0]["type"] == "missing"
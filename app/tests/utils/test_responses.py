@@ -0,0 +1,92 @@
+import base64
+import gzip
+import json
+
+from error_handling import responses
+from error_handling.responses import (
+    compress_response,
+    select_encoding,
+    success_response,
+)
+from utils.handler_decorator import error_handler
+
+
+LARGE = [{"name": f"feature-{i}", "description": "x" * 40} for i in range(100)]
+
+
+def _decode(response):
+    raw = base64.b64decode(response["body"])
+    return json.loads(gzip.decompress(raw))
+
+
+def test_select_encoding_prefers_gzip_when_brotli_missing(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", None)
+
+    assert select_encoding("br, gzip") == "gzip"
+    assert select_encoding("gzip;q=0") is None
+    assert select_encoding("*") == "gzip"
+    assert select_encoding("identity") is None
+    assert select_encoding(None) is None
+
+
+def test_compress_response_gzip(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", None)
+
+    response = compress_response(success_response(LARGE), "gzip, deflate")
+
+    assert response["isBase64Encoded"] is True
+    assert response["headers"]["Content-Encoding"] == "gzip"
+    assert response["headers"]["Vary"] == "Accept-Encoding"
+    assert response["headers"]["Content-Type"] == "application/json"
+    assert _decode(response) == LARGE
+
+
+def test_compress_response_is_deterministic(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", None)
+
+    first = compress_response(success_response(LARGE), "gzip")
+    second = compress_response(success_response(LARGE), "gzip")
+
+    assert first["body"] == second["body"]
+
+
+def test_compress_response_skips_small_bodies():
+    response = success_response({"enabled": True})
+
+    assert compress_response(response, "gzip") is response
+
+
+def test_compress_response_skips_without_accept_encoding():
+    response = success_response(LARGE)
+
+    assert compress_response(response, None) is response
+
+
+def test_compress_response_skips_bodies_that_grow():
+    response = success_response("ok")
+
+    assert compress_response(response, "gzip", min_bytes=0) is response
+
+
+def test_error_handler_compresses_with_case_insensitive_header(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", None)
+
+    @error_handler
+    def handler(event, context):
+        return success_response(LARGE)
+
+    response = handler({"headers": {"accept-encoding": "gzip"}}, None)
+
+    assert response["headers"]["Content-Encoding"] == "gzip"
+    assert _decode(response) == LARGE
+
+
+def test_error_handler_leaves_response_without_header():
+    @error_handler
+    def handler(event, context):
+        return success_response(LARGE)
+
+    response = handler({}, None)
+
+    assert response["isBase64Encoded"] is False
+    assert json.loads(response["body"]) == LARGE
@@ -0,0 +1,58 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from enums.actions import AuditAction
+from utils import serialization
+
+
+PAYLOAD = {
+    "count": Decimal("3"),
+    "ratio": Decimal("0.25"),
+    "action": AuditAction.UPDATE_ENV,
+    "at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+    "name": "café",
+}
+
+EXPECTED = {
+    "count": 3,
+    "ratio": 0.25,
+    "action": "UPDATE_ENV",
+    "at": "2026-01-01T00:00:00+00:00",
+    "name": "café",
+}
+
+
+@pytest.mark.parametrize(
+    "dumps_bytes",
+    [
+        serialization._stdlib_dumps_bytes,
+        pytest.param(
+            serialization._orjson_dumps_bytes,
+            marks=pytest.mark.skipif(
+                serialization.orjson is None, reason="orjson not installed"
+            ),
+        ),
+    ],
+)
+def test_backends_handle_dynamodb_and_domain_types(dumps_bytes):
+    assert json.loads(dumps_bytes(PAYLOAD)) == EXPECTED
+
+
+def test_dumps_returns_compact_text():
+    assert serialization.dumps({"a": [1, 2]}) == '{"a":[1,2]}'
+
+
+def test_loads_round_trip():
+    assert serialization.loads(serialization.dumps(EXPECTED)) == EXPECTED
+
+
+def test_unsupported_type_raises():
+    with pytest.raises(TypeError):
+        serialization.dumps({"value": object()})
+
+
+def test_exceptions_serialize_as_messages():
+    assert serialization.dumps({"error": ValueError("bad weight")}) == '{"error":"bad weight"}'
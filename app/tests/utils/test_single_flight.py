@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from utils.metrics import MetricsRegistry
+from utils.single_flight import SingleFlight
+
+
+def run_concurrently(count, target):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight(metrics=MetricsRegistry())
+    calls = []
+
+    def slow_load():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"value": 42}
+
+    results, errors = run_concurrently(16, lambda: flight.do("key", slow_load))
+
+    assert len(calls) == 1
+    assert all(result == {"value": 42} for result in results)
+    assert errors == [None] * 16
+
+
+def test_error_is_shared_with_waiters():
+    flight = SingleFlight(metrics=MetricsRegistry())
+
+    def broken():
+        time.sleep(0.05)
+        raise RuntimeError("throttled")
+
+    _, errors = run_concurrently(8, lambda: flight.do("key", broken))
+
+    assert all(isinstance(error, RuntimeError) for error in errors)
+
+
+def test_sequential_calls_are_not_cached():
+    flight = SingleFlight(metrics=MetricsRegistry())
+    values = iter([1, 2])
+
+    assert flight.do("key", lambda: next(values)) == 1
+    assert flight.do("key", lambda: next(values)) == 2
+
+
+def test_distinct_keys_run_independently():
+    flight = SingleFlight(metrics=MetricsRegistry())
+
+    assert flight.do("a", lambda: "a") == "a"
+    assert flight.do("b", lambda: "b") == "b"
+    with pytest.raises(KeyError):
+        flight.do("c", lambda: {}["c"])
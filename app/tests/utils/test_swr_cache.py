@@ -0,0 +1,120 @@
+import threading
+
+import pytest
+
+from utils.metrics import MetricsRegistry
+from utils.swr_cache import StaleWhileRevalidateCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Gone(Exception):
+    pass
+
+
+def make_cache(clock):
+    return StaleWhileRevalidateCache(
+        "flags",
+        ttl=5,
+        max_stale=60,
+        evict_on=(Gone,),
+        metrics=MetricsRegistry(),
+        clock=clock,
+    )
+
+
+def wait_for_refresh(cache):
+    for thread in threading.enumerate():
+        if thread is not threading.current_thread() and thread.daemon:
+            thread.join(timeout=1)
+
+
+def test_fresh_entry_is_a_hit():
+    cache = make_cache(FakeClock())
+    cache.get("k", lambda: 1)
+
+    assert cache.get("k", lambda: 2) == 1
+    assert cache.metrics.snapshot() == {"flags.miss": 1, "flags.hit": 1}
+
+
+def test_stale_entry_is_served_while_refreshing():
+    clock = FakeClock()
+    cache = make_cache(clock)
+    cache.get("k", lambda: 1)
+    clock.now = 10
+
+    assert cache.get("k", lambda: 2) == 1
+    wait_for_refresh(cache)
+
+    clock.now = 11
+    assert cache.get("k", lambda: 3) == 2
+    stats = cache.metrics.snapshot()
+    assert stats["flags.stale_served"] == 1
+    assert stats["flags.refresh"] == 1
+
+
+def test_single_refresh_in_flight_per_key():
+    clock = FakeClock()
+    cache = make_cache(clock)
+    cache.get("k", lambda: 1)
+    clock.now = 10
+    release = threading.Event()
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        release.wait(1)
+        return 2
+
+    for _ in range(5):
+        assert cache.get("k", slow_loader) == 1
+    release.set()
+    wait_for_refresh(cache)
+
+    assert len(calls) == 1
+
+
+def test_failed_refresh_keeps_stale_value():
+    clock = FakeClock()
+    cache = make_cache(clock)
+    cache.get("k", lambda: 1)
+    clock.now = 10
+
+    def broken():
+        raise RuntimeError("throttled")
+
+    assert cache.get("k", broken) == 1
+    wait_for_refresh(cache)
+
+    assert cache.get("k", broken) == 1
+    assert cache.metrics.snapshot()["flags.refresh_error"] >= 1
+
+
+def test_expired_beyond_max_stale_reloads():
+    clock = FakeClock()
+    cache = make_cache(clock)
+    cache.get("k", lambda: 1)
+    clock.now = 100
+
+    assert cache.get("k", lambda: 2) == 2
+
+
+def test_evicting_exception_drops_entry():
+    clock = FakeClock()
+    cache = make_cache(clock)
+    cache.get("k", lambda: 1)
+    clock.now = 100
+
+    def gone():
+        raise Gone()
+
+    with pytest.raises(Gone):
+        cache.get("k", gone)
+    with pytest.raises(Gone):
+        cache.get("k", gone)
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from error_handling.responses import success_response
+from utils import tracing
+from utils.handler_decorator import error_handler
+
+
+class Repo:
+    def get(self):
+        return "value"
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(tracing, "HOT_PATH_METRICS", True)
+    monkeypatch.setattr(tracing, "_cold_start", True)
+
+
+def _emf_lines(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_disabled_is_noop(capsys):
+    repo = Repo()
+
+    assert tracing.traced(repo, "repository") is repo
+    assert tracing.span("auth") is tracing._NOOP
+
+    @error_handler
+    def handler(event, context):
+        return success_response({"ok": True})
+
+    handler({}, None)
+
+    assert capsys.readouterr().out == ""
+
+
+def test_spans_are_emitted_per_invocation(enabled, capsys):
+    @error_handler
+    def handler(event, context):
+        with tracing.span("auth"):
+            pass
+        tracing.traced(Repo(), "repository").get()
+        return success_response({"ok": True})
+
+    handler({}, None)
+    handler({}, None)
+
+    first, second = _emf_lines(capsys)
+    assert first["StartType"] == "cold"
+    assert second["StartType"] == "warm"
+    assert first["Function"] == "handler"
+    for name in ("auth_ms", "repository_ms", "serialize_ms", "total_ms"):
+        assert first[name] >= 0
+    metrics = first["_aws"]["CloudWatchMetrics"][0]
+    assert metrics["Dimensions"] == [["Function", "StartType"]]
+    assert {m["Unit"] for m in metrics["Metrics"]} == {"Milliseconds"}
+
+
+def test_spans_outside_invocation_are_ignored(enabled):
+    assert tracing.span("auth") is tracing._NOOP
+
+
+def test_traced_proxies_attributes(enabled):
+    repo = Repo()
+    repo.table = "t"
+
+    proxy = tracing.traced(repo, "repository")
+
+    assert proxy.table == "t"
+    assert proxy.get() == "value"
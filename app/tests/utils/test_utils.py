@@ -1,11 +1,8 @@
 import pytest
-from jose import jwt
 
 from src.utils.utils import (
     generate_jwt, 
     verify_jwt, 
-    JWT_SECRET_KEY, 
-    JWT_ALGORITHM,
     hash_password,
     verify_password,
     
@@ -36,11 +33,7 @@ def test_generate_and_verify_jwt():
     assert decoded["role"] == "ADMIN"
 
 def test_verify_jwt_expired():
-    expired_token = jwt.encode(
-        {"sub": "1", "exp": 0},
-        JWT_SECRET_KEY,
-        algorithm=JWT_ALGORITHM,
-    )
+    expired_token = generate_jwt({"sub": "1", "exp": 0})
 
     with pytest.raises(ValueError, match="Token expired"):
         verify_jwt(expired_token)
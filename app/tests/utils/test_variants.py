@@ -0,0 +1,97 @@
+import json
+from collections import Counter
+
+import pytest
+from pydantic import ValidationError
+
+from dto.feature_dto import BulkEnvChangeDTO, UpdateFeatureEnvDTO, VariantDTO
+from enums.enums import Environment
+from snapshot.model import Variant
+from utils.variants import (
+    assign_variant,
+    evaluation_body,
+    from_variant_items,
+    to_variant_items,
+    user_key,
+)
+
+VARIANTS = (
+    Variant(name="control", weight=80, payload="null"),
+    Variant(name="blue", weight=20, payload='{"color":"#00f"}'),
+)
+
+
+def test_user_key_reads_context():
+    assert user_key({"user_id": 42}) == "42"
+    assert user_key({"key": "abc"}) == "abc"
+    assert user_key({"country": "IN"}) is None
+    assert user_key(None) is None
+
+
+def test_assignment_is_sticky_per_feature_and_key():
+    first = assign_variant("checkout", VARIANTS, "user-1")
+
+    assert all(assign_variant("checkout", VARIANTS, "user-1") == first for _ in range(10))
+
+
+def test_assignment_follows_weights():
+    counts = Counter(
+        assign_variant("checkout", VARIANTS, f"user-{i}").name for i in range(10_000)
+    )
+
+    assert 0.77 < counts["control"] / 10_000 < 0.83
+
+
+def test_missing_key_uses_first_variant_with_traffic():
+    zero = (Variant(name="a", weight=0), Variant(name="b", weight=0))
+    drained = (Variant(name="old", weight=0), Variant(name="new", weight=5))
+
+    assert assign_variant("checkout", VARIANTS, None) == VARIANTS[0]
+    assert assign_variant("checkout", drained, None) == drained[1]
+    assert assign_variant("checkout", zero, "user-1") == zero[0]
+
+
+def test_variant_items_store_payload_as_json_text():
+    items = to_variant_items([VariantDTO(name="blue", weight=20, payload={"color": "#00f"})])
+
+    assert items == [{"name": "blue", "weight": 20, "payload": '{"color":"#00f"}'}]
+    assert from_variant_items(items)[0]["payload"] == {"color": "#00f"}
+    assert to_variant_items(None) is None
+
+
+def test_evaluation_body_embeds_payload():
+    assert json.loads(evaluation_body(VARIANTS[1])) == {
+        "enabled": True,
+        "variant": "blue",
+        "payload": {"color": "#00f"},
+    }
+
+
+def test_dto_rejects_duplicate_names_and_zero_total_weight():
+    with pytest.raises(ValidationError):
+        UpdateFeatureEnvDTO(enabled=True, variants=[
+            {"name": "a", "weight": 1},
+            {"name": "a", "weight": 1},
+        ])
+    with pytest.raises(ValidationError):
+        UpdateFeatureEnvDTO(enabled=True, variants=[{"name": "a", "weight": 0}])
+    with pytest.raises(ValidationError):
+        VariantDTO(name="a", weight=1, payload="x" * 5000)
+
+
+def test_bulk_change_shares_update_validation():
+    change = BulkEnvChangeDTO(
+        feature="checkout", environment="DEV", enabled=True, prerequisites=["Beta"]
+    )
+
+    assert change.environment is Environment.DEV
+    assert change.prerequisites == ["beta"]
+    with pytest.raises(ValidationError):
+        BulkEnvChangeDTO(feature="checkout", environment="uat", enabled=True)
+    with pytest.raises(ValidationError):
+        BulkEnvChangeDTO(
+            feature="checkout",
+            environment="dev",
+            enabled=True,
+            variants=[{"name": "a", "weight": 0}],
+        )